@@ -0,0 +1,34 @@
+"""add ingestion job stats
+
+Revision ID: a9c4d7e2b815
+Revises: e5a8f3b1c6d4
+Create Date: 2026-10-19 12:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9c4d7e2b815'
+down_revision: Union[str, Sequence[str], None] = 'e5a8f3b1c6d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('ingestion_jobs', sa.Column('started_at', sa.DateTime(), nullable=True))
+    op.add_column('ingestion_jobs', sa.Column('finished_at', sa.DateTime(), nullable=True))
+    op.add_column('ingestion_jobs', sa.Column('stats', sa.JSON(), nullable=True))
+    op.create_index('ix_ingestion_jobs_finished_at', 'ingestion_jobs', ['finished_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_ingestion_jobs_finished_at', table_name='ingestion_jobs')
+    op.drop_column('ingestion_jobs', 'stats')
+    op.drop_column('ingestion_jobs', 'finished_at')
+    op.drop_column('ingestion_jobs', 'started_at')
@@ -0,0 +1,38 @@
+"""add document list indexes
+
+Revision ID: b4e1c2d9f7a3
+Revises: 0d1a61d8ae75
+Create Date: 2026-10-19 10:12:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4e1c2d9f7a3'
+down_revision: Union[str, Sequence[str], None] = '0d1a61d8ae75'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index('ix_documents_created_at_id', 'documents', ['created_at', 'id'], unique=False)
+    op.create_index(
+        'ix_documents_title_trgm',
+        'documents',
+        ['title'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'title': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_documents_title_trgm', table_name='documents')
+    op.drop_index('ix_documents_created_at_id', table_name='documents')
+    # pg_trgm is left installed: other objects may depend on it
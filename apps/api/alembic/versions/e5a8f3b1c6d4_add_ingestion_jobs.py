@@ -0,0 +1,56 @@
+"""add ingestion jobs
+
+Revision ID: e5a8f3b1c6d4
+Revises: b4e1c2d9f7a3
+Create Date: 2026-10-19 11:03:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a8f3b1c6d4'
+down_revision: Union[str, Sequence[str], None] = 'b4e1c2d9f7a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('ingestion_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('document_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('available_at', sa.DateTime(), nullable=False),
+    sa.Column('lease_owner', sa.String(length=120), nullable=True),
+    sa.Column('leased_until', sa.DateTime(), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['document_id'], ['documents.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('document_id')
+    )
+    op.create_index(op.f('ix_ingestion_jobs_id'), 'ingestion_jobs', ['id'], unique=False)
+    op.create_index('ix_ingestion_jobs_status_available_at', 'ingestion_jobs', ['status', 'available_at'], unique=False)
+
+    # Documents the polling cron had not finished become queued jobs
+    op.execute(
+        """
+        INSERT INTO ingestion_jobs (document_id, status, attempts, available_at, created_at, updated_at)
+        SELECT id, 'QUEUED', 0, timezone('utc', now()), timezone('utc', now()), timezone('utc', now())
+        FROM documents
+        WHERE status IN ('REQUEST', 'PROCESSING')
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_ingestion_jobs_status_available_at', table_name='ingestion_jobs')
+    op.drop_index(op.f('ix_ingestion_jobs_id'), table_name='ingestion_jobs')
+    op.drop_table('ingestion_jobs')
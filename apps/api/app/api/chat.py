@@ -22,6 +22,7 @@ from ..schemas.chat import (
     NewSessionResponse,
 )
 from ..services.chat_service import ChatService, ChatServiceError
+from ..services.faq_materializer import get_faq_materializer
 
 router = APIRouter()
 
@@ -52,11 +53,13 @@ QUERY_RATE_LIMITER = RateLimiter(
     limit=5,
     window_seconds=30,
     error_detail="Too many chat queries. Please slow down.",
+    name="chat-query",
 )
 READ_RATE_LIMITER = RateLimiter(
     limit=20,
     window_seconds=60,
     error_detail="Too many chat requests. Try again shortly.",
+    name="chat-read",
 )
 
 
@@ -188,7 +191,6 @@ async def get_trending_questions(
     language: str = Query("vi", regex="^(vi|en)$"),
     limit: int = Query(5, ge=1, le=10),
     hours: int = Query(24, ge=1, le=168),
-    service: ChatService = Depends(get_chat_service),
 ) -> FAQsResponse:
     """
     Get trending questions from recent hours.
@@ -204,7 +206,7 @@ async def get_trending_questions(
     await READ_RATE_LIMITER(request)
 
     try:
-        trending = await service.faq_service.get_trending_questions(
+        trending = await get_faq_materializer().get_trending_questions(
             language=language,
             limit=limit,
             hours=hours,
@@ -2,17 +2,29 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from datetime import datetime, timedelta
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..core.database import get_db
-from ..core.mongo import get_chat_messages_collection
+from ..core.mongo import get_chat_messages_collection, get_chat_rollups_collection
 from ..models import Document
-from ..models.chat import ChatRole
+from ..repositories.chat_analytics_repo import (
+    KEYSET_SORT,
+    LOG_LIST_PROJECTION,
+    decode_cursor,
+    encode_cursor,
+    keyset_after,
+    query_logs_filter,
+    resolve_missing_questions,
+    unanswered_filter,
+    unanswered_page_pipeline,
+)
+from ..repositories.chat_rollups_repo import daily_series, dashboard_totals, day_key, days_ago
 from ..schemas.dashboard import (
     DashboardMetrics,
     TrendDataPoint,
@@ -30,40 +42,27 @@ logger = logging.getLogger(__name__)
 async def get_dashboard_metrics(
     db: AsyncSession = Depends(get_db),
 ) -> DashboardMetrics:
-    """Get dashboard KPI metrics from MongoDB chat messages."""
+    """Get dashboard KPI metrics from the daily chat rollups."""
     try:
-        messages_coll = get_chat_messages_collection()
-        now = datetime.utcnow()
-        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        rollups_coll = get_chat_rollups_collection()
+        today = datetime.utcnow().date()
 
-        # Count questions today (count user messages)
-        questions_today = await messages_coll.count_documents(
-            {"role": ChatRole.USER.value, "createdAt": {"$gte": today_start}}
+        # Fallback rate covers the last 7 days (whole UTC days, today included)
+        totals = await dashboard_totals(
+            rollups_coll, today=day_key(today), window_start=days_ago(today, 6)
         )
 
-        # Average response time from assistant messages (all time)
-        pipeline_avg_response = [
-            {
-                "$match": {
-                    "role": ChatRole.ASSISTANT.value,
-                    "queryLog.responseMs": {"$exists": True},
-                }
-            },
-            {"$group": {"_id": None, "avg_ms": {"$avg": "$queryLog.responseMs"}}},
-        ]
-        avg_response_result = await messages_coll.aggregate(pipeline_avg_response).to_list(1)
-        avg_response_time_ms = int(avg_response_result[0]["avg_ms"]) if avg_response_result else 0
-
-        # Fallback rate (last 7 days)
-        week_ago = now - timedelta(days=7)
-        total_queries = await messages_coll.count_documents(
-            {"role": ChatRole.ASSISTANT.value, "createdAt": {"$gte": week_ago}}
-        )
+        # Count questions today
+        questions_today = int(totals["today"].get("questions", 0))
 
-        fallback_queries = await messages_coll.count_documents(
-            {"role": ChatRole.ASSISTANT.value, "createdAt": {"$gte": week_ago}, "fallback": True}
+        # Average response time (all time)
+        latency_count = totals["all_time"].get("latencyCount", 0)
+        avg_response_time_ms = (
+            int(totals["all_time"]["latencySumMs"] / latency_count) if latency_count else 0
         )
 
+        total_queries = totals["window"].get("questions", 0)
+        fallback_queries = totals["window"].get("fallbacks", 0)
         fallback_rate = (fallback_queries / total_queries) if total_queries > 0 else 0.0
 
         # Active documents (from PostgreSQL)
@@ -96,28 +95,14 @@ async def get_weekly_trends(
     days: int = Query(default=7, ge=1, le=30),
     db: AsyncSession = Depends(get_db),
 ) -> TrendsResponse:
-    """Get weekly activity trends from MongoDB chat messages."""
+    """Get weekly activity trends from the daily chat rollups."""
     try:
-        messages_coll = get_chat_messages_collection()
+        rollups_coll = get_chat_rollups_collection()
         now = datetime.utcnow()
         start_date = now - timedelta(days=days - 1)
         start_date = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
 
-        # Aggregate data by date using MongoDB
-        pipeline = [
-            {"$match": {"role": ChatRole.ASSISTANT.value, "createdAt": {"$gte": start_date}}},
-            {
-                "$group": {
-                    "_id": {"$dateToString": {"format": "%Y-%m-%d", "date": "$createdAt"}},
-                    "questions": {"$sum": 1},
-                    "avg_confidence": {"$avg": "$confidence"},
-                    "fallback_count": {"$sum": {"$cond": [{"$eq": ["$fallback", True]}, 1, 0]}},
-                }
-            },
-            {"$sort": {"_id": 1}},
-        ]
-
-        result = await messages_coll.aggregate(pipeline).to_list(None)
+        result = await daily_series(rollups_coll, day_key(start_date))
 
         # Build data points
         data_points: list[TrendDataPoint] = []
@@ -130,12 +115,16 @@ async def get_weekly_trends(
 
             if date_str in data_by_date:
                 row = data_by_date[date_str]
+                confidence_count = row.get("confidenceCount", 0)
+                avg_confidence = (
+                    row["confidenceSum"] / confidence_count if confidence_count else None
+                )
                 data_points.append(
                     TrendDataPoint(
                         period=period,
                         questions=row["questions"],
-                        avg_confidence=row["avg_confidence"] if row["avg_confidence"] else None,
-                        fallback_count=row["fallback_count"],
+                        avg_confidence=avg_confidence if avg_confidence else None,
+                        fallback_count=row["fallbacks"],
                     )
                 )
             else:
@@ -155,45 +144,34 @@ async def get_weekly_trends(
 @router.get("/unanswered", response_model=UnansweredQuestionsResponse)
 async def get_unanswered_questions(
     limit: int = Query(default=20, ge=1, le=100),
+    cursor: str | None = Query(default=None),
     db: AsyncSession = Depends(get_db),
 ) -> UnansweredQuestionsResponse:
-    """Get list of unanswered questions (fallback messages) from MongoDB."""
-    try:
-        messages_coll = get_chat_messages_collection()
+    """Get list of unanswered questions (fallback messages) from MongoDB.
 
-        # Get fallback messages (assistant messages with fallback=true) ordered by most recent
-        cursor = (
-            messages_coll.find({"role": ChatRole.ASSISTANT.value, "fallback": True})
-            .sort("createdAt", -1)
-            .limit(limit)
-        )
+    Pages are keyset-paginated: pass the previous response's ``nextCursor`` as ``cursor``.
+    """
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
 
-        fallback_messages = await cursor.to_list(length=limit)
+    try:
+        messages_coll = get_chat_messages_collection()
 
-        # Get total count
-        total = await messages_coll.count_documents(
-            {"role": ChatRole.ASSISTANT.value, "fallback": True}
+        # Fallback answers joined to their question in one aggregation, plus the total count
+        # (served by the partial fallback index) in parallel.
+        page_pipeline = unanswered_page_pipeline(messages_coll.name, limit=limit, after=after)
+        fallback_messages, total = await asyncio.gather(
+            messages_coll.aggregate(page_pipeline).to_list(length=limit),
+            messages_coll.count_documents(unanswered_filter()),
         )
+        await resolve_missing_questions(messages_coll, fallback_messages)
 
         items = []
-        for idx, msg in enumerate(fallback_messages):
-            # Get the corresponding user question
-            session_id = msg.get("sessionId")
+        for msg in fallback_messages:
             created_at = msg.get("createdAt")
-
-            # Find the user message just before this assistant message
-            user_msg = await messages_coll.find_one(
-                {
-                    "sessionId": session_id,
-                    "role": ChatRole.USER.value,
-                    "createdAt": {"$lte": created_at},
-                },
-                sort=[("createdAt", -1)],
-            )
-
-            question_text = (
-                user_msg.get("text", "Unknown question") if user_msg else "Unknown question"
-            )
+            question_text = msg.get("question") or "Unknown question"
 
             # Determine reason from queryLog if available
             query_log = msg.get("queryLog", {})
@@ -204,7 +182,9 @@ async def get_unanswered_questions(
 
             items.append(
                 UnansweredQuestion(
-                    id=idx + 1,  # Use index as ID since MongoDB _id is not sequential
+                    # Stable across cursor pages, unlike a per-page index
+                    id=str(msg["_id"]),
+                    chatId=msg.get("_id"),
                     question=question_text,
                     reason=reason,
                     channel=channel,
@@ -213,7 +193,10 @@ async def get_unanswered_questions(
                 )
             )
 
-        return UnansweredQuestionsResponse(items=items, total=total)
+        next_cursor = (
+            encode_cursor(fallback_messages[-1]) if len(fallback_messages) == limit else None
+        )
+        return UnansweredQuestionsResponse(items=items, total=total, nextCursor=next_cursor)
     except Exception:
         logger.exception("Error fetching unanswered questions")
         # Return empty list on error
@@ -224,84 +207,62 @@ async def get_unanswered_questions(
 async def get_query_logs(
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=20, ge=1, le=100, alias="pageSize"),
+    cursor: str | None = Query(default=None),
     search: str | None = Query(default=None),
     fallback: bool | None = Query(default=None),
     lang: str | None = Query(default=None),
     channel: str | None = Query(default=None),
     db: AsyncSession = Depends(get_db),
 ) -> QueryLogsResponse:
-    """Get paginated query logs with filtering from MongoDB."""
+    """Get paginated query logs with filtering from MongoDB.
+
+    Pass the previous response's ``nextCursor`` as ``cursor`` for constant-cost deep pages;
+    ``page`` (offset pagination) is still honoured when no cursor is given.
+    """
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
     try:
         messages_coll = get_chat_messages_collection()
 
         # Build query filter
-        query_filter: dict = {"role": ChatRole.ASSISTANT.value}
-
-        if fallback is not None:
-            query_filter["fallback"] = fallback
-
-        if lang:
-            # Query trong queryLog.lang
-            query_filter["queryLog.lang"] = lang
-
-        if channel:
-            # Query trong queryLog.channel
-            query_filter["queryLog.channel"] = channel
-
-        # Text search on question (we'll need to join with user messages)
-        # For now, search in assistant message text (answer)
-        if search:
-            query_filter["text"] = {"$regex": search, "$options": "i"}
-
-        # Get total count
-        total = await messages_coll.count_documents(query_filter)
+        query_filter = query_logs_filter(
+            fallback=fallback, lang=lang, channel=channel, search=search
+        )
+        page_filter = {**query_filter, **keyset_after(*after)} if after else query_filter
 
         # Calculate pagination
-        skip = (page - 1) * page_size
+        skip = 0 if after else (page - 1) * page_size
+
+        # Fetch paginated results and the total count concurrently
+        find_cursor = (
+            messages_coll.find(page_filter, LOG_LIST_PROJECTION)
+            .sort(KEYSET_SORT)
+            .skip(skip)
+            .limit(page_size)
+        )
+        assistant_messages, total = await asyncio.gather(
+            find_cursor.to_list(length=page_size),
+            messages_coll.count_documents(query_filter),
+        )
         total_pages = (total + page_size - 1) // page_size if total > 0 else 1
 
-        # Fetch paginated results
-        cursor = messages_coll.find(query_filter).sort("createdAt", -1).skip(skip).limit(page_size)
-        assistant_messages = await cursor.to_list(length=page_size)
-
-        # Batch fetch user questions for all sessions
-        session_ids = list(
-            {msg.get("sessionId") for msg in assistant_messages if msg.get("sessionId")}
-        )
-        user_messages = {}
-        if session_ids:
-            user_cursor = messages_coll.find(
-                {"sessionId": {"$in": session_ids}, "role": ChatRole.USER.value}
-            ).sort("createdAt", -1)
-            user_msgs_list = await user_cursor.to_list(length=None)
-            # Group by sessionId, keeping only most recent before each assistant msg
-            for user_msg in user_msgs_list:
-                sid = user_msg.get("sessionId")
-                if sid not in user_messages:
-                    user_messages[sid] = []
-                user_messages[sid].append(user_msg)
+        # Questions are stored on the answer; only legacy rows need a (bounded) lookup
+        await resolve_missing_questions(messages_coll, assistant_messages)
 
         # Build response items
         items: list[QueryLogItem] = []
         for msg in assistant_messages:
-            session_id = msg.get("sessionId", "")
             created_at = msg.get("createdAt")
-
-            # Find user question just before this assistant message
-            question_text = ""
-            if session_id in user_messages:
-                for user_msg in user_messages[session_id]:
-                    if user_msg.get("createdAt", datetime.min) <= (created_at or datetime.max):
-                        question_text = user_msg.get("text", "")
-                        break
-
             query_log = msg.get("queryLog", {})
 
             items.append(
                 QueryLogItem(
                     id=msg.get("_id", ""),
-                    sessionId=session_id,
-                    question=question_text,
+                    sessionId=msg.get("sessionId", ""),
+                    question=msg.get("question") or "",
                     answer=msg.get("text", ""),
                     confidence=msg.get("confidence"),
                     relevance=msg.get("relevance"),
@@ -315,12 +276,16 @@ async def get_query_logs(
                 )
             )
 
+        next_cursor = (
+            encode_cursor(assistant_messages[-1]) if len(assistant_messages) == page_size else None
+        )
         return QueryLogsResponse(
             items=items,
             total=total,
             page=page,
             pageSize=page_size,
             totalPages=total_pages,
+            nextCursor=next_cursor,
         )
     except Exception:
         logger.exception("Error fetching query logs")
@@ -1,28 +1,62 @@
-import io
+import asyncio
 import logging
 import os
-
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
-from fastapi.responses import StreamingResponse
+from datetime import datetime, timedelta
+from urllib.parse import quote
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Form,
+    HTTPException,
+    Query,
+    Request,
+    UploadFile,
+    status,
+)
+from fastapi.responses import RedirectResponse, Response, StreamingResponse
+from minio.error import S3Error
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+from ..core.config import settings
 from ..core.database import get_db
 from ..core.users import get_current_user
 from ..models import document as document_model
+from ..models.ingestion_job import IngestionJob
 from ..models.user import User
 from ..schemas import document
-from ..services import dms
+from ..services import dms, ingestion_queue
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+MAX_PAGE_SIZE = 200
+
+
+def _decode_cursor(cursor: str | None):
+    try:
+        return dms.decode_document_cursor(cursor) if cursor else None
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
 
 @router.get("/", dependencies=[Depends(get_current_user)])
-async def list_docs(db: AsyncSession = Depends(get_db)):
+async def list_docs(
+    limit: int = Query(default=dms.DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(default=None),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    List documents newest first.
+
+    Pages are keyset-paginated: pass the previous response's ``nextCursor`` as ``cursor``.
+    """
+    after = _decode_cursor(cursor)
     try:
-        items = await dms.list_documents(db)
-        return {"items": items}
+        items, next_cursor = await dms.list_documents(db, limit=limit, after=after)
+        return {"items": items, "nextCursor": next_cursor}
     except HTTPException:
         raise
     except Exception as exc:
@@ -43,6 +77,15 @@ async def create_docs(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
+    """
+    Upload files as new documents, or create a metadata-only document from ``title``.
+
+    Uploaded files are accepted or rejected one by one. ``items`` holds one entry per file,
+    in request order: ``{"document_id", "object_name", "sha256"}`` when it was stored and
+    queued for processing, ``{"filename", "error"}`` when it was rejected. The request
+    fails with 400 (``detail.errors``) only if every file was rejected, and with 500 if the
+    accepted files could not be recorded; nothing is kept in that case.
+    """
     try:
         # Get department_id from user if not provided
         final_department_id = department_id
@@ -85,10 +128,16 @@ async def create_docs(
 
 
 @router.get("/search")
-async def search_documents_by_name(name: str, db: AsyncSession = Depends(get_db)):
+async def search_documents_by_name(
+    name: str,
+    limit: int = Query(default=dms.DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(default=None),
+    db: AsyncSession = Depends(get_db),
+):
+    after = _decode_cursor(cursor)
     try:
-        docs = await dms.search_documents_by_name(name, db)
-        return {"documents": docs}
+        docs, next_cursor = await dms.search_documents_by_name(name, db, limit=limit, after=after)
+        return {"documents": docs, "nextCursor": next_cursor}
     except HTTPException:
         raise
     except Exception as exc:
@@ -131,8 +180,47 @@ async def get_document(doc_id: int, db: AsyncSession = Depends(get_db)):
         ) from exc
 
 
+def _parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """
+    Parse a single ``bytes=`` range into inclusive (start, end).
+
+    Returns None for headers we serve in full (other units, multiple ranges);
+    raises ValueError when the range cannot be satisfied.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = spec.strip().partition("-")
+    if not sep:
+        raise ValueError("malformed range")
+    if first:
+        start = int(first)
+        end = int(last) if last else size - 1
+    else:
+        # Suffix range: the last N bytes
+        suffix = int(last)
+        if suffix <= 0:
+            raise ValueError("empty suffix range")
+        start, end = max(0, size - suffix), size - 1
+    if start >= size or start > end:
+        raise ValueError("range not satisfiable")
+    return start, min(end, size - 1)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    tags = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return "*" in tags or etag in tags
+
+
 @router.get("/{doc_id}/download")
-async def download_document(doc_id: int, db: AsyncSession = Depends(get_db)):
+async def download_document(doc_id: int, request: Request, db: AsyncSession = Depends(get_db)):
+    """
+    Stream a document from MinIO.
+
+    Supports conditional requests (``If-None-Match`` against the object ETag) and single
+    byte ranges (``Range``/``If-Range``). With ``DOWNLOAD_PRESIGNED_REDIRECT`` enabled the
+    client is redirected to a short-lived presigned MinIO URL instead.
+    """
     try:
         doc = await dms.get_document(doc_id, db)
         if not doc:
@@ -144,19 +232,65 @@ async def download_document(doc_id: int, db: AsyncSession = Depends(get_db)):
         if not object_name:
             raise HTTPException(404, "File not found in storage")
 
-        response = dms.minio_client.get_object(dms.BUCKET_NAME, object_name)
-        content = response.read()
+        # Encode filename for Content-Disposition header to support non-ASCII characters
         filename = os.path.basename(object_name)
+        content_disposition = f"attachment; filename*=UTF-8''{quote(filename)}"
 
-        # Encode filename for Content-Disposition header to support non-ASCII characters
-        from urllib.parse import quote
+        if settings.DOWNLOAD_PRESIGNED_REDIRECT:
+            url = await asyncio.to_thread(
+                dms.presigned_download_url, object_name, content_disposition
+            )
+            return RedirectResponse(url, status_code=status.HTTP_307_TEMPORARY_REDIRECT)
 
-        encoded_filename = quote(filename)
+        try:
+            stat = await asyncio.to_thread(
+                dms.minio_client.stat_object, dms.BUCKET_NAME, object_name
+            )
+        except S3Error as exc:
+            if exc.code == "NoSuchKey":
+                raise HTTPException(404, "File not found in storage") from exc
+            raise
+
+        etag = f'"{stat.etag}"'
+        headers = {
+            "Content-Disposition": content_disposition,
+            "ETag": etag,
+            "Accept-Ranges": "bytes",
+        }
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _etag_matches(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        byte_range = None
+        range_header = request.headers.get("range")
+        if_range = request.headers.get("if-range")
+        if range_header and (not if_range or _etag_matches(if_range, etag)):
+            try:
+                byte_range = _parse_range(range_header, stat.size)
+            except ValueError:
+                return Response(
+                    status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                    headers={"Content-Range": f"bytes */{stat.size}"},
+                )
 
+        if byte_range is None:
+            headers["Content-Length"] = str(stat.size)
+            return StreamingResponse(
+                dms.iter_object_chunks(object_name),
+                media_type="application/octet-stream",
+                headers=headers,
+            )
+
+        start, end = byte_range
+        length = end - start + 1
+        headers["Content-Range"] = f"bytes {start}-{end}/{stat.size}"
+        headers["Content-Length"] = str(length)
         return StreamingResponse(
-            io.BytesIO(content),
+            dms.iter_object_chunks(object_name, offset=start, length=length),
+            status_code=status.HTTP_206_PARTIAL_CONTENT,
             media_type="application/octet-stream",
-            headers={"Content-Disposition": f"attachment; filename*=UTF-8''{encoded_filename}"},
+            headers=headers,
         )
 
     except HTTPException:
@@ -253,22 +387,47 @@ async def get_documents_by_status(
     document_status: str | None = None, db: AsyncSession = Depends(get_db)
 ):
     try:
-        stmt = select(document_model.Document)
+        Document = document_model.Document
+        stmt = select(
+            Document.id,
+            Document.title,
+            Document.status,
+            Document.version_no,
+            IngestionJob.status.label("job_status"),
+            IngestionJob.attempts,
+            IngestionJob.started_at,
+            IngestionJob.finished_at,
+            IngestionJob.last_error,
+            IngestionJob.stats,
+        ).outerjoin(IngestionJob, IngestionJob.document_id == Document.id)
         if document_status:
-            stmt = stmt.where(document_model.Document.status == document_status)
+            stmt = stmt.where(Document.status == document_status)
 
         result = await db.execute(stmt)
-        docs = result.scalars().all()
 
         return {
             "documents": [
                 {
-                    "document_id": doc.id,
-                    "title": doc.title,
-                    "status": doc.status,
-                    "version_no": doc.version_no,
+                    "document_id": row.id,
+                    "title": row.title,
+                    "status": row.status,
+                    "version_no": row.version_no,
+                    "ingestion": (
+                        {
+                            "status": row.job_status,
+                            "attempts": row.attempts,
+                            "started_at": row.started_at.isoformat() if row.started_at else None,
+                            "finished_at": (
+                                row.finished_at.isoformat() if row.finished_at else None
+                            ),
+                            "last_error": row.last_error,
+                            "stats": row.stats or {},
+                        }
+                        if row.job_status
+                        else None
+                    ),
                 }
-                for doc in docs
+                for row in result.all()
             ]
         }
     except HTTPException:
@@ -279,3 +438,20 @@ async def get_documents_by_status(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch documents by status.",
         ) from exc
+
+
+@router.get("/ingestion/metrics", dependencies=[Depends(get_current_user)])
+async def get_ingestion_metrics(
+    hours: int = Query(default=24, ge=1, le=24 * 30),
+    db: AsyncSession = Depends(get_db),
+):
+    """Ingestion backlog and throughput over the last ``hours``, broken down by file format."""
+    try:
+        since = datetime.utcnow() - timedelta(hours=hours)
+        return await ingestion_queue.ingestion_metrics(db, since)
+    except Exception as exc:
+        logger.exception("Failed to compute ingestion metrics")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to compute ingestion metrics.",
+        ) from exc
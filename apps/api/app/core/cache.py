@@ -1,73 +1,200 @@
 """Redis caching utilities for API responses."""
 
+import asyncio
 import json
 import logging
-from typing import Any, Optional
+import math
+import random
+import time
+import uuid
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+from typing import Any, Awaitable, Callable, Optional
 
-import redis.asyncio as redis
 from redis.asyncio import Redis
 
+from .cache_codec import CacheCodec
 from .config import get_settings
+from .redis_client import close_redis_client, get_redis_client
 
 logger = logging.getLogger(__name__)
 
+# Compare-and-delete so a lock is only released by the holder that set it
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+# Keys per SCAN step and per UNLINK call in clear_pattern
+_SCAN_BATCH = 500
+
+# Cache writes and deletes are broadcast here so every worker can drop its L1 copy
+INVALIDATION_CHANNEL = "cache:invalidate"
+
+
+def _key_prefix(key: str) -> str:
+    """Stats bucket for a key, e.g. ``faq:trending`` for ``faq:trending:vi:5:24``."""
+    return ":".join(key.split(":", 2)[:2])
+
+
+class _LocalCache:
+    """Bounded in-process LRU with per-entry TTL (first cache tier)."""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        item = self._entries.get(key)
+        if item is None:
+            return False, None
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        if self.max_entries <= 0 or self.ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + min(ttl, self.ttl), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear_pattern(self, pattern: str) -> None:
+        for key in [key for key in self._entries if fnmatchcase(key, pattern)]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
 
 class CacheService:
-    """Redis-based caching service for API responses."""
+    """Redis-based caching service for API responses.
+
+    Reads go through a small in-process LRU (L1) first. L1 is only used while this
+    process is subscribed to ``INVALIDATION_CHANNEL``, so a write or delete in any worker
+    evicts the other workers' copies; L1 entries also expire after a few seconds.
+    """
 
     def __init__(self):
         """Initialize cache service."""
+        settings = get_settings()
         self._redis: Optional[Redis] = None
+        # In-process single-flight: one compute task per key
+        self._inflight: dict[str, asyncio.Task] = {}
+
+        self._l1 = _LocalCache(settings.CACHE_L1_MAX_ENTRIES, settings.CACHE_L1_TTL_SECONDS)
+        self._l1_active = False
+        self._origin = uuid.uuid4().hex
+        self._listener: Optional[asyncio.Task] = None
+        self._stats: dict[str, dict[str, int]] = {}
+        self._codec = CacheCodec(settings.CACHE_CODEC, settings.CACHE_COMPRESS_MIN_BYTES)
 
     async def get_redis(self) -> Redis:
-        """Get or create Redis connection."""
+        """Get the shared Redis client (pooled, see core.redis_client)."""
         if self._redis is None:
-            settings = get_settings()
-            # Extract host, port, and password from CELERY_BROKER_URL
-            # Format: redis://:password@host:port/db or redis://host:port/db
-            broker_url = settings.CELERY_BROKER_URL
-            password = None
-
-            if broker_url.startswith("redis://"):
-                # Remove protocol
-                url_parts = broker_url.replace("redis://", "")
-
-                # Extract password if exists (:password@)
-                if "@" in url_parts:
-                    auth_part, host_part = url_parts.split("@", 1)
-                    if ":" in auth_part:
-                        password = auth_part.split(":", 1)[1]
-                else:
-                    host_part = url_parts
-
-                # Remove database number
-                if "/" in host_part:
-                    host_part = host_part.split("/")[0]
-
-                # Extract host and port
-                if ":" in host_part:
-                    host, port_str = host_part.rsplit(":", 1)
-                    port = int(port_str)
-                else:
-                    host = host_part
-                    port = 6379
-            else:
-                host = "localhost"
-                port = 6379
-
-            self._redis = await redis.Redis(
-                host=host,
-                port=port,
-                password=password,
-                db=1,  # Use DB 1 for cache (DB 0 for Celery)
-                decode_responses=True,
-                socket_connect_timeout=5,
-                socket_keepalive=True,
-            )
-            logger.info(f"Connected to Redis at {host}:{port} (db=1)")
+            self._redis = get_redis_client()
+
+        if self._listener is None and self._l1.max_entries > 0:
+            self._listener = asyncio.create_task(self._listen_invalidations())
 
         return self._redis
 
+    def _count(self, key: str, outcome: str) -> None:
+        bucket = self._stats.setdefault(
+            _key_prefix(key), {"l1_hits": 0, "redis_hits": 0, "misses": 0}
+        )
+        bucket[outcome] += 1
+
+    def get_stats(self) -> dict[str, dict[str, int]]:
+        """Hit/miss counters per key prefix since startup."""
+        return {prefix: dict(counts) for prefix, counts in self._stats.items()}
+
+    async def _read(self, key: str) -> Optional[Any]:
+        if self._l1_active:
+            hit, value = self._l1.get(key)
+            if hit:
+                self._count(key, "l1_hits")
+                return value
+
+        redis_client = await self.get_redis()
+        raw = await redis_client.get(key)
+        if not raw:
+            self._count(key, "misses")
+            return None
+        value = self._codec.decode(raw)
+        self._count(key, "redis_hits")
+        if self._l1_active:
+            self._l1.set(key, value, self._l1.ttl)
+        return value
+
+    async def _write(self, key: str, value: Any, ttl: int) -> None:
+        redis_client = await self.get_redis()
+        serialized = self._codec.encode(value)
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.setex(key, ttl, serialized)
+            pipe.publish(INVALIDATION_CHANNEL, self._invalidation("key", key))
+            await pipe.execute()
+        if self._l1_active:
+            self._l1.set(key, value, ttl)
+
+    def _invalidation(self, kind: str, target: str) -> str:
+        return json.dumps({"kind": kind, "target": target, "origin": self._origin})
+
+    async def _publish_invalidation(self, kind: str, target: str) -> None:
+        redis_client = await self.get_redis()
+        await redis_client.publish(INVALIDATION_CHANNEL, self._invalidation(kind, target))
+
+    def _apply_invalidation(self, data: bytes | str) -> None:
+        try:
+            message = json.loads(data)
+        except ValueError:
+            return
+        if message.get("origin") == self._origin:
+            return
+        if message.get("kind") == "pattern":
+            self._l1.clear_pattern(message.get("target", ""))
+        else:
+            self._l1.delete(message.get("target", ""))
+
+    async def _listen_invalidations(self) -> None:
+        """Keep L1 coherent with other workers; L1 is bypassed while unsubscribed."""
+        delay = 1.0
+        while True:
+            pubsub = None
+            try:
+                redis_client = await self.get_redis()
+                pubsub = redis_client.pubsub()
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                self._l1_active = True
+                delay = 1.0
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self._apply_invalidation(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Cache invalidation listener error: {e}")
+            finally:
+                self._l1_active = False
+                self._l1.clear()
+                if pubsub is not None:
+                    try:
+                        await pubsub.reset()
+                    except Exception:
+                        pass
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30.0)
+
     async def get(self, key: str) -> Optional[Any]:
         """
         Get cached value.
@@ -79,11 +206,10 @@ class CacheService:
             Cached value or None if not found
         """
         try:
-            redis_client = await self.get_redis()
-            value = await redis_client.get(key)
-            if value:
+            value = await self._read(key)
+            if value is not None:
                 logger.debug(f"Cache HIT: {key}")
-                return json.loads(value)
+                return value
             logger.debug(f"Cache MISS: {key}")
             return None
         except Exception as e:
@@ -96,16 +222,14 @@ class CacheService:
 
         Args:
             key: Cache key
-            value: Value to cache (will be JSON serialized)
+            value: Value to cache (JSON-compatible; encoded with the configured codec)
             ttl: Time to live in seconds (default: 5 minutes)
 
         Returns:
             True if successful, False otherwise
         """
         try:
-            redis_client = await self.get_redis()
-            serialized = json.dumps(value, ensure_ascii=False, default=str)
-            await redis_client.setex(key, ttl, serialized)
+            await self._write(key, value, ttl)
             logger.debug(f"Cache SET: {key} (ttl={ttl}s)")
             return True
         except Exception as e:
@@ -123,8 +247,10 @@ class CacheService:
             True if deleted, False otherwise
         """
         try:
+            self._l1.delete(key)
             redis_client = await self.get_redis()
             await redis_client.delete(key)
+            await self._publish_invalidation("key", key)
             logger.debug(f"Cache DELETE: {key}")
             return True
         except Exception as e:
@@ -135,6 +261,9 @@ class CacheService:
         """
         Delete all keys matching pattern.
 
+        Walks the keyspace with incremental SCAN and frees matches with UNLINK in
+        batches, so Redis never blocks on a full-keyspace KEYS or a large DEL.
+
         Args:
             pattern: Redis key pattern (e.g., "faq:*")
 
@@ -142,22 +271,193 @@ class CacheService:
             Number of keys deleted
         """
         try:
+            self._l1.clear_pattern(pattern)
             redis_client = await self.get_redis()
-            keys = await redis_client.keys(pattern)
-            if keys:
-                deleted = await redis_client.delete(*keys)
+            deleted = 0
+            batch: list[bytes] = []
+            async for key in redis_client.scan_iter(match=pattern, count=_SCAN_BATCH):
+                batch.append(key)
+                if len(batch) >= _SCAN_BATCH:
+                    deleted += await redis_client.unlink(*batch)
+                    batch = []
+            if batch:
+                deleted += await redis_client.unlink(*batch)
+            await self._publish_invalidation("pattern", pattern)
+            if deleted:
                 logger.info(f"Cache CLEAR pattern '{pattern}': {deleted} keys deleted")
-                return deleted
-            return 0
+            return deleted
         except Exception as e:
             logger.error(f"Cache CLEAR pattern error for {pattern}: {e}")
             return 0
 
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: int = 300,
+        *,
+        stale_ttl: Optional[int] = None,
+        beta: float = 1.0,
+        lock_ttl: int = 30,
+    ) -> Any:
+        """
+        Get cached value, computing it at most once across concurrent callers.
+
+        Values stay fresh for ``ttl`` seconds and are then served stale for up to
+        ``stale_ttl`` more seconds (default: ``ttl``) while one background refresh runs.
+        Shortly before expiry a refresh may also start early, with a probability that
+        grows with the time ``compute`` took ("XFetch", tuned by ``beta``). Concurrent
+        misses share one in-process task, and a Redis ``SET NX`` lock (``lock_ttl``
+        seconds) lets only one process compute; the others wait for its result.
+
+        Keys written here hold an envelope and must only be read via this method.
+
+        Args:
+            key: Cache key
+            compute: Coroutine function producing the value (JSON serializable)
+            ttl: Freshness in seconds
+            stale_ttl: Extra seconds a stale value may be served while revalidating
+            beta: Early refresh aggressiveness (0 disables it)
+            lock_ttl: Upper bound on one computation, in seconds
+
+        Returns:
+            Cached, stale or freshly computed value
+        """
+        stale_ttl = ttl if stale_ttl is None else stale_ttl
+        entry = await self._get_entry(key)
+        if entry is not None:
+            # 1 - random() is in (0, 1], so the log is <= 0 and the jitter is >= 0
+            jitter = -entry["delta"] * beta * math.log(1.0 - random.random())
+            if time.time() + jitter < entry["exp"]:
+                return entry["value"]
+            logger.debug(f"Cache REVALIDATE: {key}")
+            self._flight(key, compute, ttl, stale_ttl, lock_ttl, stale=entry)
+            return entry["value"]
+
+        return await asyncio.shield(
+            self._flight(key, compute, ttl, stale_ttl, lock_ttl, stale=None)
+        )
+
+    def _flight(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: int,
+        stale_ttl: int,
+        lock_ttl: int,
+        *,
+        stale: Optional[dict[str, Any]],
+    ) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(
+                self._compute_and_store(key, compute, ttl, stale_ttl, lock_ttl, stale)
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish_flight(key, done))
+        return task
+
+    def _finish_flight(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Cache compute error for key {key}: {task.exception()}")
+
+    async def _compute_and_store(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: int,
+        stale_ttl: int,
+        lock_ttl: int,
+        stale: Optional[dict[str, Any]],
+    ) -> Any:
+        lock_key = f"lock:{key}"
+        token = uuid.uuid4().hex
+        acquired = await self._acquire_lock(lock_key, token, lock_ttl)
+        if not acquired:
+            if stale is not None:
+                # Another process is already revalidating; keep serving stale
+                return stale["value"]
+            entry = await self._wait_for_entry(key, lock_ttl)
+            if entry is not None:
+                return entry["value"]
+            logger.warning(f"Cache lock wait timed out for key {key}, computing locally")
+
+        try:
+            started = time.monotonic()
+            value = await compute()
+            delta = time.monotonic() - started
+            await self._set_entry(key, value, ttl, stale_ttl, delta)
+            return value
+        finally:
+            if acquired:
+                await self._release_lock(lock_key, token)
+
+    async def _get_entry(self, key: str) -> Optional[dict[str, Any]]:
+        try:
+            entry = await self._read(key)
+        except Exception as e:
+            logger.error(f"Cache GET error for key {key}: {e}")
+            return None
+        if entry is None:
+            logger.debug(f"Cache MISS: {key}")
+            return None
+        # Values written by plain set() are not envelopes; treat them as a miss
+        if not isinstance(entry, dict) or "exp" not in entry or "value" not in entry:
+            return None
+        logger.debug(f"Cache HIT: {key}")
+        entry.setdefault("delta", 0.0)
+        return entry
+
+    async def _set_entry(
+        self, key: str, value: Any, ttl: int, stale_ttl: int, delta: float
+    ) -> None:
+        entry = {"value": value, "exp": time.time() + ttl, "delta": delta}
+        try:
+            await self._write(key, entry, ttl + stale_ttl)
+            logger.debug(f"Cache SET: {key} (ttl={ttl}s, stale={stale_ttl}s)")
+        except Exception as e:
+            logger.error(f"Cache SET error for key {key}: {e}")
+
+    async def _wait_for_entry(self, key: str, timeout: float) -> Optional[dict[str, Any]]:
+        deadline = time.monotonic() + timeout
+        delay = 0.05
+        while time.monotonic() < deadline:
+            await asyncio.sleep(delay)
+            entry = await self._get_entry(key)
+            if entry is not None:
+                return entry
+            delay = min(delay * 2, 0.5)
+        return None
+
+    async def _acquire_lock(self, lock_key: str, token: str, lock_ttl: int) -> bool:
+        try:
+            redis_client = await self.get_redis()
+            return bool(await redis_client.set(lock_key, token, nx=True, ex=lock_ttl))
+        except Exception as e:
+            # Without Redis there is no one to coordinate with: compute locally
+            logger.error(f"Cache LOCK error for key {lock_key}: {e}")
+            return True
+
+    async def _release_lock(self, lock_key: str, token: str) -> None:
+        try:
+            redis_client = await self.get_redis()
+            await redis_client.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+        except Exception as e:
+            logger.error(f"Cache UNLOCK error for key {lock_key}: {e}")
+
     async def close(self):
-        """Close Redis connection."""
-        if self._redis:
-            await self._redis.close()
-            logger.info("Redis connection closed")
+        """Stop the invalidation listener and close the shared Redis pool."""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        self._redis = None
+        await close_redis_client()
 
 
 # Global cache instance
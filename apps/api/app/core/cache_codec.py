@@ -0,0 +1,142 @@
+"""Serialization of cached values (codec + optional compression in a versioned envelope)."""
+
+from __future__ import annotations
+
+import json
+import logging
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+# Envelope: MAGIC, format version, codec id, compression id, payload. JSON text never
+# starts with 0xFE, so values written before envelopes existed still decode as plain JSON.
+MAGIC = b"\xfe"
+FORMAT_VERSION = 1
+HEADER_SIZE = 4
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZSTD = 1
+
+# (dumps, loads)
+Codec = tuple[Callable[[Any], bytes], Callable[[bytes], Any]]
+
+
+def _json_dumps(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, default=str).encode("utf-8")
+
+
+def _orjson_codec() -> Codec:
+    import orjson
+
+    def dumps(value: Any) -> bytes:
+        return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+    return dumps, orjson.loads
+
+
+def _msgpack_codec() -> Codec:
+    import msgpack
+
+    def dumps(value: Any) -> bytes:
+        return msgpack.packb(value, default=str, use_bin_type=True)
+
+    def loads(data: bytes) -> Any:
+        return msgpack.unpackb(data, raw=False)
+
+    return dumps, loads
+
+
+# name -> (envelope id, loader); loaders import lazily so missing extras only matter if used
+CODECS: dict[str, tuple[int, Callable[[], Codec]]] = {
+    "json": (1, lambda: (_json_dumps, json.loads)),
+    "orjson": (2, _orjson_codec),
+    "msgpack": (3, _msgpack_codec),
+}
+
+
+class CacheCodec:
+    """Encodes cache values into a self-describing envelope and decodes any known one."""
+
+    def __init__(self, codec: str = "auto", compress_min_bytes: int = 4096):
+        """
+        Args:
+            codec: "json", "orjson", "msgpack", or "auto" (orjson when installed)
+            compress_min_bytes: Payloads at least this large are zstd-compressed when
+                ``zstandard`` is installed; 0 disables compression
+        """
+        if codec == "auto":
+            codec = "orjson" if self._available("orjson") else "json"
+        elif codec not in CODECS or not self._available(codec):
+            logger.warning(f"Cache codec '{codec}' unavailable, falling back to json")
+            codec = "json"
+
+        self.name = codec
+        self.codec_id, loader = CODECS[codec]
+        self._dumps, _ = loader()
+        self._loads: dict[int, Callable[[bytes], Any]] = {}
+
+        self.compress_min_bytes = compress_min_bytes
+        self._compressor = None
+        self._decompressor = None
+        if compress_min_bytes > 0:
+            try:
+                import zstandard
+
+                self._compressor = zstandard.ZstdCompressor(level=3)
+            except ImportError:
+                logger.info("zstandard not installed; cached values are stored uncompressed")
+
+    @staticmethod
+    def _available(codec: str) -> bool:
+        try:
+            CODECS[codec][1]()
+        except ImportError:
+            return False
+        return True
+
+    def encode(self, value: Any) -> bytes:
+        payload = self._dumps(value)
+        compression = COMPRESSION_NONE
+        if self._compressor is not None and len(payload) >= self.compress_min_bytes:
+            payload = self._compressor.compress(payload)
+            compression = COMPRESSION_ZSTD
+        return MAGIC + bytes((FORMAT_VERSION, self.codec_id, compression)) + payload
+
+    def decode(self, data: bytes | str) -> Any:
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        if not data.startswith(MAGIC):
+            # Written before envelopes existed
+            return json.loads(data)
+
+        version, codec_id, compression = data[1], data[2], data[3]
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported cache envelope version {version}")
+        payload = data[HEADER_SIZE:]
+        if compression == COMPRESSION_ZSTD:
+            payload = self._get_decompressor().decompress(payload)
+        elif compression != COMPRESSION_NONE:
+            raise ValueError(f"Unsupported cache compression {compression}")
+        return self._get_loads(codec_id)(payload)
+
+    def _get_loads(self, codec_id: int) -> Callable[[bytes], Any]:
+        loads = self._loads.get(codec_id)
+        if loads is None:
+            for envelope_id, loader in CODECS.values():
+                if envelope_id == codec_id:
+                    _, loads = loader()
+                    break
+            else:
+                raise ValueError(f"Unknown cache codec id {codec_id}")
+            self._loads[codec_id] = loads
+        return loads
+
+    def _get_decompressor(self) -> Any:
+        if self._decompressor is None:
+            import zstandard
+
+            self._decompressor = zstandard.ZstdDecompressor()
+        return self._decompressor
+
+
+__all__ = ["CacheCodec", "CODECS"]
@@ -41,6 +41,11 @@ class Settings(BaseSettings):
     CHROMA_COLLECTION: str = Field("kb_main", alias="CHROMA_COLLECTION")
     CHROMA_METRIC: str = Field("cosine", alias="CHROMA_METRIC")
     CHROMA_HEADERS: str = Field("", alias="CHROMA_HEADERS")
+    VECTOR_UPSERT_BATCH: int = Field(128, alias="VECTOR_UPSERT_BATCH")
+    REINDEX_BATCH_SIZE: int = Field(256, alias="REINDEX_BATCH_SIZE")
+    VECTOR_ALIAS_CHECK_SECONDS: float = Field(15.0, alias="VECTOR_ALIAS_CHECK_SECONDS")
+    VECTOR_QUERY_CACHE_MAX_ENTRIES: int = Field(2048, alias="VECTOR_QUERY_CACHE_MAX_ENTRIES")
+    VECTOR_QUERY_CACHE_MAX_MB: int = Field(16, alias="VECTOR_QUERY_CACHE_MAX_MB")
 
     CONFIDENCE_THRESHOLD: float = Field(0.65, alias="CONFIDENCE_THRESHOLD")
     CONFIDENCE_DECAY: float = Field(0.6, alias="CONFIDENCE_DECAY")
@@ -52,12 +57,33 @@ class Settings(BaseSettings):
     HYBRID_FUSION_K: int = Field(60, alias="HYBRID_FUSION_K")
     HYBRID_MAX_DOCS: int = Field(5000, alias="HYBRID_MAX_DOCS")
 
+    RERANK_ENABLED: bool = Field(False, alias="RERANK_ENABLED")
+    RERANK_MODEL: str = Field("cross-encoder/mmarco-mMiniLMv2-L12-H384-v1", alias="RERANK_MODEL")
+    RERANK_BACKEND: str = Field("torch", alias="RERANK_BACKEND")
+    RERANK_TOP_N: int = Field(6, alias="RERANK_TOP_N")
+    RERANK_MAX_CANDIDATES: int = Field(30, alias="RERANK_MAX_CANDIDATES")
+    RERANK_BATCH_SIZE: int = Field(32, alias="RERANK_BATCH_SIZE")
+    RERANK_MAX_LENGTH: int = Field(384, alias="RERANK_MAX_LENGTH")
+    RERANK_BUDGET_MS: int = Field(400, alias="RERANK_BUDGET_MS")
+
     MAX_CONTEXT_CHARS: int = Field(8000, alias="MAX_CONTEXT_CHARS")
     TOP_K_RETRIEVAL: int = Field(5, alias="TOP_K_RETRIEVAL")
     MAX_SUB_QUERIES: int = Field(3, alias="MAX_SUB_QUERIES")
     TOP_K_PER_QUERY: int = Field(5, alias="TOP_K_PER_QUERY")
     CHAT_HISTORY_LIMIT: int = Field(5, alias="CHAT_HISTORY_LIMIT")
 
+    # Document Ingestion Queue
+    INGEST_POLL_SECONDS: float = Field(5.0, alias="INGEST_POLL_SECONDS")
+    INGEST_VISIBILITY_TIMEOUT_SECONDS: int = Field(300, alias="INGEST_VISIBILITY_TIMEOUT_SECONDS")
+    INGEST_MAX_ATTEMPTS: int = Field(5, alias="INGEST_MAX_ATTEMPTS")
+    INGEST_RETRY_BASE_SECONDS: float = Field(10.0, alias="INGEST_RETRY_BASE_SECONDS")
+    INGEST_RETRY_MAX_SECONDS: float = Field(600.0, alias="INGEST_RETRY_MAX_SECONDS")
+
+    # FAQ Materialization Settings
+    FAQ_LANGUAGES: str = Field("vi,en", alias="FAQ_LANGUAGES")
+    FAQ_REFRESH_SECONDS: int = Field(900, alias="FAQ_REFRESH_SECONDS")
+    FAQ_MATERIALIZE_LIMIT: int = Field(20, alias="FAQ_MATERIALIZE_LIMIT")
+
     # Query Expansion Settings
     QUERY_EXPANSION_ENABLED: bool = Field(True, alias="QUERY_EXPANSION_ENABLED")
     QUERY_EXPANSION_MAX: int = Field(1, alias="QUERY_EXPANSION_MAX")
@@ -65,6 +91,8 @@ class Settings(BaseSettings):
 
     UPLOAD_DIR: str = Field("./uploads", alias="UPLOAD_DIR")
     UPLOAD_MAX_MB: int = Field(50, alias="UPLOAD_MAX_MB")
+    UPLOAD_PART_SIZE_MB: int = Field(8, alias="UPLOAD_PART_SIZE_MB")
+    UPLOAD_CONCURRENCY: int = Field(4, alias="UPLOAD_CONCURRENCY")
 
     # Cloud Storage
     MINIO_ENDPOINT: str = Field("", alias="MINIO_ENDPOINT")
@@ -72,11 +100,25 @@ class Settings(BaseSettings):
     MINIO_SECRET_KEY: str = Field("", alias="MINIO_ROOT_PASSWORD")
     MINIO_SECURE: bool = Field(False, alias="MINIO_SECURE")
     MINIO_BUCKET_NAME: str = Field("", alias="MINIO_BUCKET")
+    DOWNLOAD_PRESIGNED_REDIRECT: bool = Field(False, alias="DOWNLOAD_PRESIGNED_REDIRECT")
+    DOWNLOAD_PRESIGNED_EXPIRY_SECONDS: int = Field(300, alias="DOWNLOAD_PRESIGNED_EXPIRY_SECONDS")
 
     # Celery
     CELERY_BROKER_URL: str = Field("redis://localhost:6379/0", alias="CELERY_BROKER_URL")
     CELERY_RESULT_BACKEND: str = Field("redis://localhost:6379/0", alias="CELERY_RESULT_BACKEND")
 
+    # Cache (Redis). Empty CACHE_URL = CELERY_BROKER_URL host, DB 1
+    CACHE_URL: str = Field("", alias="CACHE_URL")
+    CACHE_MAX_CONNECTIONS: int = Field(50, alias="CACHE_MAX_CONNECTIONS")
+    CACHE_HEALTH_CHECK_INTERVAL: int = Field(30, alias="CACHE_HEALTH_CHECK_INTERVAL")
+    RATE_LIMIT_BACKEND: str = Field("redis", alias="RATE_LIMIT_BACKEND")
+    RATE_LIMIT_REDIS_TIMEOUT_MS: int = Field(100, alias="RATE_LIMIT_REDIS_TIMEOUT_MS")
+    RATE_LIMIT_BREAKER_SECONDS: float = Field(30.0, alias="RATE_LIMIT_BREAKER_SECONDS")
+    CACHE_L1_MAX_ENTRIES: int = Field(1024, alias="CACHE_L1_MAX_ENTRIES")
+    CACHE_L1_TTL_SECONDS: float = Field(10.0, alias="CACHE_L1_TTL_SECONDS")
+    CACHE_CODEC: str = Field("auto", alias="CACHE_CODEC")
+    CACHE_COMPRESS_MIN_BYTES: int = Field(4096, alias="CACHE_COMPRESS_MIN_BYTES")
+
     # Email Configuration
     MAIL_USERNAME: str = Field("", alias="MAIL_USERNAME")
     MAIL_PASSWORD: str = Field("", alias="MAIL_PASSWORD")
@@ -96,6 +138,9 @@ class Settings(BaseSettings):
     mongo_db: str = Field("smartfaq", alias="MONGO_DB")
     mongo_chat_collection: str = Field("chat_messages", alias="MONGO_CHAT_COLLECTION")
     mongo_session_collection: str = Field("chat_sessions", alias="MONGO_SESSION_COLLECTION")
+    mongo_rollup_collection: str = Field("chat_daily_rollups", alias="MONGO_ROLLUP_COLLECTION")
+    mongo_faq_collection: str = Field("faq_snapshots", alias="MONGO_FAQ_COLLECTION")
+    mongo_verdict_collection: str = Field("faq_question_verdicts", alias="MONGO_VERDICT_COLLECTION")
 
 
 @lru_cache(maxsize=1)
@@ -31,9 +31,27 @@ def get_chat_sessions_collection() -> AsyncIOMotorCollection:
     return get_mongo_database()[collection_name]
 
 
+def get_chat_rollups_collection() -> AsyncIOMotorCollection:
+    """Per-day dashboard rollups derived from chat messages."""
+    return get_mongo_database()[settings.mongo_rollup_collection]
+
+
+def get_faq_snapshots_collection() -> AsyncIOMotorCollection:
+    """Materialized FAQ lists, one document per language."""
+    return get_mongo_database()[settings.mongo_faq_collection]
+
+
+def get_question_verdicts_collection() -> AsyncIOMotorCollection:
+    """Memoized refinement/guardrail verdicts for FAQ candidate questions."""
+    return get_mongo_database()[settings.mongo_verdict_collection]
+
+
 __all__ = [
     "get_mongo_client",
     "get_mongo_database",
     "get_chat_messages_collection",
     "get_chat_sessions_collection",
+    "get_chat_rollups_collection",
+    "get_faq_snapshots_collection",
+    "get_question_verdicts_collection",
 ]
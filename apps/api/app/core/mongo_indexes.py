@@ -0,0 +1,192 @@
+"""Declarative MongoDB index bootstrap and query-plan helpers for chat analytics."""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Iterator
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import IndexModel
+from pymongo.errors import OperationFailure
+
+from .mongo import get_chat_messages_collection, get_chat_rollups_collection
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    """A required index on one of the chat analytics collections."""
+
+    name: str
+    keys: list[tuple[str, int | str]]
+    partial_filter: dict[str, Any] | None = None
+    purpose: str = ""
+    options: dict[str, Any] = field(default_factory=dict)
+
+    def to_model(self) -> IndexModel:
+        kwargs: dict[str, Any] = {"name": self.name, **self.options}
+        if self.partial_filter:
+            kwargs["partialFilterExpression"] = self.partial_filter
+        return IndexModel(self.keys, **kwargs)
+
+
+CHAT_MESSAGE_INDEXES: tuple[IndexSpec, ...] = (
+    IndexSpec(
+        name="sessionId_createdAt_role",
+        keys=[("sessionId", 1), ("createdAt", -1), ("role", 1)],
+        purpose="chat history window, question lookup per session",
+    ),
+    IndexSpec(
+        name="role_createdAt_id",
+        keys=[("role", 1), ("createdAt", -1), ("_id", -1)],
+        purpose="FAQ/trending aggregations, rollup rebuilds, unfiltered query logs",
+    ),
+    IndexSpec(
+        name="fallback_answers_createdAt_id",
+        keys=[("createdAt", -1), ("_id", -1)],
+        partial_filter={"role": "assistant", "fallback": True},
+        purpose="unanswered questions feed, query logs filtered to fallbacks",
+    ),
+    IndexSpec(
+        name="role_lang_createdAt_id",
+        keys=[("role", 1), ("queryLog.lang", 1), ("createdAt", -1), ("_id", -1)],
+        purpose="query logs filtered by language",
+    ),
+    IndexSpec(
+        name="role_channel_createdAt_id",
+        keys=[("role", 1), ("queryLog.channel", 1), ("createdAt", -1), ("_id", -1)],
+        purpose="query logs filtered by channel",
+    ),
+    IndexSpec(
+        name="answer_question_text",
+        keys=[("text", "text"), ("question", "text")],
+        partial_filter={"role": "assistant"},
+        purpose="query log search over answers and their questions",
+        # No stemming/stop words: most questions are Vietnamese
+        options={"default_language": "none"},
+    ),
+)
+
+# Server error code for dropping an index that does not exist
+INDEX_NOT_FOUND = 27
+
+# Superseded index names, dropped by ensure_mongo_indexes when still present.
+RETIRED_MESSAGE_INDEXES: tuple[str, ...] = (
+    "role_createdAt",
+    "fallback_answers_createdAt",
+    "role_lang_createdAt",
+    "role_channel_createdAt",
+)
+
+CHAT_ROLLUP_INDEXES: tuple[IndexSpec, ...] = (
+    IndexSpec(
+        name="day",
+        keys=[("day", 1)],
+        purpose="dashboard metrics/trends windows over daily rollups",
+    ),
+)
+
+
+async def _sync_indexes(
+    coll: AsyncIOMotorCollection, specs: tuple[IndexSpec, ...], retired: tuple[str, ...] = ()
+) -> list[str]:
+    if retired:
+        existing = await coll.index_information()
+        for name in retired:
+            if name not in existing:
+                continue
+            try:
+                await coll.drop_index(name)
+            except OperationFailure as exc:
+                if exc.code != INDEX_NOT_FOUND:
+                    raise
+                # Another replica dropped it first
+                continue
+            logger.info("Dropped retired MongoDB index %s on %s", name, coll.name)
+    created = await coll.create_indexes([spec.to_model() for spec in specs])
+    logger.info("Ensured %d MongoDB indexes on %s", len(created), coll.name)
+    return created
+
+
+async def ensure_mongo_indexes(
+    messages_coll: AsyncIOMotorCollection | None = None,
+    rollups_coll: AsyncIOMotorCollection | None = None,
+) -> list[str]:
+    """Create every declared index (no-op for indexes that already exist)."""
+    messages_coll = messages_coll if messages_coll is not None else get_chat_messages_collection()
+    rollups_coll = rollups_coll if rollups_coll is not None else get_chat_rollups_collection()
+    names = await _sync_indexes(messages_coll, CHAT_MESSAGE_INDEXES, RETIRED_MESSAGE_INDEXES)
+    names += await _sync_indexes(rollups_coll, CHAT_ROLLUP_INDEXES)
+    return names
+
+
+def _iter_winning_plans(node: Any) -> Iterator[dict[str, Any]]:
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if key == "winningPlan" and isinstance(value, dict):
+                yield value
+            elif key != "rejectedPlans":
+                yield from _iter_winning_plans(value)
+    elif isinstance(node, list):
+        for item in node:
+            yield from _iter_winning_plans(item)
+
+
+def _iter_stages(plan: Any) -> Iterator[str]:
+    if isinstance(plan, dict):
+        stage = plan.get("stage")
+        if isinstance(stage, str):
+            yield stage
+        for value in plan.values():
+            yield from _iter_stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from _iter_stages(item)
+
+
+def winning_plan_stages(explain: dict[str, Any]) -> list[str]:
+    """Flatten the stage names of every winning plan in an explain() document.
+
+    Works for both find and aggregate explain output (classic and SBE engines).
+    """
+    stages: list[str] = []
+    for plan in _iter_winning_plans(explain):
+        # SBE nests the classic tree under "queryPlan"
+        stages.extend(_iter_stages(plan.get("queryPlan", plan)))
+    return stages
+
+
+def has_collscan(explain: dict[str, Any]) -> bool:
+    return "COLLSCAN" in winning_plan_stages(explain)
+
+
+async def explain_find(
+    coll: AsyncIOMotorCollection,
+    query: dict[str, Any],
+    sort: list[tuple[str, int]] | None = None,
+) -> dict[str, Any]:
+    cursor = coll.find(query)
+    if sort:
+        cursor = cursor.sort(sort)
+    return await cursor.explain()
+
+
+async def explain_aggregate(
+    coll: AsyncIOMotorCollection, pipeline: list[dict[str, Any]]
+) -> dict[str, Any]:
+    return await coll.database.command("aggregate", coll.name, pipeline=pipeline, explain=True)
+
+
+__all__ = [
+    "IndexSpec",
+    "CHAT_MESSAGE_INDEXES",
+    "CHAT_ROLLUP_INDEXES",
+    "RETIRED_MESSAGE_INDEXES",
+    "ensure_mongo_indexes",
+    "winning_plan_stages",
+    "has_collscan",
+    "explain_find",
+    "explain_aggregate",
+]
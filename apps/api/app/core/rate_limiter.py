@@ -1,16 +1,41 @@
-"""Simple in-memory rate limiting utilities for FastAPI endpoints."""
+"""Rate limiting utilities for FastAPI endpoints (Redis-backed, in-memory fallback)."""
 
 from __future__ import annotations
 
 import asyncio
+import logging
 import time
+import uuid
 from collections import deque
 from typing import Callable, Deque, Dict
 
 from fastapi import HTTPException, Request, status
 
+from .config import get_settings
+from .redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
 IdentifierFn = Callable[[Request], str]
 
+# Sliding log in a sorted set (member per hit, scored by time in ms), checked and updated
+# atomically. Returns {1, 0} when the hit is admitted, else {0, oldest hit's timestamp}.
+_SLIDING_WINDOW_SCRIPT = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[3]) then
+    local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+    return {0, tonumber(oldest[2])}
+end
+redis.call('ZADD', KEYS[1], now, ARGV[4])
+redis.call('PEXPIRE', KEYS[1], window)
+return {1, 0}
+"""
+
+# While open (monotonic deadline), limiters skip Redis and use their in-memory window
+_redis_breaker_open_until = 0.0
+
 
 def _default_identifier(request: Request) -> str:
     forwarded = request.headers.get("x-forwarded-for")
@@ -22,7 +47,13 @@ def _default_identifier(request: Request) -> str:
 
 
 class RateLimiter:
-    """Reusable dependency implementing a fixed window rate limiter."""
+    """Reusable dependency implementing a sliding window rate limiter.
+
+    With ``RATE_LIMIT_BACKEND=redis`` the hit log lives in the shared Redis pool, so the
+    limit holds across workers. A Redis check that fails or takes longer than
+    ``RATE_LIMIT_REDIS_TIMEOUT_MS`` falls back to the per-process window, and Redis is
+    then skipped for ``RATE_LIMIT_BREAKER_SECONDS`` so requests do not each wait on it.
+    """
 
     def __init__(
         self,
@@ -31,6 +62,7 @@ class RateLimiter:
         window_seconds: int,
         identifier: IdentifierFn | None = None,
         error_detail: str | None = None,
+        name: str | None = None,
     ) -> None:
         if limit <= 0 or window_seconds <= 0:
             raise ValueError("limit and window_seconds must be positive integers")
@@ -38,6 +70,7 @@ class RateLimiter:
         self.window_seconds = window_seconds
         self.identifier = identifier or _default_identifier
         self.error_detail = error_detail or "Too many requests. Please slow down."
+        self.name = name or f"{limit}per{window_seconds}s"
         self._hits: Dict[str, Deque[float]] = {}
         self._lock: asyncio.Lock | None = None
 
@@ -46,8 +79,50 @@ class RateLimiter:
             self._lock = asyncio.Lock()
         return self._lock
 
+    def _reject(self, retry_after: int) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=self.error_detail,
+            headers={"Retry-After": str(retry_after)},
+        )
+
     async def __call__(self, request: Request) -> None:
+        global _redis_breaker_open_until
         key = self.identifier(request)
+        settings = get_settings()
+        if settings.RATE_LIMIT_BACKEND == "redis" and time.monotonic() >= _redis_breaker_open_until:
+            try:
+                await asyncio.wait_for(
+                    self._check_redis(key), timeout=settings.RATE_LIMIT_REDIS_TIMEOUT_MS / 1000
+                )
+                return
+            except HTTPException:
+                raise
+            except Exception as e:
+                _redis_breaker_open_until = time.monotonic() + settings.RATE_LIMIT_BREAKER_SECONDS
+                logger.warning(
+                    f"Redis rate limit check failed ({type(e).__name__}: {e}); using in-memory "
+                    f"windows for {settings.RATE_LIMIT_BREAKER_SECONDS}s"
+                )
+        await self._check_local(key)
+
+    async def _check_redis(self, key: str) -> None:
+        now_ms = int(time.time() * 1000)
+        window_ms = self.window_seconds * 1000
+        admitted, oldest_ms = await get_redis_client().eval(
+            _SLIDING_WINDOW_SCRIPT,
+            1,
+            f"ratelimit:{self.name}:{key}",
+            now_ms,
+            window_ms,
+            self.limit,
+            f"{now_ms}:{uuid.uuid4().hex[:8]}",
+        )
+        if not admitted:
+            retry_after = max(1, -(-(int(oldest_ms) + window_ms - now_ms) // 1000))
+            raise self._reject(retry_after)
+
+    async def _check_local(self, key: str) -> None:
         now = time.monotonic()
         window_start = now - self.window_seconds
 
@@ -59,10 +134,6 @@ class RateLimiter:
 
             if len(bucket) >= self.limit:
                 retry_after = max(1, int(self.window_seconds - (now - bucket[0])))
-                raise HTTPException(
-                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                    detail=self.error_detail,
-                    headers={"Retry-After": str(retry_after)},
-                )
+                raise self._reject(retry_after)
 
             bucket.append(now)
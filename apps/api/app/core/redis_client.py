@@ -0,0 +1,74 @@
+"""Shared Redis connection pool for the cache and rate limiters."""
+
+from __future__ import annotations
+
+import logging
+from typing import Optional
+from urllib.parse import urlsplit, urlunsplit
+
+import redis.asyncio as redis
+from redis.asyncio import Redis
+from redis.asyncio.retry import Retry
+from redis.backoff import ExponentialBackoff
+from redis.exceptions import ConnectionError, TimeoutError
+
+from .config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# DB 0 belongs to Celery; the cache lives in DB 1 unless CACHE_URL says otherwise
+DEFAULT_CACHE_DB = 1
+
+_client: Optional[Redis] = None
+
+
+def resolve_cache_url() -> str:
+    """``CACHE_URL`` if set, else ``CELERY_BROKER_URL`` pointed at the cache DB."""
+    settings = get_settings()
+    if settings.CACHE_URL:
+        return settings.CACHE_URL
+    parts = urlsplit(settings.CELERY_BROKER_URL or "redis://localhost:6379/0")
+    return urlunsplit(parts._replace(path=f"/{DEFAULT_CACHE_DB}"))
+
+
+def get_redis_client() -> Redis:
+    """
+    Get the process-wide Redis client.
+
+    The client owns a bounded connection pool (``CACHE_MAX_CONNECTIONS``), health-checks
+    idle connections and retries timeouts and dropped connections with backoff. Values
+    are returned as raw bytes.
+    """
+    global _client
+    if _client is None:
+        settings = get_settings()
+        url = resolve_cache_url()
+        _client = redis.from_url(
+            url,
+            decode_responses=False,
+            max_connections=settings.CACHE_MAX_CONNECTIONS,
+            health_check_interval=settings.CACHE_HEALTH_CHECK_INTERVAL,
+            socket_connect_timeout=5,
+            socket_keepalive=True,
+            retry_on_timeout=True,
+            retry=Retry(ExponentialBackoff(cap=1.0, base=0.05), retries=3),
+            retry_on_error=[ConnectionError, TimeoutError],
+        )
+        parts = urlsplit(url)
+        logger.info(
+            f"Redis pool ready for {parts.hostname}:{parts.port or 6379}{parts.path} "
+            f"(max_connections={settings.CACHE_MAX_CONNECTIONS})"
+        )
+    return _client
+
+
+async def close_redis_client() -> None:
+    """Close the shared client and disconnect its pool."""
+    global _client
+    if _client is not None:
+        await _client.close(close_connection_pool=True)
+        _client = None
+        logger.info("Redis connection closed")
+
+
+__all__ = ["get_redis_client", "close_redis_client", "resolve_cache_url"]
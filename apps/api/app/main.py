@@ -9,6 +9,7 @@ from .api import settings as settings_api
 from .core.config import settings
 from .rag.embedder import get_embeddings
 from .rag.llm import LLMWrapper
+from .rag.reranker import get_reranker
 from .rag.retriever import Retriever
 from .rag.vector_store import get_vectorstore
 
@@ -72,29 +73,89 @@ def create_app() -> FastAPI:
     app.include_router(admin.router, prefix="/api/user", tags=["user"])
     app.include_router(staff.router, prefix="/api/user", tags=["user"])
 
-    # Start background cron worker on startup
+    # Start background ingestion worker on startup
     @app.on_event("startup")
-    async def _start_cron() -> None:
+    async def _start_ingestion_worker() -> None:
         try:
-            from .workers import cron
+            from .workers import ingestion
 
-            app.state.cron_task = asyncio.create_task(cron.start_periodic_task())
+            app.state.ingestion_task = asyncio.create_task(ingestion.run_ingestion_worker())
         except Exception:
-            # log lazily to avoid importing logging at top-level here
-            import logging
+            logger.exception("Failed to start ingestion worker")
 
-            logging.getLogger(__name__).exception("Failed to start cron worker")
+    @app.on_event("startup")
+    async def _start_alias_watcher() -> None:
+        from .rag.vector_store import watch_collection_alias
+
+        app.state.alias_task = asyncio.create_task(
+            watch_collection_alias(settings.VECTOR_ALIAS_CHECK_SECONDS)
+        )
+
+    @app.on_event("startup")
+    async def _start_faq_materializer() -> None:
+        try:
+            from .services.faq_materializer import get_faq_materializer
+
+            app.state.faq_task = asyncio.create_task(get_faq_materializer().run_forever())
+        except Exception:
+            logger.exception("Failed to start FAQ materializer")
+
+    @app.on_event("startup")
+    async def _ensure_mongo_indexes() -> None:
+        try:
+            from .core.mongo_indexes import ensure_mongo_indexes
+
+            await ensure_mongo_indexes()
+        except Exception:
+            logger.exception("Failed to ensure MongoDB indexes")
+
+        try:
+            from .core.mongo import get_chat_messages_collection, get_chat_rollups_collection
+            from .repositories.chat_rollups_repo import backfill_if_needed
+
+            if await backfill_if_needed(
+                get_chat_messages_collection(), get_chat_rollups_collection()
+            ):
+                logger.info("Backfilled dashboard rollups from chat history")
+        except Exception:
+            logger.exception("Failed to backfill dashboard rollups")
 
     @app.on_event("shutdown")
-    async def _stop_cron() -> None:
-        task = getattr(app.state, "cron_task", None)
+    async def _stop_ingestion_worker() -> None:
+        task = getattr(app.state, "ingestion_task", None)
         if task:
             task.cancel()
             try:
                 await task
-            except Exception:
+            except asyncio.CancelledError:
                 pass
 
+    @app.on_event("shutdown")
+    async def _stop_faq_materializer() -> None:
+        task = getattr(app.state, "faq_task", None)
+        if task:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    @app.on_event("shutdown")
+    async def _stop_alias_watcher() -> None:
+        task = getattr(app.state, "alias_task", None)
+        if task:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    @app.on_event("shutdown")
+    async def _close_cache() -> None:
+        from .core.cache import get_cache_service
+
+        await get_cache_service().close()
+
     @app.get("/health", tags=["system"])
     def health_check() -> dict[str, str]:
         return {"status": "ok", "environment": settings.env}
@@ -105,6 +166,7 @@ def create_app() -> FastAPI:
         Warm critical components so that the first user request is fast and clean.
         - Init embeddings/vectorstore (ensure collection exists).
         - Build BM25 index if hybrid retrieval is enabled.
+        - Load the cross-encoder reranker if enabled.
         - Init LLM client.
         """
         try:
@@ -122,6 +184,12 @@ def create_app() -> FastAPI:
                 except Exception:
                     logger.exception("Warmup: failed to build BM25 lexical index")
 
+            if settings.RERANK_ENABLED:
+                try:
+                    get_reranker().rerank("ping", [{"text": "ping"}], top_n=1)
+                except Exception:
+                    logger.exception("Warmup: failed to load reranker")
+
             # Init LLM
             try:
                 LLMWrapper()
@@ -6,6 +6,7 @@ from .config_entry import ConfigEntry
 from .department import Department
 from .document import Document
 from .fallback_log import FallbackLog
+from .ingestion_job import IngestionJob
 from .token_blacklist import TokenBlacklist
 from .user import User
 from .user_department import UserDepartment
@@ -17,6 +18,7 @@ __all__ = [
     "Document",
     "Department",
     "FallbackLog",
+    "IngestionJob",
     "ConfigEntry",
     "TokenBlacklist",
     "ChatSession",
@@ -0,0 +1,142 @@
+"""Alias naming the Chroma collection that serves traffic.
+
+The alias lives in the ``config_entries`` table so every API process and worker agrees on it.
+It names the ``active`` collection plus the embedding model its vectors were built with, and
+keeps the previously active collection as ``standby`` for rollback. A reindex builds a new
+collection offline and then flips the alias in one compare-and-set UPDATE.
+
+The vector store runs in sync code (often inside ``asyncio.to_thread``), so this module uses
+the synchronous ``SessionLocal``.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import asdict, dataclass
+from typing import Any, Optional
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.config_entry import ConfigEntry
+
+logger = logging.getLogger(__name__)
+
+ALIAS_KEY = "vector_store.collection_alias"
+REINDEX_CHECKPOINT_KEY = "vector_store.reindex_checkpoint"
+
+
+class AliasConflict(Exception):
+    """The alias changed since the caller read it."""
+
+
+@dataclass(frozen=True)
+class CollectionAlias:
+    active: str
+    embed_model: str
+    version: int = 0
+    standby: Optional[str] = None
+    standby_embed_model: Optional[str] = None
+
+
+def default_alias() -> CollectionAlias:
+    """The alias implied by settings before any swap has been recorded."""
+    return CollectionAlias(active=settings.CHROMA_COLLECTION, embed_model=settings.EMBED_MODEL)
+
+
+def get_config_value(key: str) -> Optional[dict[str, Any]]:
+    with SessionLocal() as session:
+        entry = session.execute(
+            select(ConfigEntry).where(ConfigEntry.key == key)
+        ).scalar_one_or_none()
+        return json.loads(entry.value_json) if entry else None
+
+
+def set_config_value(key: str, value: Optional[dict[str, Any]]) -> None:
+    """Upsert ``key``; ``None`` deletes it."""
+    with SessionLocal() as session:
+        entry = session.execute(
+            select(ConfigEntry).where(ConfigEntry.key == key)
+        ).scalar_one_or_none()
+        if value is None:
+            if entry:
+                session.delete(entry)
+        elif entry:
+            entry.value_json = json.dumps(value)
+        else:
+            session.add(ConfigEntry(key=key, value_json=json.dumps(value)))
+        session.commit()
+
+
+def load_alias(fallback: bool = True) -> CollectionAlias:
+    """
+    Current alias, or the settings default if none was ever written.
+
+    Args:
+        fallback: Also return the default when the database is unreachable instead of raising
+    """
+    try:
+        value = get_config_value(ALIAS_KEY)
+    except Exception:
+        if not fallback:
+            raise
+        logger.exception("Failed to read collection alias; using CHROMA_COLLECTION")
+        return default_alias()
+    return CollectionAlias(**value) if value else default_alias()
+
+
+def swap_alias(collection: str, embed_model: str, *, expected_version: int) -> CollectionAlias:
+    """
+    Make ``collection`` active and demote the current active collection to standby.
+
+    Raises:
+        AliasConflict: if the alias version is no longer ``expected_version``.
+    """
+    with SessionLocal() as session:
+        entry = session.execute(
+            select(ConfigEntry).where(ConfigEntry.key == ALIAS_KEY).with_for_update()
+        ).scalar_one_or_none()
+        current = CollectionAlias(**json.loads(entry.value_json)) if entry else default_alias()
+        if current.version != expected_version:
+            raise AliasConflict(
+                f"Collection alias is at version {current.version}, expected {expected_version}"
+            )
+
+        swapped = CollectionAlias(
+            active=collection,
+            embed_model=embed_model,
+            version=current.version + 1,
+            standby=current.active,
+            standby_embed_model=current.embed_model,
+        )
+        if entry:
+            entry.value_json = json.dumps(asdict(swapped))
+        else:
+            session.add(ConfigEntry(key=ALIAS_KEY, value_json=json.dumps(asdict(swapped))))
+        try:
+            session.commit()
+        except IntegrityError as exc:
+            # Another process inserted the first alias row concurrently
+            raise AliasConflict("Collection alias was created concurrently") from exc
+
+    logger.info(
+        f"Collection alias v{swapped.version}: {swapped.active} ({swapped.embed_model}), "
+        f"standby {swapped.standby}"
+    )
+    return swapped
+
+
+__all__ = [
+    "ALIAS_KEY",
+    "REINDEX_CHECKPOINT_KEY",
+    "AliasConflict",
+    "CollectionAlias",
+    "default_alias",
+    "get_config_value",
+    "set_config_value",
+    "load_alias",
+    "swap_alias",
+]
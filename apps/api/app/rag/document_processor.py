@@ -5,6 +5,7 @@ import io
 import logging
 import re
 import statistics
+import time
 from dataclasses import dataclass
 from enum import Enum
 from typing import Any, Dict, Iterable, List, Optional, Sequence
@@ -492,6 +493,7 @@ class DocumentProcessor:
         ext: str,
         document_id: str,
         metadata: Optional[Dict[str, Any]] = None,
+        stats: Optional[Dict[str, Any]] = None,
     ) -> List[Document]:
         """
         Full ingestion pipeline:
@@ -505,10 +507,15 @@ class DocumentProcessor:
             ext: File extension (e.g., '.pdf', '.docx')
             document_id: Unique document identifier
             metadata: Optional additional metadata
+            stats: Optional dict filled with parse_ms, chunk_embed_ms, elements, sentences
+                and chunks
         """
+        started = time.perf_counter()
         elements = self.load_document(file_stream, ext)
         if not elements:
             raise ValueError("Document has no readable content")
+        parsed = time.perf_counter()
+        sentences_before = self._chunker.sentences_seen
 
         docs: List[Document] = []
         list_buffer: List[DocumentElement] = []
@@ -626,6 +633,16 @@ class DocumentProcessor:
 
         cleaned = [d for d in docs if d.page_content.strip()]
         logger.info("Chunked document into %d chunks", len(cleaned))
+        if stats is not None:
+            stats.update(
+                {
+                    "parse_ms": int((parsed - started) * 1000),
+                    "chunk_embed_ms": int((time.perf_counter() - parsed) * 1000),
+                    "elements": len(elements),
+                    "sentences": self._chunker.sentences_seen - sentences_before,
+                    "chunks": len(cleaned),
+                }
+            )
         return cleaned
 
     def _build_metadata(
@@ -783,9 +800,11 @@ class _FallbackSemanticChunker:
         self.min_chunk_tokens = min_chunk_tokens
         self.max_chunk_tokens = max_chunk_tokens
         self.sentence_split_regex = re.compile(sentence_split_regex)
+        self.sentences_seen = 0
 
     def split_text(self, text: str) -> List[str]:
         sentences = [s.strip() for s in self.sentence_split_regex.split(text) if s.strip()]
+        self.sentences_seen += len(sentences)
         if not sentences:
             return [text]
 
@@ -835,6 +854,7 @@ class _SemanticMergeChunker:
         self.max_chunk_tokens = max_chunk_tokens
         self.similarity_threshold = similarity_threshold
         self.sentence_split_regex = re.compile(sentence_split_regex)
+        self.sentences_seen = 0
 
     @staticmethod
     def _cosine(a: List[float], b: List[float]) -> float:
@@ -847,6 +867,7 @@ class _SemanticMergeChunker:
 
     def split_text(self, text: str) -> List[str]:
         sentences = [s.strip() for s in self.sentence_split_regex.split(text) if s.strip()]
+        self.sentences_seen += len(sentences)
         if not sentences:
             return [text]
 
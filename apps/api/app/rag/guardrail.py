@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
-from typing import Dict
+import re
+from typing import Any, Dict, List, Optional
 
+from app.core.input_validation import _PROMPT_INJECTION_PHRASES, _contains_phrase
 from app.rag.llm import LLMWrapper
-from app.rag.prompts import get_guardrail_prompt
+from app.rag.prompts import get_guardrail_batch_prompt, get_guardrail_prompt
 
 logger = logging.getLogger(__name__)
 
@@ -36,15 +40,66 @@ REFUSAL_MESSAGES = {
 }
 
 
+# Unambiguous markers the LLM guardrail would block anyway; matched on word boundaries.
+# "FPT" is deliberately absent: it is allowed in a payment context (FPT Pay).
+_SYSTEM_MANAGEMENT_PHRASES: tuple[str, ...] = (
+    "admin panel",
+    "system logs",
+    "database",
+    "bản nháp",
+    "quản lý file",
+    "quản lý tài liệu",
+    "tài liệu đã tải lên",
+    "uploaded documents",
+    "uploaded files",
+)
+_COMPETITOR_NAMES: tuple[str, ...] = (
+    "rmit",
+    "duy tan",
+    "duy tân",
+    "bach khoa",
+    "bách khoa",
+    "fpt university",
+    "đại học fpt",
+)
+
+
+def _phrase_pattern(phrases: tuple[str, ...]) -> re.Pattern[str]:
+    return re.compile(r"\b(?:" + "|".join(map(re.escape, phrases)) + r")\b", re.IGNORECASE)
+
+
+_SYSTEM_MANAGEMENT_PATTERN = _phrase_pattern(_SYSTEM_MANAGEMENT_PHRASES)
+_COMPETITOR_PATTERN = _phrase_pattern(_COMPETITOR_NAMES)
+
+# Questions classified per guardrail LLM call by check_safety_batch
+GUARDRAIL_BATCH_SIZE = 25
+
+
 class GuardrailService:
-    def __init__(self, llm_wrapper: LLMWrapper):
+    def __init__(self, llm_wrapper: LLMWrapper, batch_size: int = GUARDRAIL_BATCH_SIZE):
         self.llm = llm_wrapper
+        self.batch_size = batch_size
+
+    def prefilter(self, question: str) -> Optional[Dict[str, str]]:
+        """
+        Block obvious cases locally, without an LLM call.
+
+        Returns a blocked response, or None when the question needs the LLM guardrail.
+        Nothing is allowed locally: toxicity and scope need the model.
+        """
+        if _contains_phrase(question, _PROMPT_INJECTION_PHRASES):
+            return self._create_response("irrelevant")
+        if _SYSTEM_MANAGEMENT_PATTERN.search(question):
+            return self._create_response("system_management")
+        if _COMPETITOR_PATTERN.search(question):
+            return self._create_response("competitor")
+        return None
 
     async def check_safety(self, question: str) -> Dict[str, str]:
         try:
             prompt = get_guardrail_prompt()
             result = await self.llm.invoke_json(prompt, question)
-            print(f"DEBUG GUARDRAIL: {result}")
+            logger.debug(f"Guardrail result: {result}")
         except Exception as e:
             logger.error(f"Guardrail check failed: {e}")
             return self._create_response("system_fail")
@@ -61,13 +116,84 @@ class GuardrailService:
 
         return {"status": "allowed"}
 
+    async def check_safety_batch(self, questions: List[str]) -> List[Dict[str, str]]:
+        """
+        Classify many questions with one LLM call per ``batch_size`` questions.
+
+        Obvious cases are settled by ``prefilter``. Items the batch response does not
+        classify (parse failure, missing ids) fall back to ``check_safety`` one by one.
+        Results are aligned with ``questions``.
+        """
+        results: List[Optional[Dict[str, str]]] = [self.prefilter(q) for q in questions]
+        pending = [idx for idx, result in enumerate(results) if result is None]
+        if len(pending) < len(questions):
+            logger.info(f"Guardrail prefilter settled {len(questions) - len(pending)} questions")
+
+        chunks = [
+            pending[start : start + self.batch_size]
+            for start in range(0, len(pending), self.batch_size)
+        ]
+        classified = await asyncio.gather(
+            *(self._classify_chunk([questions[idx] for idx in chunk]) for chunk in chunks)
+        )
+        for chunk, chunk_results in zip(chunks, classified):
+            for local_id, idx in enumerate(chunk):
+                results[idx] = chunk_results.get(local_id)
+
+        missing = [idx for idx, result in enumerate(results) if result is None]
+        if missing:
+            logger.warning(f"Guardrail batch left {len(missing)} questions unclassified")
+            singles = await asyncio.gather(*(self.check_safety(questions[idx]) for idx in missing))
+            for idx, result in zip(missing, singles):
+                results[idx] = result
+
+        return results  # type: ignore[return-value]
+
+    async def _classify_chunk(self, questions: List[str]) -> Dict[int, Dict[str, str]]:
+        if len(questions) == 1:
+            return {0: await self.check_safety(questions[0])}
+
+        payload = json.dumps(
+            [{"id": idx, "text": q} for idx, q in enumerate(questions)], ensure_ascii=False
+        )
+        try:
+            result = await self.llm.invoke_json(get_guardrail_batch_prompt(), payload)
+        except Exception as e:
+            logger.error(f"Guardrail batch check failed: {e}")
+            return {}
+        return self._parse_batch_result(result, len(questions))
+
+    def _parse_batch_result(self, result: Any, size: int) -> Dict[int, Dict[str, str]]:
+        items = result.get("results") if isinstance(result, dict) else result
+        if not isinstance(items, list):
+            logger.error(f"Guardrail batch returned invalid format: {result}")
+            return {}
+
+        parsed: Dict[int, Dict[str, str]] = {}
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            try:
+                item_id = int(item.get("id"))
+            except (TypeError, ValueError):
+                continue
+            if not 0 <= item_id < size:
+                continue
+
+            status = item.get("status")
+            if status == "blocked":
+                parsed[item_id] = self._create_response(item.get("reason") or "default")
+            elif status == "allowed":
+                parsed[item_id] = {"status": "allowed"}
+        return parsed
+
     def _create_response(self, code: str) -> Dict[str, str]:
         if code in ["profanity", "insult", "hate_speech", "harassment"]:
             code = "toxic"
 
         msgs = REFUSAL_MESSAGES.get(code, REFUSAL_MESSAGES["irrelevant"])
 
-        return {"status": "blocked", "vi": msgs["vi"], "en": msgs["en"]}
+        return {"status": "blocked", "reason": code, "vi": msgs["vi"], "en": msgs["en"]}
 
     async def is_question_appropriate(self, question: str) -> bool:
         """
@@ -34,6 +34,7 @@ class RAGMetrics:
     normalization_ms: int = 0
     analysis_ms: int = 0
     retrieval_ms: int = 0
+    rerank_ms: int = 0
     generation_ms: int = 0
 
     # Quality metrics
@@ -85,6 +86,7 @@ class RAGMetrics:
             "normalization_ms": self.normalization_ms,
             "analysis_ms": self.analysis_ms,
             "retrieval_ms": self.retrieval_ms,
+            "rerank_ms": self.rerank_ms,
             "generation_ms": self.generation_ms,
             "num_sub_queries": self.num_sub_queries,
             "num_contexts": self.num_contexts,
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import heapq
 import logging
 import time
 import uuid
@@ -19,6 +20,7 @@ from app.rag.prompts import (
     get_rewrite_question_prompt,
 )
 from app.rag.query_expander import QueryExpander
+from app.rag.reranker import rerank_contexts
 from app.rag.retriever import Retriever
 from app.rag.types import MasterAnalysis
 from app.utils.logging_config import setup_rag_metrics_logger
@@ -160,18 +162,18 @@ class RAGOrchestrator:
         metrics.num_sub_queries = len(unique_queries)
 
         metrics.start_stage("retrieve")
-        all_docs = []
+        ranked_lists = []
         for sq in unique_queries:
             try:
                 docs = self.retriever.retrieve(sq, top_k=settings.TOP_K_PER_QUERY)
-                all_docs.extend(docs)
+                ranked_lists.append(docs)
             except Exception as e:
                 logger.error(f"[{request_id}] Retrieval error for '{sq}': {e}")
                 metrics.error_type = ErrorType.RETRIEVAL_FAILED
                 metrics.error_message = str(e)
 
         metrics.retrieval_ms = metrics.end_stage("retrieve")
-        unique_docs = self._deduplicate(all_docs)
+        unique_docs = self._deduplicate(ranked_lists)
         metrics.num_contexts = len(unique_docs)
         metrics.num_unique_docs = len(
             set(d.get("document_id") for d in unique_docs if d.get("document_id"))
@@ -206,12 +208,20 @@ class RAGOrchestrator:
                 fb, [], 0, t0, True, metrics, query_fail=True, language=target_lang
             )
 
+        # Only the prompt (and the sources shown with it) use the reranked cut; retrieval
+        # quality and metrics stay on the fused list they are calibrated for
+        prompt_docs = unique_docs
+        if settings.RERANK_ENABLED:
+            metrics.start_stage("rerank")
+            prompt_docs = await rerank_contexts(refined_q, unique_docs)
+            metrics.rerank_ms = metrics.end_stage("rerank")
+
         metrics.start_stage("generate")
         try:
             logger.info(f"[{request_id}] Generating answer in '{target_lang}'...")
             ans = await self.llm.generate_answer_async(
                 refined_q,
-                unique_docs,
+                prompt_docs,
                 target_language=target_lang,
                 include_citations=include_citations,
             )
@@ -238,7 +248,7 @@ class RAGOrchestrator:
 
             # Evaluate answer confidence (how confident the LLM is about the answer)
             answer_confidence = await self.llm.evaluate_answer_confidence(
-                refined_q, ans, unique_docs
+                refined_q, ans, prompt_docs
             )
             logger.info(f"[{request_id}] Answer Confidence: {answer_confidence:.3f}")
 
@@ -290,7 +300,7 @@ class RAGOrchestrator:
             metrics.finalize()
             return self._response(
                 ans,
-                self._fmt_sources(unique_docs),
+                self._fmt_sources(prompt_docs),
                 final_confidence,
                 t0,
                 metrics.fallback_triggered,
@@ -413,23 +423,22 @@ class RAGOrchestrator:
 
         return response
 
-    def _deduplicate(self, docs):
-        seen = {}
-        for d in docs:
-            chunk_id = d.get("chunk_id")
-            if chunk_id:
-                if chunk_id in seen:
-                    if d.get("score", 0) > seen[chunk_id].get("score", 0):
-                        seen[chunk_id] = d
-                else:
-                    seen[chunk_id] = d
-            else:
-                text_key = d.get("text", "")[:100]
-                if text_key not in seen:
-                    seen[text_key] = d
+    def _deduplicate(self, ranked_lists):
+        """
+        Merge per-sub-query results, each already best-first from the retriever, into one
+        best-first list without duplicates.
 
-        result = list(seen.values())
-        result.sort(key=lambda x: x.get("score", 0), reverse=True)
+        The merge visits every chunk's highest-scoring copy first, so later copies are
+        dropped and the combined set is never sorted again.
+        """
+        seen = set()
+        result = []
+        merged = heapq.merge(*ranked_lists, key=lambda x: x.get("score", 0), reverse=True)
+        for d in merged:
+            key = d.get("chunk_id") or d.get("text", "")[:100]
+            if key not in seen:
+                seen.add(key)
+                result.append(d)
         return result
 
     def _fmt_sources(self, docs):
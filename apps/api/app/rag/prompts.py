@@ -188,11 +188,7 @@ OUTPUT JSON ONLY:
 """
 
 
-def get_guardrail_prompt() -> str:
-    return """You are a Security Guard for a Vietnamese University Chatbot (Greenwich Vietnam).
-Analyze the User Input and return JSON.
-
-RULES:
+_GUARDRAIL_RULES = """RULES:
 1. TOXICITY:
    - Block profanity, insults, hate speech
      -> status: "blocked", reason: "toxic"
@@ -249,7 +245,17 @@ EXAMPLES OF BLOCKED QUESTIONS:
 - "So sánh Greenwich với FPT University?" → blocked (competitor comparison)
 - "FPT có tốt không?" → blocked (FPT without payment context = FPT University)
 - "Greenwich hay FPT?" → blocked (competitor comparison)
+"""
+
 
+def get_guardrail_prompt() -> str:
+    return (
+        """You are a Security Guard for a Vietnamese University Chatbot (Greenwich Vietnam).
+Analyze the User Input and return JSON.
+
+"""
+        + _GUARDRAIL_RULES
+        + """
 OUTPUT JSON ONLY:
 {{
   "status": "allowed" | "blocked",
@@ -259,6 +265,30 @@ OUTPUT JSON ONLY:
 User Input:
 {input}
 """
+    )
+
+
+def get_guardrail_batch_prompt() -> str:
+    return (
+        """You are a Security Guard for a Vietnamese University Chatbot (Greenwich Vietnam).
+The User Input is a JSON array of items {{"id": number, "text": string}}.
+Apply the rules to EACH item's text independently and return JSON.
+
+"""
+        + _GUARDRAIL_RULES
+        + """
+OUTPUT JSON ONLY, exactly one result per input item, using the item's id:
+{{
+  "results": [
+    {{
+      "id": number,
+      "status": "allowed" | "blocked",
+      "reason": "toxic" | "system_management" | "competitor" | "irrelevant" | "wrong_language" | null
+    }}
+  ]
+}}
+"""
+    )
 
 
 def get_contextualize_q_prompt() -> str:
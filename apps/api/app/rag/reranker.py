@@ -0,0 +1,187 @@
+"""Optional cross-encoder reranking between retrieval and answer generation.
+
+Fused (RRF) rank decides which chunks are retrieved, but it is a poor judge of which of them
+actually answer the question. When ``RERANK_ENABLED`` is set, the fused candidates are scored
+against the question by a small multilingual cross-encoder on CPU, in one batch, and only the
+best ``RERANK_TOP_N`` reach the prompt.
+
+The model runs with sentence-transformers (torch) or, with ``RERANK_BACKEND=onnx`` and the
+``rerank`` extra installed, ONNX Runtime. Scoring is bounded by ``RERANK_BUDGET_MS``: a request
+that would wait longer keeps the fused order instead.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# (question, passage) pairs -> relevance scores
+ScoreFn = Callable[[Sequence[Tuple[str, str]]], List[float]]
+
+_RERANKER: Optional["CrossEncoderReranker"] = None
+_LOAD_LOCK = threading.Lock()
+# One scoring batch at a time; CPU inference does not get faster by overlapping requests
+_BUSY = threading.Lock()
+
+
+class CrossEncoderReranker:
+    """Scores (question, passage) pairs with a cross-encoder on CPU."""
+
+    def __init__(
+        self,
+        model_name: str,
+        backend: str = "torch",
+        max_length: int = 384,
+        batch_size: int = 32,
+    ):
+        """
+        Args:
+            model_name: Hugging Face model id or local directory
+            backend: "torch" or "onnx" (falls back to torch if ONNX Runtime is unavailable)
+            max_length: Token limit per pair; longer passages are truncated
+            batch_size: Pairs per forward pass
+        """
+        self.model_name = model_name
+        self.max_length = max_length
+        self.batch_size = batch_size
+        self.backend = backend
+        if backend == "onnx":
+            try:
+                self._score = self._load_onnx()
+            except ImportError:
+                logger.warning("ONNX Runtime not installed (pip install .[rerank]); using torch")
+                self.backend = "torch"
+        elif backend != "torch":
+            logger.warning(f"Unknown reranker backend '{backend}', using torch")
+            self.backend = "torch"
+        if self.backend == "torch":
+            self._score = self._load_torch()
+        logger.info(f"Reranker {model_name} loaded ({self.backend})")
+
+    def _load_torch(self) -> ScoreFn:
+        from sentence_transformers import CrossEncoder
+
+        model = CrossEncoder(self.model_name, max_length=self.max_length, device="cpu")
+
+        def score(pairs: Sequence[Tuple[str, str]]) -> List[float]:
+            return model.predict(
+                list(pairs), batch_size=self.batch_size, show_progress_bar=False
+            ).tolist()
+
+        return score
+
+    def _load_onnx(self) -> ScoreFn:
+        from optimum.onnxruntime import ORTModelForSequenceClassification
+        from transformers import AutoTokenizer
+
+        tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+        # A local directory with model.onnx is used as is; anything else is exported on load
+        exported = os.path.isfile(os.path.join(self.model_name, "model.onnx"))
+        model = ORTModelForSequenceClassification.from_pretrained(
+            self.model_name, export=not exported, provider="CPUExecutionProvider"
+        )
+
+        def score(pairs: Sequence[Tuple[str, str]]) -> List[float]:
+            scores: List[float] = []
+            for start in range(0, len(pairs), self.batch_size):
+                batch = pairs[start : start + self.batch_size]
+                inputs = tokenizer(
+                    [question for question, _ in batch],
+                    [passage for _, passage in batch],
+                    padding=True,
+                    truncation="only_second",
+                    max_length=self.max_length,
+                    return_tensors="np",
+                )
+                logits = model(**inputs).logits
+                scores.extend(logits[:, 0].tolist())
+            return scores
+
+        return score
+
+    def rerank(
+        self, question: str, contexts: Sequence[Dict[str, Any]], top_n: int
+    ) -> List[Dict[str, Any]]:
+        """The ``top_n`` contexts by cross-encoder score, each annotated with ``score_rerank``."""
+        scores = self._score([(question, ctx.get("text") or "") for ctx in contexts])
+        ranked = sorted(zip(scores, range(len(contexts))), key=lambda item: item[0], reverse=True)
+        results: List[Dict[str, Any]] = []
+        for score, idx in ranked[:top_n]:
+            ctx = dict(contexts[idx])
+            ctx["score_rerank"] = float(score)
+            results.append(ctx)
+        return results
+
+
+def get_reranker() -> CrossEncoderReranker:
+    """Process-wide reranker, loaded on first use."""
+    global _RERANKER
+    if _RERANKER is None:
+        with _LOAD_LOCK:
+            if _RERANKER is None:
+                _RERANKER = CrossEncoderReranker(
+                    settings.RERANK_MODEL,
+                    backend=settings.RERANK_BACKEND,
+                    max_length=settings.RERANK_MAX_LENGTH,
+                    batch_size=settings.RERANK_BATCH_SIZE,
+                )
+    return _RERANKER
+
+
+def _rerank_locked(
+    question: str, contexts: List[Dict[str, Any]], top_n: int
+) -> List[Dict[str, Any]]:
+    try:
+        return get_reranker().rerank(question, contexts, top_n)
+    finally:
+        _BUSY.release()
+
+
+async def rerank_contexts(question: str, contexts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Rerank fused ``contexts`` for ``question`` and keep the best ``RERANK_TOP_N``.
+
+    Only the first ``RERANK_MAX_CANDIDATES`` (by fused score) are scored. Returns ``contexts``
+    unchanged if the reranker is busy with another request, fails, or misses the budget; an
+    abandoned batch finishes in the background and its result is dropped.
+    """
+    if len(contexts) <= 1:
+        return contexts
+    if not _BUSY.acquire(blocking=False):
+        logger.info("Reranker busy; keeping fused order")
+        return contexts
+
+    candidates = contexts[: settings.RERANK_MAX_CANDIDATES]
+    started = time.perf_counter()
+    # Submitted right away (unlike a to_thread task), so _BUSY is always released by the thread
+    scoring = asyncio.get_running_loop().run_in_executor(
+        None, _rerank_locked, question, candidates, settings.RERANK_TOP_N
+    )
+    try:
+        reranked = await asyncio.wait_for(scoring, timeout=settings.RERANK_BUDGET_MS / 1000)
+    except asyncio.TimeoutError:
+        logger.warning(
+            f"Reranking {len(candidates)} contexts exceeded {settings.RERANK_BUDGET_MS}ms; "
+            "keeping fused order"
+        )
+        return contexts
+    except Exception:
+        logger.exception("Reranking failed; keeping fused order")
+        return contexts
+
+    logger.debug(
+        f"Reranked {len(candidates)} contexts to {len(reranked)} in "
+        f"{(time.perf_counter() - started) * 1000:.0f}ms"
+    )
+    return reranked
+
+
+__all__ = ["CrossEncoderReranker", "get_reranker", "rerank_contexts"]
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import heapq
 import logging
 import re
 from typing import Any, Dict, List, Literal, Optional, Sequence
 
+import numpy as np
 from langchain_core.documents import Document
 from rank_bm25 import BM25Okapi
 
@@ -32,6 +34,56 @@ _VIETNAMESE_CHARS = re.compile(
 _TOKEN_RE = re.compile(r"[A-Za-z0-9']+")
 
 
+class _Hit:
+    """
+    One candidate chunk on the retrieval path.
+
+    Holds a reference to the Document instead of a copied metadata dict; only the hits that
+    survive top-k selection are turned into context dicts (``to_context``).
+    """
+
+    __slots__ = ("doc", "score_vec", "rank_vec", "score_lex", "rank_lex", "rrf")
+
+    def __init__(self, doc: Document):
+        self.doc = doc
+        self.score_vec: Optional[float] = None
+        self.rank_vec: Optional[int] = None
+        self.score_lex: Optional[float] = None
+        self.rank_lex: Optional[int] = None
+        self.rrf = 0.0
+
+    @property
+    def key(self) -> str:
+        meta = self.doc.metadata or {}
+        if meta.get("chunk_id"):
+            return f"chunk:{meta['chunk_id']}"
+        if meta.get("document_id"):
+            return f"doc:{meta['document_id']}"
+        return f"text:{hash(self.doc.page_content or '')}"
+
+    def to_context(self, score: Optional[float] = None) -> Dict[str, Any]:
+        meta = dict(self.doc.metadata or {})
+        ctx: Dict[str, Any] = {
+            "text": self.doc.page_content,
+            "metadata": meta,
+            "score": self.score_vec if score is None else score,
+            "document_id": meta.get("document_id"),
+            "chunk_id": meta.get("chunk_id"),
+            "page": meta.get("page"),
+            "source": meta.get("source"),
+            "department_id": meta.get("department_id"),
+        }
+        if self.rank_vec is not None:
+            ctx["score_vec"] = self.score_vec
+            ctx["rank_vec"] = self.rank_vec
+        if self.rank_lex is not None:
+            ctx["score_lex"] = self.score_lex
+            ctx["rank_lex"] = self.rank_lex
+        if score is not None:
+            ctx["score_rrf_raw"] = self.rrf
+        return ctx
+
+
 def _is_vietnamese(text: str) -> bool:
     """Detect if text contains Vietnamese characters."""
     return bool(_VIETNAMESE_CHARS.search(text.lower()))
@@ -128,33 +180,30 @@ class _BM25LexicalIndex:
                 f"Removed {removed_count} documents from BM25 index (remaining: {len(self.documents)})"
             )
 
-    def search(self, query: str, k: int = 10) -> List[Dict[str, Any]]:
-        if not self.documents:
+    def search(self, query: str, k: int = 10) -> List[_Hit]:
+        """Top ``k`` documents by BM25 score, best first."""
+        if not self.documents or k <= 0:
             return []
         tokens = _tokenize(query)
         if not tokens:
             return []
 
-        scores = self.bm25.get_scores(tokens)
-        ranked = sorted(enumerate(scores), key=lambda x: x[1], reverse=True)
-
-        results: List[Dict[str, Any]] = []
-        for rank, (idx, score) in enumerate(ranked[:k], start=1):
-            doc = self.documents[idx]
-            meta = dict(doc.metadata or {})
-            results.append(
-                {
-                    "text": doc.page_content,
-                    "metadata": meta,
-                    "score_lex": float(score),
-                    "rank_lex": rank,
-                    "document_id": meta.get("document_id"),
-                    "chunk_id": meta.get("chunk_id"),
-                    "page": meta.get("page"),
-                    "source": meta.get("source"),
-                    "department_id": meta.get("department_id"),
-                }
-            )
+        scores = np.asarray(self.bm25.get_scores(tokens))
+        k = min(k, len(scores))
+        # Partial selection is O(N); only the k winners get sorted. Ties go to the earlier
+        # document, at the cut and within the winners, as a stable full sort would order them.
+        kth = np.partition(scores, len(scores) - k)[len(scores) - k]
+        above = np.flatnonzero(scores > kth)
+        tied = np.flatnonzero(scores == kth)[: k - len(above)]
+        top = np.concatenate((above, tied))
+        top = top[np.lexsort((top, -scores[top]))]
+
+        results: List[_Hit] = []
+        for rank, idx in enumerate(top.tolist(), start=1):
+            hit = _Hit(self.documents[idx])
+            hit.score_lex = float(scores[idx])
+            hit.rank_lex = rank
+            results.append(hit)
         return results
 
 
@@ -163,6 +212,8 @@ class Retriever:
         self.vector_store = vector_store or VectorStore()
         self._lexical_index: Optional[_BM25LexicalIndex] = None
         self._lexical_ready: bool = False
+        # Collection alias version the BM25 index was built from
+        self._lexical_version: Optional[int] = None
 
     def is_empty(self) -> bool:
         return self.vector_store.is_empty()
@@ -173,25 +224,30 @@ class Retriever:
         top_k: int = 5,
         where: Optional[Dict[str, Any]] = None,
         with_score: bool = True,
+        embedding: Optional[List[float]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Retrieve relevant document chunks (optionally filtered by metadata).
+        ``embedding`` is the query's vector if the caller already has it; otherwise the
+        vector store embeds ``query`` (through its query embedding cache).
         Returns: [{text, metadata, score}]
         """
         if not with_score:
-            docs = self.vector_store.similarity_search(query, k=top_k, where=where)
+            docs = self.vector_store.similarity_search(
+                query, k=top_k, where=where, embedding=embedding
+            )
             return self._format_results_no_score(docs)
 
         if settings.HYBRID_ENABLED and where:
             logger.debug(
                 "Hybrid retrieval skips metadata filters; using vector-only for where=%s", where
             )
-            return self._retrieve_vector_only(query, top_k=top_k, where=where)
+            return self._retrieve_vector_only(query, top_k=top_k, where=where, embedding=embedding)
 
         if settings.HYBRID_ENABLED:
-            return self._retrieve_hybrid(query, top_k=top_k, where=where)
+            return self._retrieve_hybrid(query, top_k=top_k, where=where, embedding=embedding)
 
-        return self._retrieve_vector_only(query, top_k=top_k, where=where)
+        return self._retrieve_vector_only(query, top_k=top_k, where=where, embedding=embedding)
 
     def calculate_retrieval_quality(
         self, contexts: List[Dict[str, Any]], num_sub_queries: int = 1
@@ -274,37 +330,45 @@ class Retriever:
         ]
 
     def _retrieve_vector_only(
-        self, query: str, top_k: int, where: Optional[Dict[str, Any]] = None
+        self,
+        query: str,
+        top_k: int,
+        where: Optional[Dict[str, Any]] = None,
+        embedding: Optional[List[float]] = None,
     ) -> List[Dict[str, Any]]:
-        results = self.vector_store.similarity_search_with_score(query, k=top_k, where=where)
-        contexts: List[Dict[str, Any]] = []
+        hits = self._vector_hits(query, top_k=top_k, where=where, embedding=embedding)
+        return [hit.to_context() for hit in hits]
+
+    def _vector_hits(
+        self,
+        query: str,
+        top_k: int,
+        where: Optional[Dict[str, Any]] = None,
+        embedding: Optional[List[float]] = None,
+    ) -> List[_Hit]:
+        results = self.vector_store.similarity_search_with_score(
+            query, k=top_k, where=where, embedding=embedding
+        )
+        hits: List[_Hit] = []
         for rank, (doc, distance) in enumerate(results, start=1):
-            similarity = _distance_to_similarity(distance, settings.CHROMA_METRIC)
-            meta = dict(doc.metadata or {})
-            contexts.append(
-                {
-                    "text": doc.page_content,
-                    "metadata": meta,
-                    "score": similarity,
-                    "score_vec": similarity,
-                    "rank_vec": rank,
-                    "document_id": meta.get("document_id"),
-                    "chunk_id": meta.get("chunk_id"),
-                    "page": meta.get("page"),
-                    "source": meta.get("source"),
-                    "department_id": meta.get("department_id"),
-                }
-            )
-        return contexts
+            hit = _Hit(doc)
+            hit.score_vec = _distance_to_similarity(distance, settings.CHROMA_METRIC)
+            hit.rank_vec = rank
+            hits.append(hit)
+        return hits
 
     def _retrieve_hybrid(
-        self, query: str, top_k: int, where: Optional[Dict[str, Any]] = None
+        self,
+        query: str,
+        top_k: int,
+        where: Optional[Dict[str, Any]] = None,
+        embedding: Optional[List[float]] = None,
     ) -> List[Dict[str, Any]]:
         vec_k = max(top_k, settings.HYBRID_K_VEC)
-        vector_results = self._retrieve_vector_only(query, top_k=vec_k, where=where)
+        vector_results = self._vector_hits(query, top_k=vec_k, where=where, embedding=embedding)
 
         lex_index = self._get_lexical_index()
-        lexical_results: List[Dict[str, Any]] = []
+        lexical_results: List[_Hit] = []
         if lex_index:
             try:
                 lexical_results = lex_index.search(query, k=settings.HYBRID_K_LEX)
@@ -312,16 +376,19 @@ class Retriever:
                 logger.exception("Lexical (BM25) search failed: %s", exc)
 
         if not lexical_results:
-            return vector_results[:top_k]
+            return [hit.to_context() for hit in vector_results[:top_k]]
 
         fused = self._rrf_fuse(vector_results, lexical_results, top_k=top_k)
         return fused
 
     def _get_lexical_index(self) -> Optional[_BM25LexicalIndex]:
-        if self._lexical_ready:
+        version = self.vector_store.alias_version
+        if self._lexical_ready and self._lexical_version == version:
             return self._lexical_index
 
         self._lexical_ready = True
+        self._lexical_version = version
+        self._lexical_index = None
         docs = self.vector_store.get_all_documents(limit=settings.HYBRID_MAX_DOCS)
         if not docs:
             logger.warning("Hybrid mode enabled but no documents available for BM25 index.")
@@ -382,57 +449,39 @@ class Retriever:
         self._lexical_index = None
         self._get_lexical_index()
 
-    @staticmethod
-    def _ctx_key(ctx: Dict[str, Any]) -> str:
-        meta = ctx.get("metadata") or {}
-        chunk_id = meta.get("chunk_id") or ctx.get("chunk_id")
-        document_id = meta.get("document_id") or ctx.get("document_id")
-        if chunk_id:
-            return f"chunk:{chunk_id}"
-        if document_id:
-            return f"doc:{document_id}"
-        text = ctx.get("text") or ""
-        return f"text:{hash(text)}"
-
     def _rrf_fuse(
         self,
-        vector_contexts: List[Dict[str, Any]],
-        lexical_contexts: List[Dict[str, Any]],
+        vector_hits: List[_Hit],
+        lexical_hits: List[_Hit],
         top_k: int,
     ) -> List[Dict[str, Any]]:
-        fused: Dict[str, Dict[str, Any]] = {}
+        """
+        Reciprocal rank fusion of both hit lists; the ``top_k`` best as context dicts.
+
+        Hits are merged in place by chunk key and only the winners are materialized.
+        """
+        fused: Dict[str, _Hit] = {}
         k_param = max(settings.HYBRID_FUSION_K, 1)
 
-        for ctx in vector_contexts:
-            key = self._ctx_key(ctx)
-            fused.setdefault(key, {}).update(ctx)
+        for hit in vector_hits:
+            fused.setdefault(hit.key, hit)
 
-        for ctx in lexical_contexts:
-            key = self._ctx_key(ctx)
-            if key not in fused:
-                fused[key] = ctx
-            else:
-                fused[key].update({k: v for k, v in ctx.items() if v is not None})
+        for hit in lexical_hits:
+            existing = fused.setdefault(hit.key, hit)
+            if existing is not hit:
+                existing.doc = hit.doc
+                existing.score_lex = hit.score_lex
+                existing.rank_lex = hit.rank_lex
 
-        for key, ctx in fused.items():
-            rank_vec = ctx.get("rank_vec")
-            rank_lex = ctx.get("rank_lex")
+        for hit in fused.values():
             rrf = 0.0
-            if rank_vec:
-                rrf += 1.0 / (k_param + rank_vec)
-            if rank_lex:
-                rrf += 1.0 / (k_param + rank_lex)
-            ctx["score_rrf_raw"] = rrf
+            if hit.rank_vec:
+                rrf += 1.0 / (k_param + hit.rank_vec)
+            if hit.rank_lex:
+                rrf += 1.0 / (k_param + hit.rank_lex)
+            hit.rrf = rrf
 
+        top = heapq.nlargest(top_k, fused.values(), key=lambda hit: hit.rrf)
         # Normalize based on actual max score in this batch
-        max_rrf = max((ctx.get("score_rrf_raw", 0.0) for ctx in fused.values()), default=1.0)
-        if max_rrf > 0:
-            for ctx in fused.values():
-                raw = ctx.get("score_rrf_raw", 0.0)
-                ctx["score"] = min(raw / max_rrf, 1.0)
-        else:
-            for ctx in fused.values():
-                ctx["score"] = 0.0
-
-        ordered = sorted(fused.values(), key=lambda c: c.get("score", 0.0), reverse=True)
-        return ordered[:top_k]
+        max_rrf = top[0].rrf if top else 0.0
+        return [hit.to_context(min(hit.rrf / max_rrf, 1.0) if max_rrf > 0 else 0.0) for hit in top]
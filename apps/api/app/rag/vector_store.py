@@ -1,8 +1,14 @@
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import logging
+import threading
 import time
+from array import array
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from chromadb.config import Settings as ChromaSettings
@@ -10,10 +16,15 @@ from langchain_chroma import Chroma
 from langchain_core.documents import Document
 
 from app.core.config import settings
+from app.rag.collection_alias import CollectionAlias, load_alias
 from app.rag.embedder import get_embeddings
 
 __VECTORSTORE: Optional[Chroma] = None
 _PUBLIC_VECTORSTORE: Optional[Chroma] = None
+_ACTIVE_ALIAS: Optional[CollectionAlias] = None
+# _OPEN_LOCK serializes the first open; _ALIAS_LOCK keeps handle and alias swaps paired
+_OPEN_LOCK = threading.Lock()
+_ALIAS_LOCK = threading.Lock()
 logger = logging.getLogger(__name__)
 
 
@@ -30,12 +41,9 @@ def _parse_headers(raw: Optional[str]) -> Optional[Dict[str, str]]:
     return out
 
 
-def _get_vectorstore() -> Chroma:
-    global __VECTORSTORE
-    if __VECTORSTORE is not None:
-        return __VECTORSTORE
-
-    embeddings = get_embeddings()
+def build_vectorstore(collection_name: str, embed_model: Optional[str] = None) -> Chroma:
+    """Open (creating if needed) ``collection_name``, embedding with ``embed_model``."""
+    embeddings = get_embeddings(embed_model)
     chroma_url = settings.CHROMA_URL
 
     if chroma_url.startswith("http://") or chroma_url.startswith("https://"):
@@ -53,23 +61,174 @@ def _get_vectorstore() -> Chroma:
             chroma_server_http_port=port,
         )
 
-        __VECTORSTORE = Chroma(
+        return Chroma(
             client_settings=chroma_settings,
-            collection_name=settings.CHROMA_COLLECTION,
-            embedding_function=embeddings,
-            collection_metadata={"hnsw:space": settings.CHROMA_METRIC},
-        )
-    else:
-        __VECTORSTORE = Chroma(
-            persist_directory=chroma_url,
-            collection_name=settings.CHROMA_COLLECTION,
+            collection_name=collection_name,
             embedding_function=embeddings,
             collection_metadata={"hnsw:space": settings.CHROMA_METRIC},
         )
 
+    return Chroma(
+        persist_directory=chroma_url,
+        collection_name=collection_name,
+        embedding_function=embeddings,
+        collection_metadata={"hnsw:space": settings.CHROMA_METRIC},
+    )
+
+
+class _QueryEmbeddingCache:
+    """
+    Thread-safe LRU of query text -> embedding, keyed by embedding model name.
+
+    Bounded by entry count and by the bytes held in vectors and keys. Vectors are kept as
+    float32 arrays, the precision Chroma stores them at.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[Tuple[str, str], array] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _size(key: Tuple[str, str], vector: array) -> int:
+        return len(vector) * vector.itemsize + len(key[1].encode("utf-8"))
+
+    def get(self, model: str, query: str) -> Optional[List[float]]:
+        key = (model, query)
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is None:
+                return None
+            self._entries.move_to_end(key)
+            return vector.tolist()
+
+    def set(self, model: str, query: str, embedding: List[float]) -> None:
+        if self.max_entries <= 0 or self.max_bytes <= 0:
+            return
+        key = (model, query)
+        vector = array("f", embedding)
+        size = self._size(key, vector)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= self._size(key, previous)
+            self._entries[key] = vector
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                old_key, old_vector = self._entries.popitem(last=False)
+                self._bytes -= self._size(old_key, old_vector)
+
+
+_QUERY_EMBEDDINGS = _QueryEmbeddingCache(
+    settings.VECTOR_QUERY_CACHE_MAX_ENTRIES, settings.VECTOR_QUERY_CACHE_MAX_MB * 1024 * 1024
+)
+
+
+def _activate(alias: CollectionAlias, vs: Chroma) -> None:
+    global __VECTORSTORE, _ACTIVE_ALIAS
+    with _ALIAS_LOCK:
+        __VECTORSTORE = vs
+        _ACTIVE_ALIAS = alias
+    logger.info(
+        f"Using Chroma collection {alias.active} ({alias.embed_model}), alias v{alias.version}"
+    )
+
+
+def _get_vectorstore() -> Chroma:
+    """
+    The handle of the aliased active collection.
+
+    Resolved on first use; afterwards ``refresh_collection_alias`` moves it to a new collection
+    when the alias changes, so callers never pay for the lookup.
+    """
+    vs = __VECTORSTORE
+    if vs is not None:
+        return vs
+
+    with _OPEN_LOCK:
+        if __VECTORSTORE is None:
+            alias = load_alias()
+            _activate(alias, build_vectorstore(alias.active, alias.embed_model))
     return __VECTORSTORE
 
 
+def active_alias_version() -> int:
+    """Alias version the current handle belongs to (for caches derived from the collection)."""
+    _get_vectorstore()
+    return _ACTIVE_ALIAS.version if _ACTIVE_ALIAS else 0
+
+
+def _active_handle() -> Tuple[Chroma, CollectionAlias]:
+    """The current handle and the alias it belongs to, read as one consistent pair."""
+    _get_vectorstore()
+    with _ALIAS_LOCK:
+        return __VECTORSTORE, _ACTIVE_ALIAS
+
+
+def embed_query(query: str, handle: Optional[Tuple[Chroma, CollectionAlias]] = None) -> List[float]:
+    """
+    Embedding of ``query`` with the active collection's model, served from the LRU when cached.
+
+    Query expansions repeat a lot (short popular questions, the same sub-question across turns),
+    so most calls skip the model entirely. Pass the ``handle`` the vector will be searched
+    against, so an alias swap in between cannot pair it with another model's collection.
+    """
+    vs, alias = handle or _active_handle()
+    embedding = _QUERY_EMBEDDINGS.get(alias.embed_model, query)
+    if embedding is None:
+        embedding = vs.embeddings.embed_query(query)
+        _QUERY_EMBEDDINGS.set(alias.embed_model, query, embedding)
+    return embedding
+
+
+def refresh_collection_alias() -> bool:
+    """
+    Follow the collection alias if it changed; returns True when traffic moved.
+
+    The check is one primary-key read. On a change the new collection and its embedding model
+    are opened and warmed with a probe query *before* the handle is swapped, so the first
+    requests against the new collection do not pay the cold start.
+    """
+    global _ACTIVE_ALIAS
+    # A failed read must not look like "no alias" and flip traffic to the default collection
+    alias = load_alias(fallback=False)
+    current = _ACTIVE_ALIAS
+    if current is not None and alias.version == current.version:
+        return False
+    if current is not None and (alias.active, alias.embed_model) == (
+        current.active,
+        current.embed_model,
+    ):
+        # Only the standby changed
+        with _ALIAS_LOCK:
+            _ACTIVE_ALIAS = alias
+        return False
+
+    vs = build_vectorstore(alias.active, alias.embed_model)
+    vs.similarity_search("ping", k=1)
+    _activate(alias, vs)
+    return True
+
+
+async def watch_collection_alias(interval: float) -> None:
+    """Poll the alias every ``interval`` seconds (API lifetime task)."""
+    logger.info(f"Watching the Chroma collection alias every {interval} seconds")
+    try:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(refresh_collection_alias)
+            except Exception:
+                logger.exception("Failed to refresh the Chroma collection alias")
+    except asyncio.CancelledError:
+        logger.info("Collection alias watcher cancelled")
+        raise
+
+
 def get_vectorstore() -> Chroma:
     """
     Backwards-compatible accessor expected by scripts/tests.
@@ -128,14 +287,74 @@ def upsert_documents(docs: Iterable[Document], ids: Optional[List[str]] = None)
         dedup_ids.append(did)
 
     if dedup_docs:
-        vs.add_documents(dedup_docs, ids=dedup_ids)
+        upsert_batched(vs, dedup_docs, dedup_ids)
+
+
+def _server_max_batch_size(vs: Chroma) -> Optional[int]:
+    client = getattr(vs, "_client", None)
+    try:
+        if hasattr(client, "get_max_batch_size"):
+            return int(client.get_max_batch_size())
+        return int(client.max_batch_size)
+    except Exception:
+        return None
+
+
+def upsert_batched(vs: Chroma, docs: List[Document], ids: List[str]) -> None:
+    """
+    Embed and upsert ``docs`` in ``VECTOR_UPSERT_BATCH``-sized batches.
+
+    Batches never exceed the Chroma server's max batch size. Batch N+1 is embedded on this
+    thread while batch N uploads on another, so the model and the network work in parallel
+    and only two batches of vectors are held in memory at a time.
+    """
+    batch_size = max(1, settings.VECTOR_UPSERT_BATCH)
+    server_max = _server_max_batch_size(vs)
+    if server_max:
+        batch_size = min(batch_size, server_max)
+
+    collection = vs._collection
+    embeddings = vs.embeddings
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="chroma-upsert") as uploader:
+        pending: Optional[Future] = None
+        for start in range(0, len(docs), batch_size):
+            batch = docs[start : start + batch_size]
+            batch_ids = ids[start : start + batch_size]
+            if embeddings is None or any(not doc.metadata for doc in batch):
+                # Let langchain handle collection-side embedding and metadata-less documents
+                upload = partial(vs.add_documents, batch, ids=batch_ids)
+            else:
+                texts = [doc.page_content for doc in batch]
+                upload = partial(
+                    collection.upsert,
+                    ids=batch_ids,
+                    embeddings=embeddings.embed_documents(texts),
+                    documents=texts,
+                    metadatas=[doc.metadata for doc in batch],
+                )
+            if pending is not None:
+                pending.result()
+            pending = uploader.submit(upload)
+        if pending is not None:
+            pending.result()
 
 
 def similarity_search(
-    query: str, k: Optional[int] = None, where: Optional[Dict[str, Any]] = None
+    query: str,
+    k: Optional[int] = None,
+    where: Optional[Dict[str, Any]] = None,
+    embedding: Optional[List[float]] = None,
+    vs: Optional[Chroma] = None,
 ) -> List[Document]:
-    vs = _get_vectorstore()
+    """
+    Search by ``query``, or by ``embedding`` when the caller already has its vector.
+
+    ``vs`` pins the collection handle the embedding was computed for.
+    """
+    vs = vs if vs is not None else _get_vectorstore()
     k = k if k is not None else settings.TOP_K_RETRIEVAL
+    if embedding is not None:
+        return vs.similarity_search_by_vector(embedding, k=k, filter=where)
     if where:
         retriever = vs.as_retriever(search_kwargs={"k": k, "filter": where})
         return retriever.invoke(query)
@@ -143,10 +362,18 @@ def similarity_search(
 
 
 def similarity_search_with_score(
-    query: str, k: Optional[int] = None, where: Optional[Dict[str, Any]] = None
+    query: str,
+    k: Optional[int] = None,
+    where: Optional[Dict[str, Any]] = None,
+    embedding: Optional[List[float]] = None,
+    vs: Optional[Chroma] = None,
 ) -> List[Tuple[Document, float]]:
-    vs = _get_vectorstore()
+    """(document, distance) pairs for ``query``, or for ``embedding`` when given."""
+    vs = vs if vs is not None else _get_vectorstore()
     k = k if k is not None else settings.TOP_K_RETRIEVAL
+    if embedding is not None:
+        # langchain_chroma returns raw distances here, same as similarity_search_with_score
+        return vs.similarity_search_by_vector_with_relevance_scores(embedding, k=k, filter=where)
     if where:
         try:
             collection = vs._collection
@@ -219,7 +446,16 @@ def _collection_get_documents(limit: Optional[int] = None) -> List[Document]:
 
 class VectorStore:
     def __init__(self) -> None:
-        self._vs = _get_vectorstore()
+        _get_vectorstore()
+
+    @property
+    def _vs(self) -> Chroma:
+        # Resolved per call so a long-lived instance follows alias swaps
+        return _get_vectorstore()
+
+    @property
+    def alias_version(self) -> int:
+        return active_alias_version()
 
     def is_empty(self) -> bool:
         try:
@@ -232,15 +468,32 @@ class VectorStore:
         except Exception:
             return True
 
+    def embed_query(self, query: str) -> List[float]:
+        return embed_query(query)
+
     def similarity_search(
-        self, query: str, k: Optional[int] = None, where: Optional[Dict[str, Any]] = None
+        self,
+        query: str,
+        k: Optional[int] = None,
+        where: Optional[Dict[str, Any]] = None,
+        embedding: Optional[List[float]] = None,
     ) -> List[Document]:
-        return similarity_search(query, k, where)
+        handle = _active_handle()
+        if embedding is None:
+            embedding = embed_query(query, handle)
+        return similarity_search(query, k, where, embedding=embedding, vs=handle[0])
 
     def similarity_search_with_score(
-        self, query: str, k: Optional[int] = None, where: Optional[Dict[str, Any]] = None
+        self,
+        query: str,
+        k: Optional[int] = None,
+        where: Optional[Dict[str, Any]] = None,
+        embedding: Optional[List[float]] = None,
     ):
-        return similarity_search_with_score(query, k, where)
+        handle = _active_handle()
+        if embedding is None:
+            embedding = embed_query(query, handle)
+        return similarity_search_with_score(query, k, where, embedding=embedding, vs=handle[0])
 
     def add_documents(self, documents: Iterable[Document], ids: Optional[List[str]] = None) -> None:
         upsert_documents(documents, ids)
@@ -0,0 +1,229 @@
+"""Query shapes for chat analytics (dashboard and FAQ) over the Mongo messages collection.
+
+Endpoints build their filters/pipelines here so that ``scripts/check_mongo_indexes.py`` can
+``explain()`` exactly the queries that run in production.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+from datetime import datetime
+from typing import Any
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+
+from ..models.chat import ChatRole
+
+# Total order for keyset pagination: createdAt ties are broken by _id.
+KEYSET_ORDER: dict[str, int] = {"createdAt": -1, "_id": -1}
+KEYSET_SORT: list[tuple[str, int]] = list(KEYSET_ORDER.items())
+# Large per-answer fields that list views never render.
+LOG_LIST_PROJECTION: dict[str, int] = {"sources": 0}
+
+
+def encode_cursor(message: dict[str, Any]) -> str:
+    """Opaque pagination token pointing just past ``message`` in KEYSET_ORDER."""
+    created_at = message["createdAt"]
+    payload = json.dumps({"t": created_at.isoformat(), "id": str(message["_id"])})
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(token: str) -> tuple[datetime, str]:
+    """Inverse of ``encode_cursor``; raises ValueError for malformed tokens."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+        return datetime.fromisoformat(payload["t"]), str(payload["id"])
+    except Exception as exc:
+        raise ValueError("Invalid pagination cursor") from exc
+
+
+def keyset_after(created_at: datetime, message_id: str) -> dict[str, Any]:
+    """Filter for messages strictly after (createdAt, _id) in KEYSET_ORDER."""
+    return {
+        "$or": [
+            {"createdAt": {"$lt": created_at}},
+            {"createdAt": created_at, "_id": {"$lt": message_id}},
+        ]
+    }
+
+
+def questions_since_filter(since: datetime) -> dict[str, Any]:
+    return {"role": ChatRole.USER.value, "createdAt": {"$gte": since}}
+
+
+def unanswered_filter() -> dict[str, Any]:
+    return {"role": ChatRole.ASSISTANT.value, "fallback": True}
+
+
+def unanswered_page_pipeline(
+    collection_name: str, *, limit: int, after: tuple[datetime, str] | None = None
+) -> list[dict[str, Any]]:
+    """One page of fallback answers with their question text.
+
+    Newer answers carry the question inline; older ones are joined via ``questionId``.
+    """
+    match = unanswered_filter()
+    if after is not None:
+        match.update(keyset_after(*after))
+    return [
+        {"$match": match},
+        {"$sort": KEYSET_ORDER},
+        {"$limit": limit},
+        {
+            "$project": {
+                "sessionId": 1,
+                "createdAt": 1,
+                "question": 1,
+                "questionId": 1,
+                "queryLog.channel": 1,
+                "queryLog.fallback": 1,
+            }
+        },
+        {
+            "$lookup": {
+                "from": collection_name,
+                "localField": "questionId",
+                "foreignField": "_id",
+                "as": "questionDoc",
+            }
+        },
+        {
+            "$addFields": {
+                "question": {"$ifNull": ["$question", {"$arrayElemAt": ["$questionDoc.text", 0]}]}
+            }
+        },
+        {"$project": {"questionDoc": 0}},
+    ]
+
+
+def preceding_questions_pipeline(
+    collection_name: str, message_ids: list[str]
+) -> list[dict[str, Any]]:
+    """Resolve the user question asked just before each answer in ``message_ids``.
+
+    Used for answers written before the question was stored on them; each lookup is
+    bounded to a single index probe on (sessionId, createdAt).
+    """
+    return [
+        {"$match": {"_id": {"$in": message_ids}}},
+        {
+            "$lookup": {
+                "from": collection_name,
+                "let": {"sid": "$sessionId", "ts": "$createdAt"},
+                "pipeline": [
+                    {
+                        "$match": {
+                            "$expr": {
+                                "$and": [
+                                    {"$eq": ["$sessionId", "$$sid"]},
+                                    {"$eq": ["$role", ChatRole.USER.value]},
+                                    {"$lte": ["$createdAt", "$$ts"]},
+                                ]
+                            }
+                        }
+                    },
+                    {"$sort": {"createdAt": -1}},
+                    {"$limit": 1},
+                    {"$project": {"_id": 0, "text": 1}},
+                ],
+                "as": "questionDoc",
+            }
+        },
+        {"$project": {"question": {"$arrayElemAt": ["$questionDoc.text", 0]}}},
+    ]
+
+
+async def resolve_missing_questions(
+    coll: AsyncIOMotorCollection, messages: list[dict[str, Any]]
+) -> None:
+    """Fill ``question`` in-place for answers that carry neither the text nor a link."""
+    missing = [m["_id"] for m in messages if m.get("question") is None]
+    if not missing:
+        return
+    rows = await coll.aggregate(preceding_questions_pipeline(coll.name, missing)).to_list(
+        length=len(missing)
+    )
+    by_id = {row["_id"]: row.get("question") for row in rows}
+    for message in messages:
+        if message.get("question") is None:
+            message["question"] = by_id.get(message["_id"])
+
+
+def query_logs_filter(
+    *,
+    fallback: bool | None = None,
+    lang: str | None = None,
+    channel: str | None = None,
+    search: str | None = None,
+) -> dict[str, Any]:
+    query: dict[str, Any] = {"role": ChatRole.ASSISTANT.value}
+    if fallback is not None:
+        query["fallback"] = fallback
+    if lang:
+        query["queryLog.lang"] = lang
+    if channel:
+        query["queryLog.channel"] = channel
+    # Phrase search over the answer and its denormalized question, served by the
+    # answer_question_text index (case and diacritic insensitive).
+    phrase = (search or "").replace('"', " ").strip()
+    if phrase:
+        query["$text"] = {"$search": f'"{phrase}"'}
+    return query
+
+
+def frequent_questions_pipeline(
+    since: datetime, *, min_frequency: int, limit: int
+) -> list[dict[str, Any]]:
+    return [
+        # Match user messages only (not assistant)
+        {"$match": questions_since_filter(since)},
+        # Group by normalized question and count
+        {
+            "$group": {
+                "_id": {"$toLower": {"$trim": {"input": "$text"}}},
+                "count": {"$sum": 1},
+                "originalText": {"$first": "$text"},
+                "lastAsked": {"$max": "$createdAt"},
+            }
+        },
+        # Filter by minimum frequency
+        {"$match": {"count": {"$gte": min_frequency}}},
+        # Sort by frequency (descending)
+        {"$sort": {"count": -1}},
+        {"$limit": limit},
+    ]
+
+
+def trending_questions_pipeline(since: datetime, *, limit: int) -> list[dict[str, Any]]:
+    return [
+        {"$match": questions_since_filter(since)},
+        {
+            "$group": {
+                "_id": {"$toLower": {"$trim": {"input": "$text"}}},
+                "count": {"$sum": 1},
+                "originalText": {"$first": "$text"},
+            }
+        },
+        {"$match": {"count": {"$gte": 2}}},  # Asked at least twice
+        {"$sort": {"count": -1}},
+        {"$limit": limit},
+    ]
+
+
+__all__ = [
+    "KEYSET_ORDER",
+    "KEYSET_SORT",
+    "LOG_LIST_PROJECTION",
+    "encode_cursor",
+    "decode_cursor",
+    "keyset_after",
+    "unanswered_page_pipeline",
+    "preceding_questions_pipeline",
+    "resolve_missing_questions",
+    "questions_since_filter",
+    "unanswered_filter",
+    "query_logs_filter",
+    "frequent_questions_pipeline",
+    "trending_questions_pipeline",
+]
@@ -6,6 +6,12 @@ from typing import Any
 
 from motor.motor_asyncio import AsyncIOMotorCollection
 
+# Newest-first ordering for a session, served by the sessionId_createdAt_role index
+# (see core.mongo_indexes). Question and answer of one turn share the same createdAt, so
+# "role" breaks the tie ("assistant" < "user") and reversing the page yields
+# user -> assistant order.
+HISTORY_SORT: list[tuple[str, int]] = [("createdAt", -1), ("role", 1)]
+
 
 async def insert_messages(
     messages_coll: AsyncIOMotorCollection, docs: list[dict[str, Any]]
@@ -16,10 +22,32 @@ async def insert_messages(
 
 
 async def find_history(
-    messages_coll: AsyncIOMotorCollection, session_id: str, limit: int
+    messages_coll: AsyncIOMotorCollection,
+    session_id: str,
+    limit: int,
+    projection: dict[str, Any] | None = None,
 ) -> list[dict[str, Any]]:
-    cursor = messages_coll.find({"sessionId": session_id}).sort("createdAt", 1).limit(limit)
-    return await cursor.to_list(length=limit)
+    """Return the latest ``limit`` messages of a session in chronological order.
+
+    The query walks the (sessionId, createdAt, role) index backwards and stops after
+    ``limit`` entries, so the cost is O(limit) regardless of session length.
+    """
+    cursor = (
+        messages_coll.find({"sessionId": session_id}, projection).sort(HISTORY_SORT).limit(limit)
+    )
+    records = await cursor.to_list(length=limit)
+    records.reverse()
+    return records
+
+
+async def find_recent_turns(
+    messages_coll: AsyncIOMotorCollection, session_id: str, limit: int
+) -> list[dict[str, str]]:
+    """Latest ``limit`` messages projected to ``role``/``text`` for the LLM context window."""
+    records = await find_history(
+        messages_coll, session_id, limit, projection={"_id": 0, "role": 1, "text": 1}
+    )
+    return [{"role": str(r.get("role") or ""), "text": str(r.get("text") or "")} for r in records]
 
 
 async def find_message(
@@ -34,4 +62,10 @@ async def update_message(
     await messages_coll.update_one({"_id": message_id}, {"$set": update_doc})
 
 
-__all__ = ["insert_messages", "find_history", "find_message", "update_message"]
+__all__ = [
+    "insert_messages",
+    "find_history",
+    "find_recent_turns",
+    "find_message",
+    "update_message",
+]
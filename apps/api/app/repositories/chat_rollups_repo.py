@@ -0,0 +1,288 @@
+"""Per-day chat analytics rollups (Mongo).
+
+One document per (UTC day, language, channel) holds running counters for answered turns,
+fallbacks, response latency (sum, count, histogram) and confidence. They are incremented
+on every persisted turn and can be rebuilt from raw ``chat_messages`` for backfills, so
+dashboard reads touch a few hundred tiny documents instead of the full message history.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+from typing import Any
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+
+from ..models.chat import ChatRole
+
+# Upper bounds (ms) of the latency histogram buckets; slower answers land in "inf".
+LATENCY_BUCKETS_MS: tuple[int, ...] = (250, 500, 1000, 2000, 4000, 8000, 16000)
+UNKNOWN = "unknown"
+# Marker document in the rollups collection, written once a full rebuild has completed
+META_ID = "meta"
+# Turns are counted moments after their createdAt, so a UTC day stops receiving live
+# increments shortly after midnight
+SETTLE_GRACE = timedelta(minutes=5)
+
+
+def day_key(value: datetime | date) -> str:
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.strftime("%Y-%m-%d")
+
+
+def latency_bucket(latency_ms: int) -> str:
+    for upper in LATENCY_BUCKETS_MS:
+        if latency_ms <= upper:
+            return str(upper)
+    return "inf"
+
+
+def settled_before(now: datetime | None = None) -> datetime:
+    """Start of the oldest UTC day that live turns may still increment."""
+    now = now or datetime.now(timezone.utc)
+    return (now - SETTLE_GRACE).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _rollup_id(day: str, lang: str, channel: str) -> str:
+    return f"{day}|{lang}|{channel}"
+
+
+async def record_turn(
+    rollups_coll: AsyncIOMotorCollection,
+    *,
+    created_at: datetime,
+    lang: str | None,
+    channel: str | None,
+    response_ms: int | None,
+    confidence: float | None,
+    fallback: bool,
+) -> None:
+    """Fold one persisted question/answer turn into its daily rollup."""
+    day = day_key(created_at)
+    lang = lang or UNKNOWN
+    channel = channel or UNKNOWN
+
+    inc: dict[str, Any] = {"questions": 1, "fallbacks": 1 if fallback else 0}
+    if response_ms is not None:
+        inc["latencySumMs"] = int(response_ms)
+        inc["latencyCount"] = 1
+        inc[f"latencyHist.{latency_bucket(int(response_ms))}"] = 1
+    if confidence is not None:
+        inc["confidenceSum"] = float(confidence)
+        inc["confidenceCount"] = 1
+
+    await rollups_coll.update_one(
+        {"_id": _rollup_id(day, lang, channel)},
+        {
+            "$inc": inc,
+            "$set": {"updatedAt": datetime.now(timezone.utc)},
+            "$setOnInsert": {"day": day, "lang": lang, "channel": channel},
+        },
+        upsert=True,
+    )
+
+
+def rollup_pipeline(
+    since: datetime | None = None, until: datetime | None = None
+) -> list[dict[str, Any]]:
+    """Aggregate raw assistant messages into rollup documents (without the $merge stage)."""
+    match: dict[str, Any] = {"role": ChatRole.ASSISTANT.value}
+    created: dict[str, Any] = {}
+    if since is not None:
+        created["$gte"] = since
+    if until is not None:
+        created["$lt"] = until
+    if created:
+        match["createdAt"] = created
+
+    has_latency = {"$isNumber": "$responseMs"}
+    has_confidence = {"$isNumber": "$confidence"}
+    bucket_switch = {
+        "$switch": {
+            "branches": [
+                {"case": {"$lte": ["$responseMs", upper]}, "then": str(upper)}
+                for upper in LATENCY_BUCKETS_MS
+            ],
+            "default": "inf",
+        }
+    }
+    labels = [str(upper) for upper in LATENCY_BUCKETS_MS] + ["inf"]
+
+    return [
+        {"$match": match},
+        {
+            "$project": {
+                "day": {"$dateToString": {"format": "%Y-%m-%d", "date": "$createdAt"}},
+                "lang": {"$ifNull": ["$queryLog.lang", UNKNOWN]},
+                "channel": {"$ifNull": ["$queryLog.channel", UNKNOWN]},
+                "fallback": {"$cond": [{"$eq": ["$fallback", True]}, 1, 0]},
+                "responseMs": "$queryLog.responseMs",
+                "confidence": 1,
+            }
+        },
+        {
+            "$addFields": {
+                "hasLatency": {"$cond": [has_latency, 1, 0]},
+                "hasConfidence": {"$cond": [has_confidence, 1, 0]},
+                "bucket": {"$cond": [has_latency, bucket_switch, None]},
+            }
+        },
+        {
+            "$group": {
+                "_id": {"day": "$day", "lang": "$lang", "channel": "$channel"},
+                "questions": {"$sum": 1},
+                "fallbacks": {"$sum": "$fallback"},
+                "latencySumMs": {"$sum": "$responseMs"},
+                "latencyCount": {"$sum": "$hasLatency"},
+                "confidenceSum": {"$sum": "$confidence"},
+                "confidenceCount": {"$sum": "$hasConfidence"},
+                **{
+                    f"hist_{label}": {"$sum": {"$cond": [{"$eq": ["$bucket", label]}, 1, 0]}}
+                    for label in labels
+                },
+            }
+        },
+        {
+            "$project": {
+                "_id": {"$concat": ["$_id.day", "|", "$_id.lang", "|", "$_id.channel"]},
+                "day": "$_id.day",
+                "lang": "$_id.lang",
+                "channel": "$_id.channel",
+                "questions": 1,
+                "fallbacks": 1,
+                "latencySumMs": 1,
+                "latencyCount": 1,
+                "confidenceSum": 1,
+                "confidenceCount": 1,
+                "latencyHist": {label: f"$hist_{label}" for label in labels},
+                "updatedAt": "$$NOW",
+            }
+        },
+    ]
+
+
+async def rebuild_rollups(
+    messages_coll: AsyncIOMotorCollection,
+    rollups_coll: AsyncIOMotorCollection,
+    since: datetime | None = None,
+) -> None:
+    """
+    Recompute rollups from raw messages (all history, or whole days from ``since``).
+
+    Only settled days are rebuilt. The ``$merge`` replaces whole documents, so a
+    ``record_turn`` increment landing between the aggregate's read and its write would be
+    lost; the current UTC day is left to the live counters. A full rebuild records its
+    completion in the ``META_ID`` document.
+    """
+    if since is not None:
+        since = since.replace(hour=0, minute=0, second=0, microsecond=0)
+    pipeline = rollup_pipeline(since, settled_before()) + [
+        {
+            "$merge": {
+                "into": rollups_coll.name,
+                "on": "_id",
+                "whenMatched": "replace",
+                "whenNotMatched": "insert",
+            }
+        }
+    ]
+    await messages_coll.aggregate(pipeline).to_list(length=None)
+    if since is None:
+        await _mark_backfilled(rollups_coll)
+
+
+async def _mark_backfilled(rollups_coll: AsyncIOMotorCollection) -> None:
+    await rollups_coll.update_one(
+        {"_id": META_ID},
+        {"$set": {"backfilledAt": datetime.now(timezone.utc)}},
+        upsert=True,
+    )
+
+
+async def backfill_if_needed(
+    messages_coll: AsyncIOMotorCollection, rollups_coll: AsyncIOMotorCollection
+) -> bool:
+    """
+    Build rollups from history until a full rebuild has completed once.
+
+    Gated on the ``META_ID`` marker rather than on the collection being empty: live turns
+    (from this or another replica) can create rollups before startup gets here. Turns from
+    earlier on the current day are not included; ``scripts/rebuild_rollups.py --days 1``
+    adds them once the day has closed. Returns True if a rebuild ran.
+    """
+    if await rollups_coll.find_one({"_id": META_ID}, projection={"_id": 1}) is not None:
+        return False
+    if await messages_coll.find_one({"role": ChatRole.ASSISTANT.value}, {"_id": 1}) is None:
+        await _mark_backfilled(rollups_coll)
+        return False
+    await rebuild_rollups(messages_coll, rollups_coll)
+    return True
+
+
+def _totals_group() -> dict[str, Any]:
+    return {
+        "_id": None,
+        "questions": {"$sum": "$questions"},
+        "fallbacks": {"$sum": "$fallbacks"},
+        "latencySumMs": {"$sum": "$latencySumMs"},
+        "latencyCount": {"$sum": "$latencyCount"},
+    }
+
+
+async def dashboard_totals(
+    rollups_coll: AsyncIOMotorCollection, *, today: str, window_start: str
+) -> dict[str, dict[str, Any]]:
+    """All-time, today and trailing-window sums in a single round-trip."""
+    pipeline = [
+        {
+            "$facet": {
+                "all_time": [{"$match": {"day": {"$exists": True}}}, {"$group": _totals_group()}],
+                "today": [{"$match": {"day": today}}, {"$group": _totals_group()}],
+                "window": [
+                    {"$match": {"day": {"$gte": window_start}}},
+                    {"$group": _totals_group()},
+                ],
+            }
+        }
+    ]
+    result = await rollups_coll.aggregate(pipeline).to_list(length=1)
+    facets = result[0] if result else {}
+    return {name: (facets.get(name) or [{}])[0] for name in ("all_time", "today", "window")}
+
+
+async def daily_series(rollups_coll: AsyncIOMotorCollection, start_day: str) -> list[dict]:
+    """Per-day sums (across languages and channels) from ``start_day`` onwards."""
+    pipeline = [
+        {"$match": {"day": {"$gte": start_day}}},
+        {
+            "$group": {
+                "_id": "$day",
+                "questions": {"$sum": "$questions"},
+                "fallbacks": {"$sum": "$fallbacks"},
+                "confidenceSum": {"$sum": "$confidenceSum"},
+                "confidenceCount": {"$sum": "$confidenceCount"},
+            }
+        },
+        {"$sort": {"_id": 1}},
+    ]
+    return await rollups_coll.aggregate(pipeline).to_list(length=None)
+
+
+def days_ago(today: date, days: int) -> str:
+    return day_key(today - timedelta(days=days))
+
+
+__all__ = [
+    "LATENCY_BUCKETS_MS",
+    "day_key",
+    "latency_bucket",
+    "record_turn",
+    "settled_before",
+    "rollup_pipeline",
+    "rebuild_rollups",
+    "backfill_if_needed",
+    "dashboard_totals",
+    "daily_series",
+    "days_ago",
+]
@@ -0,0 +1,82 @@
+"""Materialized FAQ lists (Mongo), one document per language.
+
+Each document holds the last generated FAQ list plus a short refresh lease so that only one
+API process at a time runs the expensive regeneration (aggregation, grouping, LLM calls).
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo.errors import DuplicateKeyError
+
+SNAPSHOT_PROJECTION = {"faqs": 1, "generatedAt": 1}
+
+
+async def load_snapshot(coll: AsyncIOMotorCollection, language: str) -> dict[str, Any] | None:
+    """Return ``{"faqs": [...], "generatedAt": datetime}`` or None if never materialized."""
+    doc = await coll.find_one({"_id": language}, SNAPSHOT_PROJECTION)
+    if not doc or "generatedAt" not in doc:
+        return None
+    return doc
+
+
+async def save_snapshot(
+    coll: AsyncIOMotorCollection,
+    language: str,
+    faqs: list[dict[str, Any]],
+    *,
+    generated_at: datetime,
+) -> None:
+    await coll.update_one(
+        {"_id": language},
+        {"$set": {"faqs": faqs, "generatedAt": generated_at}},
+        upsert=True,
+    )
+
+
+async def acquire_refresh_lease(
+    coll: AsyncIOMotorCollection,
+    language: str,
+    *,
+    owner: str,
+    now: datetime,
+    lease_seconds: int,
+) -> bool:
+    """Claim the regeneration lease for ``language``; False if another owner holds it."""
+    try:
+        await coll.update_one(
+            {
+                "_id": language,
+                "$or": [{"leaseUntil": None}, {"leaseUntil": {"$lte": now}}],
+            },
+            {
+                "$set": {
+                    "leaseOwner": owner,
+                    "leaseUntil": now + timedelta(seconds=lease_seconds),
+                }
+            },
+            upsert=True,
+        )
+    except DuplicateKeyError:
+        # The document exists but its lease is still live: the upsert tried to insert a copy.
+        return False
+    return True
+
+
+async def release_refresh_lease(coll: AsyncIOMotorCollection, language: str, *, owner: str) -> None:
+    await coll.update_one(
+        {"_id": language, "leaseOwner": owner},
+        {"$unset": {"leaseOwner": "", "leaseUntil": ""}},
+    )
+
+
+__all__ = [
+    "SNAPSHOT_PROJECTION",
+    "load_snapshot",
+    "save_snapshot",
+    "acquire_refresh_lease",
+    "release_refresh_lease",
+]
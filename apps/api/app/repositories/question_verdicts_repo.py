@@ -0,0 +1,70 @@
+"""Memoized LLM verdicts for FAQ candidate questions (Mongo).
+
+A verdict holds the refined question text and the guardrail outcome for one normalized
+question. Its ``_id`` embeds a version derived from the model and prompts, so changing either
+simply stops matching old verdicts instead of serving them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime
+from typing import Any, Iterable
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import UpdateOne
+
+
+def normalize_question(question: str) -> str:
+    return " ".join(question.casefold().split())
+
+
+def compute_verdict_version(*parts: str) -> str:
+    """Short fingerprint of everything that influences a verdict (model name, prompts)."""
+    digest = hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+    return digest[:12]
+
+
+def verdict_key(version: str, language: str, question: str) -> str:
+    digest = hashlib.sha256(normalize_question(question).encode("utf-8")).hexdigest()
+    return f"{version}:{language}:{digest}"
+
+
+async def find_verdicts(
+    coll: AsyncIOMotorCollection, keys: Iterable[str]
+) -> dict[str, dict[str, Any]]:
+    keys = list(keys)
+    if not keys:
+        return {}
+    cursor = coll.find({"_id": {"$in": keys}}, {"refined": 1, "allowed": 1, "reason": 1})
+    return {doc["_id"]: doc async for doc in cursor}
+
+
+async def save_verdicts(coll: AsyncIOMotorCollection, verdicts: list[dict[str, Any]]) -> None:
+    """Upsert verdicts given as dicts with ``_id``, ``question``, ``refined``, ``allowed``."""
+    if not verdicts:
+        return
+    now = datetime.utcnow()
+    await coll.bulk_write(
+        [
+            UpdateOne(
+                {"_id": verdict["_id"]},
+                {
+                    "$set": {k: v for k, v in verdict.items() if k != "_id"} | {"updatedAt": now},
+                    "$setOnInsert": {"createdAt": now},
+                },
+                upsert=True,
+            )
+            for verdict in verdicts
+        ],
+        ordered=False,
+    )
+
+
+__all__ = [
+    "normalize_question",
+    "compute_verdict_version",
+    "verdict_key",
+    "find_verdicts",
+    "save_verdicts",
+]
@@ -40,7 +40,8 @@ class TrendsResponse(BaseModel):
 class UnansweredQuestion(BaseModel):
     """Unanswered question item."""
 
-    id: int
+    id: str
+    chat_id: str | None = Field(default=None, alias="chatId")
     question: str
     reason: str
     channel: str | None = None
@@ -55,6 +56,7 @@ class UnansweredQuestionsResponse(BaseModel):
 
     items: list[UnansweredQuestion]
     total: int
+    next_cursor: str | None = Field(default=None, alias="nextCursor")
 
     model_config = ConfigDict(populate_by_name=True)
 
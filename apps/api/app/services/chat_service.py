@@ -12,7 +12,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from ..constants.chat import FEEDBACK_MESSAGES
 from ..core.config import settings
 from ..core.input_validation import UnsafeInputError, ensure_safe_text
-from ..core.mongo import get_chat_messages_collection, get_chat_sessions_collection
+from ..core.mongo import (
+    get_chat_messages_collection,
+    get_chat_rollups_collection,
+    get_chat_sessions_collection,
+)
 from ..models.chat import Channel, ChatRole, ChatSession
 from ..rag.guardrail import REFUSAL_MESSAGES
 from ..rag.language import detect_language
@@ -20,9 +24,11 @@ from ..rag.orchestrator import RAGOrchestrator
 from ..repositories.chat_messages_repo import (
     find_history,
     find_message,
+    find_recent_turns,
     insert_messages,
     update_message,
 )
+from ..repositories.chat_rollups_repo import record_turn
 from ..repositories.chat_sessions_repo import add_session, get_session, update_session_timestamp
 from ..schemas.chat import (
     ChatConfidenceResponse,
@@ -45,7 +51,7 @@ from ..utils.chat_response_utils import (
     persistable_sources,
     safe_int,
 )
-from .faq_service import FAQService
+from .faq_materializer import get_faq_materializer
 
 logger = logging.getLogger(__name__)
 
@@ -63,14 +69,7 @@ class ChatService:
         self.orchestrator = orchestrator
         self.sessions_coll = get_chat_sessions_collection()
         self.messages_coll = get_chat_messages_collection()
-
-        # Initialize FAQ Service with semantic grouping and question refinement
-        self.faq_service = FAQService(
-            self.messages_coll,
-            use_semantic_grouping=True,  # Enable semantic similarity
-            similarity_threshold=0.85,  # 85% similarity threshold
-            refine_questions=True,  # Enable LLM-based question refinement
-        )
+        self.rollups_coll = get_chat_rollups_collection()
 
     @staticmethod
     def _now() -> datetime:
@@ -184,8 +183,9 @@ class ChatService:
         try:
             t0 = time.perf_counter()
             # Use configurable history limit for context window management
-            history_response = await self.get_history(session.id, limit=settings.CHAT_HISTORY_LIMIT)
-            history = [{"role": msg.role, "text": msg.text} for msg in history_response.messages]
+            history = await find_recent_turns(
+                self.messages_coll, session.id, settings.CHAT_HISTORY_LIMIT
+            )
             # Enable citations only for STAFF/ADMIN channel
             include_citations = (
                 session.channel == Channel.CHATSTAFF or session.channel == Channel.MANAGEMENT
@@ -245,6 +245,8 @@ class ChatService:
             "_id": response_id,
             "sessionId": session.id,
             "role": ChatRole.ASSISTANT.value,
+            "questionId": question_id,
+            "question": payload.question,
             "text": answer,
             "confidence": float(confidence_raw) if confidence_raw is not None else None,
             "relevance": float(relevance_raw) if relevance_raw is not None else None,
@@ -261,6 +263,20 @@ class ChatService:
             logger.exception("Failed to persist chat data for session %s", session.id)
             raise ChatServiceError(500, "Failed to persist chat data.") from exc
 
+        try:
+            await record_turn(
+                self.rollups_coll,
+                created_at=message_time,
+                lang=query_log["lang"],
+                channel=query_log["channel"],
+                response_ms=query_log["responseMs"],
+                confidence=response_doc["confidence"],
+                fallback=fallback_triggered,
+            )
+        except Exception:
+            # Rollups are derived data; a missed increment is repaired by a rebuild.
+            logger.exception("Failed to update dashboard rollups for session %s", session.id)
+
         session.updated_at = message_time
 
         try:
@@ -396,10 +412,10 @@ class ChatService:
         limit: int = 6,
     ) -> FAQsResponse:
         """
-        Get FAQ suggestions from actual user queries (dynamic generation).
+        Get FAQ suggestions from actual user queries.
 
-        Uses semantic similarity grouping to merge similar questions and
-        returns the most frequently asked questions from the last 30 days.
+        Served from the FAQs materialized in the background (semantic grouping of the
+        most frequently asked questions from the last 30 days); never generated inline.
 
         Args:
             language: Language code ('vi' or 'en')
@@ -409,12 +425,9 @@ class ChatService:
             FAQsResponse with dynamically generated FAQ items
         """
         try:
-            # Get frequent questions from last 30 days
-            faqs = await self.faq_service.get_frequent_questions(
+            faqs = await get_faq_materializer().get_frequent_questions(
                 language=language,
                 limit=limit,
-                days=30,
-                min_frequency=3,
             )
 
             # Convert to response format
@@ -1,21 +1,25 @@
 import asyncio
-import io
+import base64
+import hashlib
+import json
 import logging
 import os
 import re
 from contextlib import asynccontextmanager
-from typing import Any
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, BinaryIO
 
 from fastapi import HTTPException, UploadFile, status
 from minio import Minio
 from minio.error import S3Error
-from sqlalchemy import select
+from sqlalchemy import or_, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..core.config import settings
 from ..core.database import AsyncSessionLocal
 from ..models.document import Document
 from ..rag.vector_store import delete_by_document_id
+from .ingestion_queue import enqueue_jobs, notify_worker
 
 minio_client = Minio(
     "minio:9000",
@@ -54,12 +58,37 @@ ALLOWED_EXTS = {
 }
 
 
-def upload_to_minio(content: bytes, filename: str) -> tuple[str, int, str]:
-    size = len(content)
-    max_bytes = int(settings.UPLOAD_MAX_MB) * 1024 * 1024
-    if size > max_bytes:
-        raise UploadTooLarge(f"uploaded file exceeds max size of {settings.UPLOAD_MAX_MB} MB")
+class _HashingReader:
+    """File-like wrapper that counts and hashes bytes as MinIO reads them."""
+
+    def __init__(self, raw: BinaryIO, max_bytes: int):
+        self._raw = raw
+        self._max_bytes = max_bytes
+        self._sha256 = hashlib.sha256()
+        self.size = 0
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self._raw.read(size)
+        self.size += len(chunk)
+        if self.size > self._max_bytes:
+            raise UploadTooLarge(f"uploaded file exceeds max size of {settings.UPLOAD_MAX_MB} MB")
+        self._sha256.update(chunk)
+        return chunk
+
+    @property
+    def sha256(self) -> str:
+        return self._sha256.hexdigest()
 
+
+def _stream_size(stream: BinaryIO) -> int:
+    stream.seek(0, os.SEEK_END)
+    size = stream.tell()
+    stream.seek(0)
+    return size
+
+
+def _split_upload_name(filename: str | None) -> tuple[str, str, str]:
+    """Return (base_name, ext, format) for an upload, rejecting disallowed types."""
     orig_name = os.path.basename(filename or "upload.bin")
     base_name, ext = os.path.splitext(orig_name)
     ext = ext.lower()
@@ -67,59 +96,152 @@ def upload_to_minio(content: bytes, filename: str) -> tuple[str, int, str]:
     if ext not in ALLOWED_EXTS:
         raise InvalidFileType(f"file type '{ext}' is not allowed")
 
-    fmt = ext.lstrip(".")
+    return base_name, ext, ext.lstrip(".")
 
-    object_name = f"{FOLDER}{base_name}{ext}"
-    try:
+
+def reserve_object_names(filenames: list[str | None]) -> list[str]:
+    """
+    Pick a free object name for each upload with one MinIO listing per distinct base name.
+
+    Each listing only covers "<name>*", so its cost does not grow with the folder.
+    Names follow the "<name> (n).<ext>" scheme and are unique within the batch too.
+    """
+    parts = [_split_upload_name(filename) for filename in filenames]
+    if not parts:
+        return []
+
+    taken = {
+        obj.object_name
+        for base_name in {base_name for base_name, _, _ in parts}
+        for obj in minio_client.list_objects(BUCKET_NAME, prefix=FOLDER + base_name, recursive=True)
+    }
+
+    object_names = []
+    for base_name, ext, _ in parts:
+        object_name = f"{FOLDER}{base_name}{ext}"
         index = 1
-        while minio_client.stat_object(BUCKET_NAME, object_name):
+        while object_name in taken:
             object_name = f"{FOLDER}{base_name} ({index}){ext}"
             index += 1
-    except S3Error as e:
-        if e.code != "NoSuchKey":
-            raise e
+        taken.add(object_name)
+        object_names.append(object_name)
+    return object_names
+
+
+def upload_to_minio(
+    stream: BinaryIO,
+    filename: str,
+    size: int | None = None,
+    object_name: str | None = None,
+) -> tuple[str, int, str, str]:
+    """
+    Stream a file object to MinIO without buffering it in memory.
+
+    The object is sent as a multipart upload in ``UPLOAD_PART_SIZE_MB`` parts, so memory
+    use is bounded by one part. Size and SHA-256 are computed while streaming.
+
+    Args:
+        stream: Readable binary file object positioned at the start
+        filename: Original file name (validated against ALLOWED_EXTS)
+        size: Byte length when known; enables the up-front size check
+        object_name: Name from reserve_object_names; resolved here when omitted
+
+    Returns:
+        (object_name, size, format, sha256)
+    """
+    max_bytes = int(settings.UPLOAD_MAX_MB) * 1024 * 1024
+    if size is not None and size > max_bytes:
+        raise UploadTooLarge(f"uploaded file exceeds max size of {settings.UPLOAD_MAX_MB} MB")
+
+    orig_name = os.path.basename(filename or "upload.bin")
+    _, _, fmt = _split_upload_name(orig_name)
+    if object_name is None:
+        object_name = reserve_object_names([orig_name])[0]
 
     logger.info("upload start: %s to MinIO (Object Name: %s)", orig_name, object_name)
 
+    reader = _HashingReader(stream, max_bytes)
     try:
         minio_client.put_object(
             BUCKET_NAME,
             object_name,
-            data=io.BytesIO(content),
-            length=size,
+            data=reader,
+            length=size if size is not None else -1,
             content_type="application/octet-stream",
+            part_size=int(settings.UPLOAD_PART_SIZE_MB) * 1024 * 1024,
         )
-        uploaded_size = size
-        logger.info("upload complete: %d bytes", uploaded_size)
-        return object_name, uploaded_size, fmt
+        logger.info("upload complete: %d bytes (sha256 %s)", reader.size, reader.sha256)
+        return object_name, reader.size, fmt, reader.sha256
     except S3Error as exc:
         raise exc
 
 
-async def generate_unique_title(db: AsyncSession, original_title: str) -> str:
+async def iter_object_chunks(
+    object_name: str, offset: int = 0, length: int = 0, chunk_size: int = 256 * 1024
+) -> AsyncIterator[bytes]:
+    """
+    Yield an object's bytes (or the ``offset``/``length`` slice) as it arrives from MinIO.
+
+    Blocking reads run in a worker thread, so neither the event loop nor memory is held
+    by the whole object; the MinIO connection is released when iteration stops.
+    """
+    response = await asyncio.to_thread(
+        minio_client.get_object, BUCKET_NAME, object_name, offset=offset, length=length
+    )
+    try:
+        while True:
+            chunk = await asyncio.to_thread(response.read, chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        response.close()
+        response.release_conn()
+
+
+def presigned_download_url(object_name: str, content_disposition: str) -> str:
+    return minio_client.presigned_get_object(
+        BUCKET_NAME,
+        object_name,
+        expires=timedelta(seconds=int(settings.DOWNLOAD_PRESIGNED_EXPIRY_SECONDS)),
+        response_headers={"response-content-disposition": content_disposition},
+    )
 
-    base, ext = os.path.splitext(original_title)
 
-    stmt = select(Document).where(Document.title == original_title)
-    result = await db.execute(stmt)
-    if result.scalar_one_or_none() is None:
-        return original_title
+async def generate_unique_titles(db: AsyncSession, titles: list[str]) -> list[str]:
+    """
+    Make each title unique with one query, numbering clashes as "<name> (n).<ext>".
 
-    like_pattern = f"{base}%{ext}"
-    stmt = select(Document.title).where(Document.title.like(like_pattern))
+    Titles in the same batch are also kept distinct from each other.
+    """
+    split_titles = [os.path.splitext(title) for title in titles]
+    if not split_titles:
+        return []
+
+    like_patterns = {f"{base}%{ext}" for base, ext in split_titles}
+    stmt = select(Document.title).where(or_(*(Document.title.like(p) for p in like_patterns)))
     result = await db.execute(stmt)
-    similar_titles = [row[0] for row in result.fetchall()]
+    taken = {row[0] for row in result.fetchall()}
 
-    max_num = 0
-    pattern = re.compile(r"^" + re.escape(base) + r" \((\d+)\)" + re.escape(ext) + r"$")
-    for sim_title in similar_titles:
-        match = pattern.match(sim_title)
-        if match:
-            num = int(match.group(1))
-            if num > max_num:
-                max_num = num
+    unique_titles = []
+    for title, (base, ext) in zip(titles, split_titles):
+        if title not in taken:
+            candidate = title
+        else:
+            pattern = re.compile(r"^" + re.escape(base) + r" \((\d+)\)" + re.escape(ext) + r"$")
+            max_num = 0
+            for sim_title in taken:
+                match = pattern.match(sim_title)
+                if match:
+                    max_num = max(max_num, int(match.group(1)))
+            candidate = f"{base} ({max_num + 1}){ext}"
+        taken.add(candidate)
+        unique_titles.append(candidate)
+    return unique_titles
 
-    return f"{base} ({max_num + 1}){ext}"
+
+async def generate_unique_title(db: AsyncSession, original_title: str) -> str:
+    return (await generate_unique_titles(db, [original_title]))[0]
 
 
 async def create_document_record(
@@ -146,10 +268,40 @@ async def create_document_record(
     )
     db.add(doc)
     await db.flush()
+    enqueue_jobs(db, [doc.id])
 
     return doc.id
 
 
+async def create_document_records(db: AsyncSession, records: list[dict[str, Any]]) -> list[int]:
+    """
+    Insert many REQUEST documents (and their ingestion jobs) with one bulk INSERT each.
+
+    Each record takes the keyword arguments of ``create_document_record``.
+    """
+    titles = await generate_unique_titles(db, [record["title"] for record in records])
+    docs = [
+        Document(
+            title=title,
+            language="vi",
+            status="REQUEST",
+            version_no=1,
+            file_path=record.get("file_path") or "",
+            file_size=record.get("file_size"),
+            format=record.get("format") or "bin",
+            creator_id=record.get("creator_id"),
+            department_id=record.get("department_id"),
+        )
+        for title, record in zip(titles, records)
+    ]
+    db.add_all(docs)
+    await db.flush()
+    doc_ids = [doc.id for doc in docs]
+    enqueue_jobs(db, doc_ids)
+
+    return doc_ids
+
+
 @asynccontextmanager
 async def async_session_scope():
     async with AsyncSessionLocal() as session:
@@ -165,11 +317,8 @@ async def enqueue_single_document(
     file: UploadFile, creator_id: int | None = None, department_id: int | None = None
 ) -> dict:
     orig_name = file.filename or "upload.bin"
-    _, ext = os.path.splitext(orig_name)
 
-    file.file.seek(0, 2)
-    size = file.file.tell()
-    file.file.seek(0)
+    size = _stream_size(file.file)
 
     max_bytes = int(settings.UPLOAD_MAX_MB) * 1024 * 1024
     if size > max_bytes:
@@ -178,21 +327,14 @@ async def enqueue_single_document(
             detail=f"File size exceeds maximum allowed size of {settings.UPLOAD_MAX_MB} MB",
         )
 
-    chunk_size = 8 * 1024 * 1024
-    content = bytearray()
-    while True:
-        chunk = await file.read(chunk_size)
-        if not chunk:
-            break
-        content.extend(chunk)
-
-    content = bytes(content)
-
     object_name = None
     doc_id = None
 
     try:
-        object_name, size, fmt = await asyncio.to_thread(upload_to_minio, content, orig_name)
+        # The spooled upload file is streamed straight to MinIO
+        object_name, size, fmt, sha256 = await asyncio.to_thread(
+            upload_to_minio, file.file, orig_name, size
+        )
         logger.info("Uploaded file to MinIO with object name: %s", object_name)
 
         async with async_session_scope() as db:
@@ -206,8 +348,9 @@ async def enqueue_single_document(
                 department_id=department_id,
             )
         logger.info("Created document record in database with ID: %s", doc_id)
+        notify_worker()
 
-        return {"document_id": doc_id, "object_name": object_name}
+        return {"document_id": doc_id, "object_name": object_name, "sha256": sha256}
 
     except Exception as exc:
         logger.exception("Failed to process document %s: %s", orig_name, exc)
@@ -237,20 +380,100 @@ async def enqueue_single_document(
         )
 
 
+async def _remove_objects(object_names: list[str]) -> None:
+    for object_name in object_names:
+        try:
+            await asyncio.to_thread(minio_client.remove_object, BUCKET_NAME, object_name)
+            logger.info("Cleaned up MinIO file: %s", object_name)
+        except Exception as cleanup_exc:
+            logger.error("Failed to delete MinIO file %s: %s", object_name, cleanup_exc)
+
+
 async def enqueue_multiple_documents(
     files: list[UploadFile], creator_id: int | None = None, department_id: int | None = None
 ) -> list[dict]:
-    results = []
-    errors = []
-    for file in files:
+    """
+    Upload a batch of files concurrently and register them in one transaction.
+
+    Each file succeeds or fails on its own. Returns one result per file in request order:
+    ``{"document_id", "object_name", "sha256"}`` for an accepted file, or
+    ``{"filename", "error"}`` for one that failed validation or its MinIO put. Raises a 400
+    with the errors when no file was accepted, and a 500 (after removing the uploaded
+    objects) if the accepted files cannot be recorded.
+    """
+    max_bytes = int(settings.UPLOAD_MAX_MB) * 1024 * 1024
+    results: list[dict] = [{} for _ in files]
+    prepared = []
+    for index, file in enumerate(files):
+        orig_name = file.filename or "upload.bin"
+        size = _stream_size(file.file)
+        if size > max_bytes:
+            results[index] = {
+                "filename": file.filename,
+                "error": f"File size exceeds maximum allowed size of {settings.UPLOAD_MAX_MB} MB",
+            }
+            continue
         try:
-            r = await enqueue_single_document(file, creator_id, department_id)
-            results.append(r)
-        except Exception as exc:
-            logger.error(f"Failed to process file {file.filename}: {str(exc)}")
-            errors.append({"filename": file.filename, "error": str(exc)})
-    if errors:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail={"errors": errors})
+            _split_upload_name(orig_name)
+        except InvalidFileType as exc:
+            results[index] = {"filename": file.filename, "error": str(exc)}
+            continue
+        prepared.append((index, file, orig_name, size))
+
+    object_names = await asyncio.to_thread(
+        reserve_object_names, [orig_name for _, _, orig_name, _ in prepared]
+    )
+    semaphore = asyncio.Semaphore(max(1, int(settings.UPLOAD_CONCURRENCY)))
+
+    async def _upload(file: UploadFile, orig_name: str, size: int, object_name: str):
+        async with semaphore:
+            return await asyncio.to_thread(upload_to_minio, file.file, orig_name, size, object_name)
+
+    outcomes = await asyncio.gather(
+        *(
+            _upload(file, orig_name, size, object_name)
+            for (_, file, orig_name, size), object_name in zip(prepared, object_names)
+        ),
+        return_exceptions=True,
+    )
+
+    uploaded = []
+    for (index, file, orig_name, _), outcome in zip(prepared, outcomes):
+        if isinstance(outcome, Exception):
+            logger.error(f"Failed to process file {file.filename}: {str(outcome)}")
+            results[index] = {"filename": file.filename, "error": str(outcome)}
+        else:
+            uploaded.append((index, orig_name, outcome))
+    if not uploaded:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail={"errors": results})
+
+    try:
+        async with async_session_scope() as db:
+            doc_ids = await create_document_records(
+                db,
+                [
+                    {
+                        "title": orig_name,
+                        "file_path": object_name,
+                        "file_size": size,
+                        "format": fmt,
+                        "creator_id": creator_id,
+                        "department_id": department_id,
+                    }
+                    for _, orig_name, (object_name, size, fmt, _) in uploaded
+                ],
+            )
+    except Exception as exc:
+        logger.exception("Failed to create document records for batch upload: %s", exc)
+        await _remove_objects([object_name for _, _, (object_name, *_) in uploaded])
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to process documents."
+        )
+
+    logger.info("Created %d document records in one batch", len(doc_ids))
+    notify_worker()
+    for (index, _, (object_name, _, _, sha256)), doc_id in zip(uploaded, doc_ids):
+        results[index] = {"document_id": doc_id, "object_name": object_name, "sha256": sha256}
     return results
 
 
@@ -260,31 +483,85 @@ async def create_metadata_document(data: dict[str, Any], db: AsyncSession) -> di
     data["status"] = "REQUEST"
     doc = Document(**data)
     db.add(doc)
+    await db.flush()
+    enqueue_jobs(db, [doc.id])
     await db.commit()
     await db.refresh(doc)
+    notify_worker()
     return {"id": doc.id, "title": doc.title}
 
 
-async def list_documents(db: AsyncSession) -> list[dict[str, Any]]:
-    stmt = select(Document).order_by(Document.created_at.desc())
+# Columns the document table renders; list queries never load file_path, creator, etc.
+DOCUMENT_LIST_COLUMNS = (
+    Document.id,
+    Document.title,
+    Document.category,
+    Document.tags,
+    Document.language,
+    Document.status,
+    Document.version_no,
+    Document.created_at,
+    Document.file_size,
+    Document.format,
+)
+DEFAULT_PAGE_SIZE = 50
+
+
+def _document_list_item(row: Any) -> dict[str, Any]:
+    return {
+        "id": row.id,
+        "title": row.title,
+        "category": row.category,
+        "tags": row.tags,
+        "language": row.language,
+        "status": row.status,
+        "version_no": row.version_no,
+        "created_at": row.created_at.isoformat() if row.created_at else None,
+        "current_file_size": row.file_size,
+        "current_format": row.format,
+    }
+
+
+def encode_document_cursor(item: dict[str, Any]) -> str:
+    """Opaque token pointing just past ``item`` in (created_at, id) descending order."""
+    payload = json.dumps({"t": item["created_at"], "id": item["id"]})
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_document_cursor(token: str) -> tuple[datetime, int]:
+    """Inverse of ``encode_document_cursor``; raises ValueError for malformed tokens."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+        return datetime.fromisoformat(payload["t"]), int(payload["id"])
+    except Exception as exc:
+        raise ValueError("Invalid pagination cursor") from exc
+
+
+async def _list_page(
+    db: AsyncSession,
+    *criteria: Any,
+    limit: int,
+    after: tuple[datetime, int] | None,
+) -> tuple[list[dict[str, Any]], str | None]:
+    """One keyset page of list items, newest first, plus the cursor of the next page."""
+    stmt = select(*DOCUMENT_LIST_COLUMNS).where(*criteria)
+    if after is not None:
+        # Row comparison walks ix_documents_created_at_id backwards from the cursor
+        stmt = stmt.where(tuple_(Document.created_at, Document.id) < tuple_(*after))
+    stmt = stmt.order_by(Document.created_at.desc(), Document.id.desc()).limit(limit)
+
     result = await db.execute(stmt)
-    rows = result.scalars().all()
+    items = [_document_list_item(row) for row in result.all()]
+    next_cursor = encode_document_cursor(items[-1]) if len(items) == limit else None
+    return items, next_cursor
 
-    return [
-        {
-            "id": d.id,
-            "title": d.title,
-            "category": d.category,
-            "tags": d.tags,
-            "language": d.language,
-            "status": d.status,
-            "version_no": d.version_no,
-            "created_at": d.created_at.isoformat() if d.created_at else None,
-            "current_file_size": d.file_size,
-            "current_format": d.format,
-        }
-        for d in rows
-    ]
+
+async def list_documents(
+    db: AsyncSession,
+    limit: int = DEFAULT_PAGE_SIZE,
+    after: tuple[datetime, int] | None = None,
+) -> tuple[list[dict[str, Any]], str | None]:
+    return await _list_page(db, limit=limit, after=after)
 
 
 async def get_document(doc_id: int, db: AsyncSession):
@@ -343,12 +620,10 @@ async def update_document(
 
     try:
         if file:
-            content = await file.read()
             orig_name = file.filename or title or old_doc.title
-            _, ext = os.path.splitext(orig_name)
 
-            new_object_name, size, fmt = await asyncio.to_thread(
-                upload_to_minio, content, orig_name
+            new_object_name, size, fmt, _ = await asyncio.to_thread(
+                upload_to_minio, file.file, orig_name, _stream_size(file.file)
             )
             logger.info("Uploaded new file to MinIO with object name: %s", new_object_name)
 
@@ -377,9 +652,12 @@ async def update_document(
                 department_id=department_id if department_id is not None else old_doc.department_id,
             )
             db.add(new_doc)
+            await db.flush()
+            enqueue_jobs(db, [new_doc.id])
             await db.commit()
             await db.refresh(new_doc)
             new_doc_id = new_doc.id
+            notify_worker()
             logger.info(
                 "Created new document ID %s with version %s", new_doc_id, new_doc.version_no
             )
@@ -491,31 +769,26 @@ async def delete_document(doc_id: int, db: AsyncSession) -> bool:
         )
 
 
-async def search_documents_by_name(name: str, db: AsyncSession) -> list[dict[str, Any]]:
+def _contains_pattern(text: str) -> str:
+    """ILIKE pattern matching ``text`` literally anywhere in the value."""
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+async def search_documents_by_name(
+    name: str,
+    db: AsyncSession,
+    limit: int = DEFAULT_PAGE_SIZE,
+    after: tuple[datetime, int] | None = None,
+) -> tuple[list[dict[str, Any]], str | None]:
     try:
-        stmt = (
-            select(Document)
-            .where(Document.title.ilike(f"%{name}%"))
-            .order_by(Document.created_at.desc())
+        # Served by the ix_documents_title_trgm GIN index once the term has 3+ characters
+        return await _list_page(
+            db,
+            Document.title.ilike(_contains_pattern(name.strip()), escape="\\"),
+            limit=limit,
+            after=after,
         )
-        result = await db.execute(stmt)
-        rows = result.scalars().all()
-
-        return [
-            {
-                "id": d.id,
-                "title": d.title,
-                "category": d.category,
-                "tags": d.tags,
-                "language": d.language,
-                "status": d.status,
-                "version_no": d.version_no,
-                "created_at": d.created_at.isoformat() if d.created_at else None,
-                "current_file_size": d.file_size,
-                "current_format": d.format,
-            }
-            for d in rows
-        ]
     except Exception as exc:
         logger.exception("Error occurred while searching documents by name: %s", exc)
         raise HTTPException(
@@ -536,28 +809,12 @@ async def filter_documents_by_format(
 
         # Build query with IN clause for multiple formats
         stmt = (
-            select(Document)
+            select(*DOCUMENT_LIST_COLUMNS)
             .where(Document.format.in_(format_list))
-            .order_by(Document.created_at.desc())
+            .order_by(Document.created_at.desc(), Document.id.desc())
         )
         result = await db.execute(stmt)
-        rows = result.scalars().all()
-
-        return [
-            {
-                "id": d.id,
-                "title": d.title,
-                "category": d.category,
-                "tags": d.tags,
-                "language": d.language,
-                "status": d.status,
-                "version_no": d.version_no,
-                "created_at": d.created_at.isoformat() if d.created_at else None,
-                "current_file_size": d.file_size,
-                "current_format": d.format,
-            }
-            for d in rows
-        ]
+        return [_document_list_item(row) for row in result.all()]
     except Exception as exc:
         logger.exception("Error occurred while filtering documents by format: %s", exc)
         raise HTTPException(
@@ -0,0 +1,189 @@
+"""Background materialization of frequent-question FAQs.
+
+Requests never run FAQ generation: they read the per-language snapshot written by
+``FAQMaterializer.run_forever``. A stale or missing snapshot only schedules a refresh, which is
+single-flight within the process (one task per language) and across processes (Mongo lease).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import socket
+from datetime import datetime, timedelta
+from typing import Any, List, Optional
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+
+from ..core.cache import get_cache_service
+from ..core.config import settings
+from ..core.mongo import (
+    get_chat_messages_collection,
+    get_faq_snapshots_collection,
+    get_question_verdicts_collection,
+)
+from ..repositories.faq_snapshots_repo import (
+    acquire_refresh_lease,
+    load_snapshot,
+    release_refresh_lease,
+    save_snapshot,
+)
+from .faq_service import FAQService
+
+logger = logging.getLogger(__name__)
+
+# Generation makes one LLM round-trip per FAQ; a crashed worker's lease expires after this.
+LEASE_SECONDS = 600
+# Requests read the snapshot through Redis; a new snapshot deletes the key
+SNAPSHOT_CACHE_TTL = 60
+
+
+def snapshot_cache_key(language: str) -> str:
+    return f"faq:frequent:{language}"
+
+
+class FAQMaterializer:
+    """Periodically regenerates FAQs per language and serves them from Mongo."""
+
+    def __init__(
+        self,
+        faq_service: FAQService,
+        snapshots_collection: AsyncIOMotorCollection,
+        languages: List[str],
+        limit: int = 20,
+        refresh_seconds: int = 900,
+        days: int = 30,
+        min_frequency: int = 3,
+    ):
+        self.faq_service = faq_service
+        self.snapshots_coll = snapshots_collection
+        self.languages = languages
+        self.limit = limit
+        self.refresh_seconds = refresh_seconds
+        self.days = days
+        self.min_frequency = min_frequency
+
+        self._owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    def _is_fresh(self, snapshot: Optional[dict[str, Any]], now: datetime) -> bool:
+        if snapshot is None:
+            return False
+        return now - snapshot["generatedAt"] < timedelta(seconds=self.refresh_seconds)
+
+    async def get_frequent_questions(
+        self, language: str = "vi", limit: int = 10
+    ) -> List[dict[str, Any]]:
+        """Return up to ``limit`` materialized FAQs; never generates inline."""
+        faqs = await get_cache_service().get_or_compute(
+            snapshot_cache_key(language),
+            lambda: self._load_faqs(language),
+            ttl=SNAPSHOT_CACHE_TTL,
+        )
+        return faqs[:limit]
+
+    async def get_trending_questions(
+        self, language: str = "vi", limit: int = 5, hours: int = 24
+    ) -> List[dict[str, Any]]:
+        """Recent trending questions; computed on request (briefly cached), not materialized."""
+        return await self.faq_service.get_trending_questions(
+            language=language, limit=limit, hours=hours
+        )
+
+    async def _load_faqs(self, language: str) -> List[dict[str, Any]]:
+        snapshot = await load_snapshot(self.snapshots_coll, language)
+        if not self._is_fresh(snapshot, datetime.utcnow()):
+            self.schedule_refresh(language)
+        if snapshot is None:
+            return []
+        return snapshot["faqs"]
+
+    def schedule_refresh(self, language: str) -> asyncio.Task:
+        """Start a refresh for ``language`` unless one is already running in this process."""
+        task = self._inflight.get(language)
+        if task is None or task.done():
+            task = asyncio.create_task(self._refresh(language))
+            self._inflight[language] = task
+        return task
+
+    async def _refresh(self, language: str) -> bool:
+        now = datetime.utcnow()
+        acquired = await acquire_refresh_lease(
+            self.snapshots_coll,
+            language,
+            owner=self._owner,
+            now=now,
+            lease_seconds=LEASE_SECONDS,
+        )
+        if not acquired:
+            logger.debug(f"FAQ refresh for '{language}' already running elsewhere")
+            return False
+
+        try:
+            # Another process may have finished a refresh while we waited for the lease
+            snapshot = await load_snapshot(self.snapshots_coll, language)
+            if self._is_fresh(snapshot, now):
+                return False
+
+            faqs = await self.faq_service.build_frequent_questions(
+                language=language,
+                limit=self.limit,
+                days=self.days,
+                min_frequency=self.min_frequency,
+            )
+            await save_snapshot(self.snapshots_coll, language, faqs, generated_at=datetime.utcnow())
+            await get_cache_service().delete(snapshot_cache_key(language))
+            logger.info(f"Materialized {len(faqs)} FAQs for language '{language}'")
+            return True
+        except Exception:
+            # Keep serving the previous snapshot
+            logger.exception(f"FAQ materialization failed for language '{language}'")
+            return False
+        finally:
+            await release_refresh_lease(self.snapshots_coll, language, owner=self._owner)
+
+    async def run_forever(self) -> None:
+        logger.info(
+            "Starting FAQ materializer for %s with interval %s seconds",
+            ",".join(self.languages),
+            self.refresh_seconds,
+        )
+        try:
+            while True:
+                await asyncio.gather(
+                    *(self.schedule_refresh(language) for language in self.languages)
+                )
+                await asyncio.sleep(self.refresh_seconds)
+        except asyncio.CancelledError:
+            logger.info("FAQ materializer cancelled")
+            raise
+
+
+# Global materializer instance
+_faq_materializer: Optional[FAQMaterializer] = None
+
+
+def get_faq_materializer() -> FAQMaterializer:
+    """Get global FAQ materializer instance."""
+    global _faq_materializer
+    if _faq_materializer is None:
+        faq_service = FAQService(
+            get_chat_messages_collection(),
+            use_semantic_grouping=True,  # Enable semantic similarity
+            similarity_threshold=0.85,  # 85% similarity threshold
+            refine_questions=True,  # Enable LLM-based question refinement
+            verdicts_collection=get_question_verdicts_collection(),
+        )
+        languages = [lang.strip() for lang in settings.FAQ_LANGUAGES.split(",") if lang.strip()]
+        _faq_materializer = FAQMaterializer(
+            faq_service,
+            get_faq_snapshots_collection(),
+            languages=languages,
+            limit=settings.FAQ_MATERIALIZE_LIMIT,
+            refresh_seconds=settings.FAQ_REFRESH_SECONDS,
+        )
+    return _faq_materializer
+
+
+__all__ = ["FAQMaterializer", "get_faq_materializer"]
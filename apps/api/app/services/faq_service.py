@@ -10,13 +10,39 @@ from typing import Any, List, Optional
 from motor.motor_asyncio import AsyncIOMotorCollection
 
 from ..core.cache import get_cache_service
+from ..core.config import settings
 from ..rag.guardrail import GuardrailService
 from ..rag.language import detect_language
 from ..rag.llm import LLMWrapper
+from ..rag.prompts import get_guardrail_batch_prompt, get_guardrail_prompt
+from ..repositories.chat_analytics_repo import (
+    frequent_questions_pipeline,
+    trending_questions_pipeline,
+)
+from ..repositories.question_verdicts_repo import (
+    compute_verdict_version,
+    find_verdicts,
+    normalize_question,
+    save_verdicts,
+    verdict_key,
+)
 from .embedding_service import EmbeddingService
 
 logger = logging.getLogger(__name__)
 
+REFINE_PROMPT_TEMPLATE = """Bạn là trợ lý chuyên viết lại câu hỏi cho rõ ràng và hoàn chỉnh.
+
+Nhiệm vụ: Viết lại câu hỏi dưới đây thành một câu hỏi hoàn chỉnh, rõ ràng, tự nhiên về mặt ngữ nghĩa.
+- Giữ nguyên ý nghĩa ban đầu
+- Không thêm thông tin mới
+- Viết ngắn gọn, tự nhiên
+- Nếu câu hỏi đã rõ ràng, giữ nguyên
+- Trả về ĐÚNG ngôn ngữ của câu hỏi gốc (tiếng Việt hoặc tiếng Anh)
+
+Câu hỏi gốc: "{raw_question}"
+
+Câu hỏi đã hoàn thiện:"""
+
 
 class FAQService:
     """Service to generate FAQs from actual user queries."""
@@ -27,6 +53,7 @@ class FAQService:
         use_semantic_grouping: bool = True,
         similarity_threshold: float = 0.75,
         refine_questions: bool = True,
+        verdicts_collection: Optional[AsyncIOMotorCollection] = None,
     ):
         """
         Initialize FAQ Service.
@@ -36,11 +63,15 @@ class FAQService:
             use_semantic_grouping: Enable semantic similarity grouping
             similarity_threshold: Cosine similarity threshold (0-1)
             refine_questions: Use LLM to refine question text
+            verdicts_collection: Optional MongoDB collection memoizing refinement and
+                guardrail verdicts per distinct question
         """
         self.messages_coll = messages_collection
         self.use_semantic_grouping = use_semantic_grouping
         self.similarity_threshold = similarity_threshold
         self.refine_questions = refine_questions
+        self.verdicts_coll = verdicts_collection
+        self._verdict_version: Optional[str] = None
 
         # Lazy load services
         self._embedding_service: Optional[EmbeddingService] = None
@@ -56,9 +87,11 @@ class FAQService:
 
     @property
     def llm_wrapper(self) -> LLMWrapper:
-        """Lazy load LLM wrapper for question refinement."""
+        """Lazy load the LLM wrapper shared by question refinement and the guardrail."""
         if self._llm_wrapper is None:
-            self._llm_wrapper = LLMWrapper(temperature=0.3, max_tokens=100)
+            # Sized for a batch of guardrail verdicts; refinements stop well short of it and
+            # longer ones are rejected by _refine_question
+            self._llm_wrapper = LLMWrapper(temperature=0.3, max_tokens=1024)
         return self._llm_wrapper
 
     @property
@@ -86,37 +119,109 @@ class FAQService:
         if len(raw_question) < 5 or len(raw_question) > 150:
             return raw_question
 
-        try:
-            prompt = f"""Bạn là trợ lý chuyên viết lại câu hỏi cho rõ ràng và hoàn chỉnh.
+        # Errors propagate so that a failed refinement is not memoized as a verdict
+        prompt = REFINE_PROMPT_TEMPLATE.format(raw_question=raw_question)
+        refined = await self.llm_wrapper.generate_direct_answer_async(
+            question=prompt, target_language=language
+        )
+        refined = refined.strip().strip('"').strip("'").strip()
+
+        # Validate refinement
+        if len(refined) > 0 and len(refined) <= 200:
+            logger.debug(f"Refined question: '{raw_question}' -> '{refined}'")
+            return refined
+        else:
+            return raw_question
 
-Nhiệm vụ: Viết lại câu hỏi dưới đây thành một câu hỏi hoàn chỉnh, rõ ràng, tự nhiên về mặt ngữ nghĩa.
-- Giữ nguyên ý nghĩa ban đầu
-- Không thêm thông tin mới
-- Viết ngắn gọn, tự nhiên
-- Nếu câu hỏi đã rõ ràng, giữ nguyên
-- Trả về ĐÚNG ngôn ngữ của câu hỏi gốc (tiếng Việt hoặc tiếng Anh)
+    @property
+    def verdict_version(self) -> str:
+        """Fingerprint of the model and prompts that produce refinement/guardrail verdicts."""
+        if self._verdict_version is None:
+            self._verdict_version = compute_verdict_version(
+                settings.LLM_MODEL,
+                REFINE_PROMPT_TEMPLATE,
+                get_guardrail_prompt(),
+                get_guardrail_batch_prompt(),
+            )
+        return self._verdict_version
 
-Câu hỏi gốc: "{raw_question}"
+    async def _vet_questions(
+        self, questions: List[str], language: str
+    ) -> tuple[List[Any], List[bool]]:
+        """
+        Refine and guardrail-check questions, asking the LLM only for unseen ones.
 
-Câu hỏi đã hoàn thiện:"""
+        Args:
+            questions: Candidate FAQ questions
+            language: Question language (vi or en)
 
-            refined = await self.llm_wrapper.generate_direct_answer_async(
-                question=prompt, target_language=language
+        Returns:
+            Refined questions (or the exception raised while refining) and guardrail
+            verdicts, both aligned with ``questions``
+        """
+        keys = [verdict_key(self.verdict_version, language, q) for q in questions]
+        known: dict[str, dict[str, Any]] = {}
+        if self.verdicts_coll is not None:
+            try:
+                known = await find_verdicts(self.verdicts_coll, keys)
+            except Exception as e:
+                logger.warning(f"Loading memoized FAQ verdicts failed: {e}")
+
+        missing = [idx for idx, key in enumerate(keys) if key not in known]
+        if known:
+            logger.info(f"Reusing {len(known)} memoized FAQ verdicts ({len(missing)} new)")
+
+        # Refine all new questions in parallel for speed, while one batched
+        # guardrail call classifies them
+        refinements, safety_checks = await asyncio.gather(
+            asyncio.gather(
+                *(self._refine_question(questions[idx], language) for idx in missing),
+                return_exceptions=True,
+            ),
+            self.guardrail_service.check_safety_batch([questions[idx] for idx in missing]),
+        )
+
+        fresh: dict[str, tuple[Any, bool]] = {}
+        new_verdicts = []
+        for idx, refined, safety in zip(missing, refinements, safety_checks):
+            allowed = isinstance(safety, dict) and safety.get("status") == "allowed"
+            fresh[keys[idx]] = (refined, allowed)
+
+            # Transient failures (LLM errors, guardrail system_fail) are retried next run
+            failed = isinstance(refined, Exception) or not isinstance(safety, dict)
+            if failed or safety.get("reason") == "system_fail":
+                continue
+            new_verdicts.append(
+                {
+                    "_id": keys[idx],
+                    "version": self.verdict_version,
+                    "language": language,
+                    "question": normalize_question(questions[idx]),
+                    "refined": refined,
+                    "allowed": allowed,
+                    "reason": safety.get("reason"),
+                }
             )
-            refined = refined.strip().strip('"').strip("'").strip()
 
-            # Validate refinement
-            if len(refined) > 0 and len(refined) <= 200:
-                logger.debug(f"Refined question: '{raw_question}' -> '{refined}'")
-                return refined
+        if self.verdicts_coll is not None and new_verdicts:
+            try:
+                await save_verdicts(self.verdicts_coll, new_verdicts)
+            except Exception as e:
+                logger.warning(f"Saving FAQ verdicts failed: {e}")
+
+        refined_questions: List[Any] = []
+        guardrail_checks: List[bool] = []
+        for key in keys:
+            if key in known:
+                refined_questions.append(known[key]["refined"])
+                guardrail_checks.append(bool(known[key]["allowed"]))
             else:
-                return raw_question
-
-        except Exception as e:
-            logger.warning(f"Question refinement failed: {e}")
-            return raw_question
+                refined, allowed = fresh[key]
+                refined_questions.append(refined)
+                guardrail_checks.append(allowed)
+        return refined_questions, guardrail_checks
 
-    async def get_frequent_questions(
+    async def build_frequent_questions(
         self,
         language: str = "vi",
         limit: int = 10,
@@ -124,7 +229,10 @@ Câu hỏi đã hoàn thiện:"""
         min_frequency: int = 3,
     ) -> List[dict[str, Any]]:
         """
-        Get most frequently asked questions from chat history.
+        Generate the most frequently asked questions from chat history.
+
+        This runs the full aggregation, grouping and LLM refinement, so it is only called
+        by the FAQ materializer; requests read the materialized result.
 
         Args:
             language: Filter by language ('vi' or 'en')
@@ -135,129 +243,83 @@ Câu hỏi đã hoàn thiện:"""
         Returns:
             List of FAQ items with question, frequency, category
         """
-        try:
-            # Check cache first
-            cache_service = get_cache_service()
-            cache_key = f"faq:frequent:{language}:{limit}:{min_frequency}:{days}"
-            cached = await cache_service.get(cache_key)
-            if cached is not None:
-                logger.info(f"Cache HIT for frequent FAQs (language={language})")
-                return cached
-
-            logger.info(f"Cache MISS for frequent FAQs (language={language})")
-
-            # Calculate date threshold
-            since_date = datetime.utcnow() - timedelta(days=days)
-
-            # Aggregation pipeline to find frequent user questions
-            pipeline = [
-                # Match user messages only (not assistant)
-                {
-                    "$match": {
-                        "role": "user",
-                        "createdAt": {"$gte": since_date},
-                    }
-                },
-                # Group by normalized question and count
-                {
-                    "$group": {
-                        "_id": {"$toLower": {"$trim": {"input": "$text"}}},
-                        "count": {"$sum": 1},
-                        "originalText": {"$first": "$text"},
-                        "lastAsked": {"$max": "$createdAt"},
-                    }
-                },
-                # Filter by minimum frequency
-                {"$match": {"count": {"$gte": min_frequency}}},
-                # Sort by frequency (descending)
-                {"$sort": {"count": -1}},
-                # Limit results
-                {"$limit": limit * 2},  # Get more for filtering
-            ]
-
-            cursor = self.messages_coll.aggregate(pipeline)
-            results = await cursor.to_list(length=limit * 2)
-
-            # Apply semantic grouping if enabled
-            if self.use_semantic_grouping and len(results) > 1:
-                results = await self._group_similar_questions(results, language)
-
-            # Filter questions first
-            filtered_questions = []
-            for item in results:
-                question = item["originalText"].strip()
-
-                # Skip if too short or too long
-                is_acronym = len(question) <= 4 and question.isupper()
-                if (len(question) < 3 or len(question) > 200) and not is_acronym:
-                    continue
-                if len(question) < 3:
-                    continue
-
-                # Detect language
-                detected_lang = detect_language(question)
-                if detected_lang != language:
-                    continue
-
-                filtered_questions.append((question, item))
-                if len(filtered_questions) >= limit:
-                    break
-
-            # Refine all questions in parallel for speed
-            # Also check guardrails in parallel
-            if self.refine_questions and filtered_questions:
-                tasks = []
-                for q, _ in filtered_questions:
-                    tasks.append(self._refine_question(q, language))
-                    tasks.append(self.guardrail_service.is_question_appropriate(q))
-
-                results = await asyncio.gather(*tasks, return_exceptions=True)
-
-                # Separate refinement and guardrail results
-                refined_questions = results[::2]  # Even indices
-                guardrail_checks = results[1::2]  # Odd indices
+        # Calculate date threshold
+        since_date = datetime.utcnow() - timedelta(days=days)
+
+        # Aggregation pipeline to find frequent user questions
+        # (fetch limit * 2 groups to leave room for filtering)
+        pipeline = frequent_questions_pipeline(
+            since_date, min_frequency=min_frequency, limit=limit * 2
+        )
+
+        cursor = self.messages_coll.aggregate(pipeline)
+        results = await cursor.to_list(length=limit * 2)
+
+        # Apply semantic grouping if enabled
+        if self.use_semantic_grouping and len(results) > 1:
+            results = await self._group_similar_questions(results, language)
+
+        # Filter questions first
+        filtered_questions = []
+        for item in results:
+            question = item["originalText"].strip()
+
+            # Skip if too short or too long
+            is_acronym = len(question) <= 4 and question.isupper()
+            if (len(question) < 3 or len(question) > 200) and not is_acronym:
+                continue
+            if len(question) < 3:
+                continue
+
+            # Detect language
+            detected_lang = detect_language(question)
+            if detected_lang != language:
+                continue
+
+            filtered_questions.append((question, item))
+            if len(filtered_questions) >= limit:
+                break
+
+        # Refine and guardrail-check questions (memoized per distinct question)
+        if self.refine_questions and filtered_questions:
+            refined_questions, guardrail_checks = await self._vet_questions(
+                [q for q, _ in filtered_questions], language
+            )
+        else:
+            refined_questions = [q for q, _ in filtered_questions]
+            guardrail_checks = [True] * len(filtered_questions)
+
+        # Build final FAQ list (filter out blocked questions)
+        faqs = []
+        for idx, ((original_q, item), refined_q, is_appropriate) in enumerate(
+            zip(filtered_questions, refined_questions, guardrail_checks)
+        ):
+            # Skip if question is blocked by guardrail
+            if isinstance(is_appropriate, bool) and not is_appropriate:
+                logger.info(f"FAQ question blocked by guardrail: '{original_q}'")
+                continue
+
+            # Use refined question if successful, otherwise use original
+            if isinstance(refined_q, Exception):
+                logger.warning(f"Refinement failed for '{original_q}': {refined_q}")
+                final_question = original_q
             else:
-                refined_questions = [q for q, _ in filtered_questions]
-                guardrail_checks = [True] * len(filtered_questions)
-
-            # Build final FAQ list (filter out blocked questions)
-            faqs = []
-            for idx, ((original_q, item), refined_q, is_appropriate) in enumerate(
-                zip(filtered_questions, refined_questions, guardrail_checks)
-            ):
-                # Skip if question is blocked by guardrail
-                if isinstance(is_appropriate, bool) and not is_appropriate:
-                    logger.info(f"FAQ question blocked by guardrail: '{original_q}'")
-                    continue
-
-                # Use refined question if successful, otherwise use original
-                if isinstance(refined_q, Exception):
-                    logger.warning(f"Refinement failed for '{original_q}': {refined_q}")
-                    final_question = original_q
-                else:
-                    final_question = refined_q
-
-                category = self._categorize_question(original_q)
-
-                faqs.append(
-                    {
-                        "id": f"dyn_faq_{idx}",
-                        "question": final_question,
-                        "category": category,
-                        "count": item["count"],
-                    }
-                )
+                final_question = refined_q
 
-            logger.info(f"Generated {len(faqs)} FAQs for language '{language}'")
+            category = self._categorize_question(original_q)
 
-            # Cache for 5 minutes (300 seconds)
-            await cache_service.set(cache_key, faqs, ttl=300)
+            faqs.append(
+                {
+                    "id": f"dyn_faq_{idx}",
+                    "question": final_question,
+                    "category": category,
+                    "count": item["count"],
+                }
+            )
 
-            return faqs
+        logger.info(f"Generated {len(faqs)} FAQs for language '{language}'")
 
-        except Exception as e:
-            logger.error(f"Error generating FAQs: {e}", exc_info=True)
-            return []
+        return faqs
 
     async def get_trending_questions(
         self,
@@ -276,37 +338,12 @@ Câu hỏi đã hoàn thiện:"""
         Returns:
             List of trending questions
         """
-        # Check cache first
         cache_key = f"faq:trending:{language}:{limit}:{hours}"
-        cache_service = get_cache_service()
-        cached = await cache_service.get(cache_key)
-        if cached is not None:
-            logger.info(
-                f"Returning cached trending questions for language '{language}' (cache hit)"
-            )
-            return cached
 
-        try:
+        async def compute() -> List[dict[str, Any]]:
             since_date = datetime.utcnow() - timedelta(hours=hours)
 
-            pipeline = [
-                {
-                    "$match": {
-                        "role": "user",
-                        "createdAt": {"$gte": since_date},
-                    }
-                },
-                {
-                    "$group": {
-                        "_id": {"$toLower": {"$trim": {"input": "$text"}}},
-                        "count": {"$sum": 1},
-                        "originalText": {"$first": "$text"},
-                    }
-                },
-                {"$match": {"count": {"$gte": 2}}},  # Asked at least twice
-                {"$sort": {"count": -1}},
-                {"$limit": limit},
-            ]
+            pipeline = trending_questions_pipeline(since_date, limit=limit)
 
             cursor = self.messages_coll.aggregate(pipeline)
             results = await cursor.to_list(length=limit)
@@ -325,12 +362,13 @@ Câu hỏi đã hoàn thiện:"""
                             "category": "trending",
                         }
                     )
-
-            # Cache for 3 minutes (180 seconds) - shorter TTL for trending
-            await cache_service.set(cache_key, trending, ttl=180)
-
             return trending
 
+        try:
+            # Fresh for 3 minutes (shorter TTL for trending), then served stale while
+            # a single caller recomputes
+            return await get_cache_service().get_or_compute(cache_key, compute, ttl=180)
+
         except Exception as e:
             logger.error(f"Error getting trending questions: {e}", exc_info=True)
             return []
@@ -0,0 +1,240 @@
+"""Durable document ingestion queue (Postgres).
+
+Jobs are rows in ``ingestion_jobs``, inserted in the same transaction as their document so an
+upload can never be committed without one. Workers claim due jobs with
+``SELECT ... FOR UPDATE SKIP LOCKED``, so any number of API replicas can run a worker without
+processing a document twice. A claim is a lease: a job whose ``leased_until`` passes (crashed
+worker) becomes claimable again. Every state change after the claim is fenced on the owner and
+attempt number, so a worker that lost its lease cannot overwrite the new holder's result.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from datetime import datetime, timedelta
+from typing import Any, Iterable
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+from ..core.database import AsyncSessionLocal
+from ..models.document import Document
+from ..models.ingestion_job import IngestionJob
+
+QUEUED = "QUEUED"
+RUNNING = "RUNNING"
+DONE = "DONE"
+FAILED = "FAILED"
+
+# Timed pipeline stages recorded in ``IngestionJob.stats``
+STAGES = ("download_ms", "parse_ms", "chunk_embed_ms", "upsert_ms")
+
+# Set after an enqueue commits so this process's worker claims the job immediately
+_wake = asyncio.Event()
+
+
+def enqueue_jobs(db: AsyncSession, document_ids: Iterable[int]) -> None:
+    """Add a queued job per document to ``db``; the caller commits, then ``notify_worker()``."""
+    now = datetime.utcnow()
+    db.add_all(
+        IngestionJob(document_id=document_id, status=QUEUED, attempts=0, available_at=now)
+        for document_id in document_ids
+    )
+
+
+def notify_worker() -> None:
+    _wake.set()
+
+
+async def wait_for_work(pending: set[asyncio.Task], timeout: float) -> None:
+    """Sleep until an enqueue in this process, a pending task finishing, or ``timeout``."""
+    waker = asyncio.ensure_future(_wake.wait())
+    try:
+        await asyncio.wait({waker, *pending}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        waker.cancel()
+
+
+def retry_delay(attempts: int) -> float:
+    """Exponential backoff with full jitter for the retry after attempt ``attempts``."""
+    base = float(settings.INGEST_RETRY_BASE_SECONDS)
+    cap = float(settings.INGEST_RETRY_MAX_SECONDS)
+    return random.uniform(base, min(cap, base * 2 ** (attempts - 1)))
+
+
+async def claim_jobs(owner: str, limit: int) -> list[IngestionJob]:
+    """Lease up to ``limit`` due jobs (queued, or running with an expired lease) to ``owner``."""
+    _wake.clear()
+    now = datetime.utcnow()
+    async with AsyncSessionLocal() as db:
+        stmt = (
+            select(IngestionJob)
+            .where(
+                or_(
+                    and_(IngestionJob.status == QUEUED, IngestionJob.available_at <= now),
+                    and_(IngestionJob.status == RUNNING, IngestionJob.leased_until <= now),
+                )
+            )
+            .order_by(IngestionJob.available_at, IngestionJob.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        jobs = (await db.execute(stmt)).scalars().all()
+        leased_until = now + timedelta(seconds=settings.INGEST_VISIBILITY_TIMEOUT_SECONDS)
+        for job in jobs:
+            job.status = RUNNING
+            job.attempts += 1
+            job.lease_owner = owner
+            job.leased_until = leased_until
+            job.started_at = now
+            job.finished_at = None
+            job.stats = None
+        await db.commit()
+        return list(jobs)
+
+
+async def _update_leased(job: IngestionJob, owner: str, **values) -> bool:
+    """Apply ``values`` if ``owner`` still holds the lease taken for this attempt."""
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            update(IngestionJob)
+            .where(
+                IngestionJob.id == job.id,
+                IngestionJob.status == RUNNING,
+                IngestionJob.lease_owner == owner,
+                IngestionJob.attempts == job.attempts,
+            )
+            .values(updated_at=datetime.utcnow(), **values)
+        )
+        await db.commit()
+        return result.rowcount == 1
+
+
+async def extend_lease(job: IngestionJob, owner: str) -> bool:
+    leased_until = datetime.utcnow() + timedelta(seconds=settings.INGEST_VISIBILITY_TIMEOUT_SECONDS)
+    return await _update_leased(job, owner, leased_until=leased_until)
+
+
+async def _settle(job: IngestionJob, owner: str, stats: dict | None, **values) -> bool:
+    return await _update_leased(
+        job,
+        owner,
+        lease_owner=None,
+        leased_until=None,
+        finished_at=datetime.utcnow(),
+        stats=stats,
+        **values,
+    )
+
+
+async def complete_job(job: IngestionJob, owner: str, stats: dict | None = None) -> bool:
+    return await _settle(job, owner, stats, status=DONE, last_error=None)
+
+
+async def retry_job(
+    job: IngestionJob, owner: str, error: str, delay: float, stats: dict | None = None
+) -> bool:
+    return await _settle(
+        job,
+        owner,
+        stats,
+        status=QUEUED,
+        available_at=datetime.utcnow() + timedelta(seconds=delay),
+        last_error=error,
+    )
+
+
+async def fail_job(job: IngestionJob, owner: str, error: str, stats: dict | None = None) -> bool:
+    return await _settle(job, owner, stats, status=FAILED, last_error=error)
+
+
+async def ingestion_metrics(db: AsyncSession, since: datetime) -> dict[str, Any]:
+    """
+    Ingestion throughput since ``since``: backlog, outcomes and per-format stage timings.
+
+    ``worker_bytes_per_sec`` is bytes over summed processing time (what one worker slot
+    sustains); ``docs_per_hour`` is wall-clock completions over the window.
+    """
+    backlog_rows = await db.execute(
+        select(IngestionJob.status, func.count())
+        .where(IngestionJob.status.in_([QUEUED, RUNNING]))
+        .group_by(IngestionJob.status)
+    )
+    backlog = {status: count for status, count in backlog_rows.all()}
+
+    total_ms = IngestionJob.stats["total_ms"].as_float()
+    nbytes = IngestionJob.stats["bytes"].as_float()
+    done_rows = await db.execute(
+        select(
+            Document.format,
+            func.count(),
+            func.sum(nbytes),
+            func.sum(total_ms),
+            func.percentile_cont(0.95).within_group(total_ms),
+            func.sum(IngestionJob.stats["chunks"].as_float()),
+            *(func.avg(IngestionJob.stats[stage].as_float()) for stage in STAGES),
+        )
+        .select_from(IngestionJob)
+        .join(Document, Document.id == IngestionJob.document_id)
+        .where(IngestionJob.status == DONE, IngestionJob.finished_at >= since)
+        .group_by(Document.format)
+    )
+    failed_rows = await db.execute(
+        select(Document.format, func.count())
+        .select_from(IngestionJob)
+        .join(Document, Document.id == IngestionJob.document_id)
+        .where(IngestionJob.status == FAILED, IngestionJob.finished_at >= since)
+        .group_by(Document.format)
+    )
+    failed = {fmt: count for fmt, count in failed_rows.all()}
+
+    formats: dict[str, dict[str, Any]] = {}
+    for fmt, count, fmt_bytes, fmt_ms, p95_ms, chunks, *stage_avgs in done_rows.all():
+        formats[fmt] = {
+            "completed": count,
+            "failed": failed.pop(fmt, 0),
+            "bytes": int(fmt_bytes or 0),
+            "chunks": int(chunks or 0),
+            "p95_total_ms": round(p95_ms or 0),
+            "avg_stage_ms": {
+                stage.removesuffix("_ms"): round(avg or 0) for stage, avg in zip(STAGES, stage_avgs)
+            },
+            "worker_bytes_per_sec": round((fmt_bytes or 0) / (fmt_ms / 1000)) if fmt_ms else None,
+        }
+    for fmt, count in failed.items():
+        formats[fmt] = {"completed": 0, "failed": count}
+
+    completed = sum(item["completed"] for item in formats.values())
+    total_bytes = sum(item.get("bytes", 0) for item in formats.values())
+    window_hours = max((datetime.utcnow() - since).total_seconds() / 3600, 1e-9)
+    return {
+        "since": since.isoformat(),
+        "queued": backlog.get(QUEUED, 0),
+        "running": backlog.get(RUNNING, 0),
+        "completed": completed,
+        "failed": sum(item["failed"] for item in formats.values()),
+        "bytes": total_bytes,
+        "docs_per_hour": round(completed / window_hours, 2),
+        "formats": formats,
+    }
+
+
+__all__ = [
+    "QUEUED",
+    "RUNNING",
+    "DONE",
+    "FAILED",
+    "enqueue_jobs",
+    "notify_worker",
+    "wait_for_work",
+    "retry_delay",
+    "claim_jobs",
+    "extend_lease",
+    "complete_job",
+    "retry_job",
+    "fail_job",
+    "ingestion_metrics",
+    "STAGES",
+]
@@ -0,0 +1,302 @@
+"""Bulk re-embedding of the corpus into a shadow Chroma collection.
+
+Used when ``EMBED_MODEL`` or chunking changes. Every ACTIVE document is streamed from MinIO,
+re-chunked and embedded into a new collection while the current one keeps serving traffic;
+once complete, the collection alias is flipped atomically (see ``rag.collection_alias``).
+
+Progress is checkpointed after each flushed batch (documents are walked in id order and a
+batch only ever ends on a document boundary), so a crashed run resumes where it stopped.
+Chunk ids are the processor's deterministic ``chunk_id``s, which makes replaying the
+documents after the last checkpoint an idempotent upsert.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import logging
+import os
+from datetime import datetime
+from typing import Any, Optional
+
+from langchain_core.documents import Document as ChunkDocument
+from sqlalchemy import select
+
+from ..core.config import settings
+from ..core.database import AsyncSessionLocal
+from ..models.document import Document
+from ..models.ingestion_job import IngestionJob
+from ..rag.collection_alias import (
+    REINDEX_CHECKPOINT_KEY,
+    get_config_value,
+    load_alias,
+    set_config_value,
+    swap_alias,
+)
+from ..rag.document_processor import DocumentProcessor
+from ..rag.vector_store import build_vectorstore, upsert_batched
+from . import dms
+
+logger = logging.getLogger(__name__)
+
+# Documents fetched from Postgres per page
+DOCUMENT_PAGE_SIZE = 50
+# Chunk metadatas read per request when pruning the shadow collection
+PRUNE_PAGE_SIZE = 5000
+
+
+class ReindexError(Exception):
+    pass
+
+
+def _download(object_name: str) -> bytes:
+    response = dms.minio_client.get_object(dms.BUCKET_NAME, object_name)
+    try:
+        return response.read()
+    finally:
+        response.close()
+        response.release_conn()
+
+
+class Reindexer:
+    """Rebuilds the vector index into ``checkpoint["target"]``, resuming from its checkpoint."""
+
+    def __init__(self, checkpoint: dict[str, Any], batch_size: int):
+        self.checkpoint = checkpoint
+        self.batch_size = batch_size
+        self.processor = DocumentProcessor()
+        self.shadow = build_vectorstore(checkpoint["target"], checkpoint["embed_model"])
+        self._chunks: list[ChunkDocument] = []
+
+    @classmethod
+    def start(
+        cls,
+        *,
+        target: Optional[str] = None,
+        embed_model: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        restart: bool = False,
+    ) -> "Reindexer":
+        """Resume the checkpointed run, or begin a new one into ``target``."""
+        checkpoint = None if restart else get_config_value(REINDEX_CHECKPOINT_KEY)
+        if checkpoint and target and checkpoint["target"] != target:
+            raise ReindexError(
+                f"A reindex into {checkpoint['target']} is in progress; "
+                "resume it or pass --restart"
+            )
+
+        if not checkpoint:
+            alias = load_alias()
+            now = datetime.utcnow()
+            target = target or f"{settings.CHROMA_COLLECTION}__{now:%Y%m%d%H%M%S}"
+            if target == alias.active:
+                raise ReindexError(f"{target} is the active collection")
+            checkpoint = {
+                "target": target,
+                "embed_model": embed_model or settings.EMBED_MODEL,
+                "alias_version": alias.version,
+                "started_at": now.isoformat(),
+                "last_document_id": 0,
+                "documents": 0,
+                "chunks": 0,
+                "failed": [],
+            }
+            set_config_value(REINDEX_CHECKPOINT_KEY, checkpoint)
+        else:
+            logger.info(
+                f"Resuming reindex into {checkpoint['target']} after document "
+                f"{checkpoint['last_document_id']}"
+            )
+
+        return cls(checkpoint, batch_size or settings.REINDEX_BATCH_SIZE)
+
+    async def _next_page(self, after_id: int) -> list[Any]:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(Document.id, Document.title, Document.file_path, Document.department_id)
+                .where(Document.status == "ACTIVE", Document.id > after_id)
+                .order_by(Document.id)
+                .limit(DOCUMENT_PAGE_SIZE)
+            )
+            return result.all()
+
+    async def _active_ids(self, ids: list[int]) -> set[int]:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(Document.id).where(Document.id.in_(ids), Document.status == "ACTIVE")
+            )
+            return set(result.scalars().all())
+
+    def _chunk(self, row: Any, data: bytes) -> list[ChunkDocument]:
+        _, ext = os.path.splitext(row.file_path)
+        return self.processor.process_document(
+            io.BytesIO(data),
+            ext,
+            str(row.id),
+            metadata={
+                "title": row.title,
+                "source": row.file_path,
+                "department_id": row.department_id,
+            },
+        )
+
+    async def _flush(self, last_document_id: Optional[int] = None) -> None:
+        chunks, self._chunks = self._chunks, []
+        if chunks:
+            # Upserts, so replaying after a crash overwrites instead of duplicating
+            ids = [chunk.metadata["chunk_id"] for chunk in chunks]
+            await asyncio.to_thread(upsert_batched, self.shadow, chunks, ids)
+            self.checkpoint["chunks"] += len(chunks)
+        if last_document_id is not None:
+            self.checkpoint["last_document_id"] = last_document_id
+        await asyncio.to_thread(set_config_value, REINDEX_CHECKPOINT_KEY, self.checkpoint)
+
+    async def _drop_stale_chunks(self, document_id: int, keep: set[str]) -> None:
+        """Delete the document's chunks in the target collection whose ids are not in ``keep``."""
+        collection = self.shadow._collection
+        existing = await asyncio.to_thread(
+            collection.get, where={"document_id": str(document_id)}, include=[]
+        )
+        stale = [chunk_id for chunk_id in existing.get("ids") or [] if chunk_id not in keep]
+        if stale:
+            await asyncio.to_thread(collection.delete, ids=stale)
+
+    async def _index_rows(
+        self, rows: list[Any], *, checkpoint: bool, replace: bool = False
+    ) -> None:
+        """
+        Chunk and upsert ``rows``, downloading the next file while the current one is chunked.
+
+        With ``replace``, chunks the target already holds for a document under other ids (an
+        earlier version, or written by ingestion) are deleted, so re-indexing never duplicates.
+        """
+        pending = asyncio.create_task(asyncio.to_thread(_download, rows[0].file_path))
+        for i, row in enumerate(rows):
+            current = pending
+            if i + 1 < len(rows):
+                pending = asyncio.create_task(asyncio.to_thread(_download, rows[i + 1].file_path))
+
+            try:
+                data = await current
+                chunks = await asyncio.to_thread(self._chunk, row, data)
+                if replace:
+                    await self._drop_stale_chunks(
+                        row.id, {chunk.metadata["chunk_id"] for chunk in chunks}
+                    )
+                self._chunks.extend(chunks)
+                self.checkpoint["documents"] += 1
+            except Exception as exc:
+                logger.error(f"Reindex skipped document {row.id}: {exc}")
+                self.checkpoint["failed"].append(row.id)
+
+            if len(self._chunks) >= self.batch_size:
+                await self._flush(row.id if checkpoint else None)
+        await self._flush(rows[-1].id if checkpoint else None)
+
+    async def _catch_up(self, since: datetime) -> None:
+        """Re-index documents whose ingestion finished at or after ``since``.
+
+        The id cursor misses documents that became ACTIVE behind it while the run was going.
+        """
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(Document.id, Document.title, Document.file_path, Document.department_id)
+                .join(IngestionJob, IngestionJob.document_id == Document.id)
+                .where(Document.status == "ACTIVE", IngestionJob.finished_at >= since)
+                .order_by(Document.id)
+            )
+            rows = result.all()
+        if rows:
+            logger.info(f"Reindex catching up on {len(rows)} recently ingested documents")
+            await self._index_rows(rows, checkpoint=False, replace=True)
+
+    async def _retry_failed(self) -> None:
+        """Give documents that failed earlier in the run (or a previous run) another attempt."""
+        failed = sorted(set(self.checkpoint["failed"]))
+        if not failed:
+            return
+        self.checkpoint["failed"] = []
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(Document.id, Document.title, Document.file_path, Document.department_id)
+                .where(Document.id.in_(failed), Document.status == "ACTIVE")
+                .order_by(Document.id)
+            )
+            rows = result.all()
+        if rows:
+            logger.info(f"Retrying {len(rows)} documents that failed to reindex")
+            await self._index_rows(rows, checkpoint=False, replace=True)
+        else:
+            await self._flush()
+
+    async def _prune(self) -> int:
+        """Drop chunks of documents deleted or replaced while the run was in progress."""
+        collection = self.shadow._collection
+        indexed: set[int] = set()
+        offset = 0
+        while True:
+            data = await asyncio.to_thread(
+                collection.get, include=["metadatas"], limit=PRUNE_PAGE_SIZE, offset=offset
+            )
+            metadatas = data.get("metadatas") or []
+            indexed.update(
+                int(md["document_id"])
+                for md in metadatas
+                if md and str(md.get("document_id", "")).isdigit()
+            )
+            if len(metadatas) < PRUNE_PAGE_SIZE:
+                break
+            offset += PRUNE_PAGE_SIZE
+
+        stale: set[int] = set()
+        ids = sorted(indexed)
+        for start in range(0, len(ids), DOCUMENT_PAGE_SIZE):
+            page = ids[start : start + DOCUMENT_PAGE_SIZE]
+            stale |= set(page) - await self._active_ids(page)
+        for document_id in stale:
+            await asyncio.to_thread(collection.delete, where={"document_id": str(document_id)})
+        return len(stale)
+
+    async def run(self, *, swap: bool = True, force: bool = False) -> dict[str, Any]:
+        """
+        Index every remaining ACTIVE document, then (optionally) flip the alias.
+
+        Documents that fail are retried once at the end. If any still fail, the alias is not
+        flipped (they would vanish from search) unless ``force`` is set; running again resumes
+        and retries them.
+        """
+        while rows := await self._next_page(self.checkpoint["last_document_id"]):
+            await self._index_rows(rows, checkpoint=True)
+            logger.info(
+                f"Reindexed {self.checkpoint['documents']} documents "
+                f"({self.checkpoint['chunks']} chunks) into {self.checkpoint['target']}"
+            )
+
+        await self._retry_failed()
+        caught_up_at = datetime.utcnow()
+        await self._catch_up(datetime.fromisoformat(self.checkpoint["started_at"]))
+        pruned = await self._prune()
+        if pruned:
+            logger.info(f"Pruned {pruned} documents removed during the reindex")
+
+        failed = self.checkpoint["failed"]
+        if swap and failed and not force:
+            raise ReindexError(
+                f"{len(failed)} documents failed to reindex ({failed}); run again to retry them, "
+                "or pass --force to switch anyway"
+            )
+        if swap:
+            await asyncio.to_thread(
+                swap_alias,
+                self.checkpoint["target"],
+                self.checkpoint["embed_model"],
+                expected_version=self.checkpoint["alias_version"],
+            )
+            # Ingestion workers write to the old collection until their next alias check
+            await asyncio.sleep(2 * settings.VECTOR_ALIAS_CHECK_SECONDS)
+            await self._catch_up(caught_up_at)
+            await asyncio.to_thread(set_config_value, REINDEX_CHECKPOINT_KEY, None)
+        return self.checkpoint
+
+
+__all__ = ["Reindexer", "ReindexError", "DOCUMENT_PAGE_SIZE"]
@@ -0,0 +1,244 @@
+"""Document ingestion worker.
+
+Claims jobs from the Postgres ingestion queue (``services.ingestion_queue``) and runs the
+MinIO -> parse/split -> vector store pipeline for each. Uploads wake the worker in the same
+process immediately; ``INGEST_POLL_SECONDS`` only bounds how late it notices jobs enqueued by
+another replica, retries coming due and leases expiring.
+"""
+
+import asyncio
+import io
+import logging
+import os
+import socket
+import time
+import uuid
+from typing import Any, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+from ..core.database import AsyncSessionLocal
+from ..models.document import Document
+from ..models.ingestion_job import IngestionJob
+from ..rag.document_processor import DocumentProcessor
+from ..rag.vector_store import upsert_documents
+from ..services import dms
+from ..services import ingestion_queue as queue
+
+logger = logging.getLogger(__name__)
+
+
+class PermanentIngestionError(Exception):
+    """Processing failed in a way retrying cannot fix."""
+
+
+def _elapsed_ms(since: float) -> int:
+    return int((time.perf_counter() - since) * 1000)
+
+
+async def _process_single_document(db: AsyncSession, doc_id: int, stats: dict[str, Any]) -> None:
+    """Run the pipeline for one document, recording stage timings and counts in ``stats``."""
+    stmt = select(Document).where(Document.id == doc_id)
+    result = await db.execute(stmt)
+    doc = result.scalar_one_or_none()
+
+    if not doc:
+        logger.warning("Document %s not found in database", doc_id)
+        return
+
+    object_name: Optional[str] = doc.file_path
+    if not object_name:
+        raise PermanentIngestionError("No file path available for document")
+
+    try:
+        stat = await asyncio.to_thread(dms.minio_client.stat_object, dms.BUCKET_NAME, object_name)
+        file_size_mb = stat.size / (1024 * 1024)
+        max_process_mb = int(getattr(settings, "MAX_PROCESS_FILE_SIZE_MB", 100))
+
+        if file_size_mb > max_process_mb:
+            doc.status = "FAIL"
+            db.add(doc)
+            await db.commit()
+            raise PermanentIngestionError(
+                f"File size {file_size_mb:.2f} MB exceeds max processable size {max_process_mb} MB"
+            )
+    except PermanentIngestionError:
+        raise
+    except Exception as stat_exc:
+        logger.warning("Failed to stat file %s: %s, continuing anyway", object_name, stat_exc)
+
+    doc.status = "PROCESSING"
+    db.add(doc)
+    await db.commit()
+
+    started = time.perf_counter()
+    minio_obj = await asyncio.to_thread(dms.minio_client.get_object, dms.BUCKET_NAME, object_name)
+    file_bytes = minio_obj.read()
+    minio_obj.close()
+    minio_obj.release_conn()
+    stats["download_ms"] = _elapsed_ms(started)
+    stats["bytes"] = len(file_bytes)
+
+    file_stream = io.BytesIO(file_bytes)
+    _, ext = os.path.splitext(object_name)
+
+    processor = DocumentProcessor()
+    split_docs = processor.process_document(
+        file_stream,
+        ext,
+        str(doc.id),
+        metadata={
+            "title": doc.title,
+            "source": object_name,
+            "department_id": doc.department_id,
+        },
+        stats=stats,
+    )
+
+    upsert_started = time.perf_counter()
+    # Deterministic ids: a retry or a new lease holder overwrites chunks an earlier attempt
+    # already wrote instead of adding them again
+    chunk_ids = [chunk.metadata["chunk_id"] for chunk in split_docs]
+    await asyncio.to_thread(upsert_documents, split_docs, chunk_ids)
+    stats["upsert_ms"] = _elapsed_ms(upsert_started)
+    stats["total_ms"] = _elapsed_ms(started)
+    stats["bytes_per_sec"] = round(stats["bytes"] / max(stats["total_ms"] / 1000, 0.001))
+
+    doc.status = "ACTIVE"
+    db.add(doc)
+    await db.commit()
+    logger.info("Document %s processed and set to ACTIVE: %s", doc.id, stats)
+
+
+async def _set_document_status(doc_id: int, status: str) -> None:
+    async with AsyncSessionLocal() as db:
+        doc = await db.get(Document, doc_id)
+        if doc:
+            doc.status = status
+            await db.commit()
+
+
+async def _keep_lease(job: IngestionJob, owner: str) -> None:
+    interval = max(1.0, settings.INGEST_VISIBILITY_TIMEOUT_SECONDS / 3)
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            if not await queue.extend_lease(job, owner):
+                logger.warning(
+                    "Lost lease on ingestion job %s (document %s)", job.id, job.document_id
+                )
+                return
+        except Exception:
+            logger.exception("Failed to extend lease on ingestion job %s", job.id)
+
+
+def _log_lost_lease(job: IngestionJob) -> None:
+    # Another worker holds the job now; the document status is its to set
+    logger.warning(
+        "Lease on ingestion job %s (document %s) was taken over; leaving its outcome to the "
+        "current holder",
+        job.id,
+        job.document_id,
+    )
+
+
+async def _attempt_job(job: IngestionJob, owner: str) -> None:
+    doc_id = job.document_id
+    max_attempts = int(settings.INGEST_MAX_ATTEMPTS)
+
+    if job.attempts > max_attempts:
+        # Its previous holders all died mid-processing
+        logger.error("Ingestion job %s exceeded %s attempts", job.id, max_attempts)
+        if await queue.fail_job(job, owner, "Lease expired on every attempt"):
+            await _set_document_status(doc_id, "FAIL")
+        else:
+            _log_lost_lease(job)
+        return
+
+    logger.info("Processing document ID: %s (attempt %s)", doc_id, job.attempts)
+    stats: dict[str, Any] = {}
+    if job.started_at:
+        stats["queue_wait_ms"] = max(
+            0, int((job.started_at - job.available_at).total_seconds() * 1000)
+        )
+    heartbeat = asyncio.create_task(_keep_lease(job, owner))
+    try:
+        async with AsyncSessionLocal() as db:
+            await _process_single_document(db, doc_id, stats)
+    except PermanentIngestionError as exc:
+        logger.error("Processing failed for document %s: %s", doc_id, exc)
+        if await queue.fail_job(job, owner, str(exc), stats):
+            await _set_document_status(doc_id, "FAIL")
+        else:
+            _log_lost_lease(job)
+    except Exception as exc:
+        error = f"{type(exc).__name__}: {exc}"
+        if job.attempts >= max_attempts:
+            logger.exception("Processing failed for document %s, giving up: %s", doc_id, exc)
+            # Kept (and its job row with it) so the failure shows up in status and metrics
+            if await queue.fail_job(job, owner, error, stats):
+                await _set_document_status(doc_id, "FAIL")
+            else:
+                _log_lost_lease(job)
+        else:
+            delay = queue.retry_delay(job.attempts)
+            logger.warning(
+                "Processing failed for document %s (attempt %s), retrying in %.0fs: %s",
+                doc_id,
+                job.attempts,
+                delay,
+                exc,
+            )
+            if await queue.retry_job(job, owner, error, delay, stats):
+                await _set_document_status(doc_id, "REQUEST")
+            else:
+                _log_lost_lease(job)
+    else:
+        if not await queue.complete_job(job, owner, stats):
+            _log_lost_lease(job)
+    finally:
+        heartbeat.cancel()
+
+
+async def _run_job(job: IngestionJob, owner: str) -> None:
+    try:
+        await _attempt_job(job, owner)
+    except Exception:
+        # Recording the outcome failed; the lease expires and the job is claimed again
+        logger.exception("Failed to settle ingestion job %s", job.id)
+
+
+async def run_ingestion_worker() -> None:
+    max_concurrent = int(getattr(settings, "MAX_CONCURRENT_PROCESSING", 3))
+    poll_seconds = float(settings.INGEST_POLL_SECONDS)
+    owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+    running: set[asyncio.Task] = set()
+
+    logger.info(
+        "Starting ingestion worker %s (concurrency %s, poll %ss)",
+        owner,
+        max_concurrent,
+        poll_seconds,
+    )
+    try:
+        while True:
+            free = max_concurrent - len(running)
+            if free > 0:
+                try:
+                    jobs = await queue.claim_jobs(owner, free)
+                except Exception:
+                    logger.exception("Failed to claim ingestion jobs")
+                    jobs = []
+                for job in jobs:
+                    task = asyncio.create_task(_run_job(job, owner))
+                    running.add(task)
+                    task.add_done_callback(running.discard)
+            await queue.wait_for_work(running, poll_seconds)
+    except asyncio.CancelledError:
+        # Leases of interrupted jobs expire and another worker picks them up
+        for task in running:
+            task.cancel()
+        logger.info("Ingestion worker cancelled")
+        raise
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Explain the dashboard/FAQ MongoDB queries and flag any that fall back to a COLLSCAN.
+
+Usage:
+    python scripts/check_mongo_indexes.py            # Explain queries, exit 1 on COLLSCAN
+    python scripts/check_mongo_indexes.py --create   # Ensure indexes first, then explain
+    python scripts/check_mongo_indexes.py --verbose  # Print the full winning-plan stages
+"""
+
+import argparse
+import asyncio
+import sys
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, List, Tuple
+
+from app.core.mongo import get_chat_messages_collection, get_chat_rollups_collection
+from app.core.mongo_indexes import (
+    CHAT_MESSAGE_INDEXES,
+    CHAT_ROLLUP_INDEXES,
+    ensure_mongo_indexes,
+    explain_aggregate,
+    explain_find,
+    winning_plan_stages,
+)
+from app.repositories.chat_analytics_repo import (
+    KEYSET_SORT,
+    frequent_questions_pipeline,
+    query_logs_filter,
+    trending_questions_pipeline,
+    unanswered_page_pipeline,
+)
+from app.repositories.chat_rollups_repo import rollup_pipeline
+
+ExplainFn = Callable[[], Awaitable[dict[str, Any]]]
+
+
+def build_checks(coll, rollups) -> List[Tuple[str, ExplainFn]]:
+    """Representative instances of every analytics query the API issues."""
+    now = datetime.utcnow()
+    week_ago = now - timedelta(days=7)
+    month_ago = now - timedelta(days=30)
+
+    return [
+        ("rollups.rebuild_7d", lambda: explain_aggregate(coll, rollup_pipeline(week_ago))),
+        (
+            "rollups.dashboard",
+            lambda: explain_find(rollups, {"day": {"$gte": week_ago.strftime("%Y-%m-%d")}}),
+        ),
+        (
+            "unanswered.page",
+            lambda: explain_aggregate(coll, unanswered_page_pipeline(coll.name, limit=20)),
+        ),
+        ("logs.all", lambda: explain_find(coll, query_logs_filter(), KEYSET_SORT)),
+        (
+            "logs.fallback",
+            lambda: explain_find(coll, query_logs_filter(fallback=True), KEYSET_SORT),
+        ),
+        ("logs.lang", lambda: explain_find(coll, query_logs_filter(lang="vi"), KEYSET_SORT)),
+        (
+            "logs.channel",
+            lambda: explain_find(coll, query_logs_filter(channel="widget"), KEYSET_SORT),
+        ),
+        (
+            "logs.search",
+            lambda: explain_find(coll, query_logs_filter(search="học phí"), KEYSET_SORT),
+        ),
+        (
+            "faq.frequent",
+            lambda: explain_aggregate(
+                coll, frequent_questions_pipeline(month_ago, min_frequency=3, limit=20)
+            ),
+        ),
+        (
+            "faq.trending",
+            lambda: explain_aggregate(
+                coll, trending_questions_pipeline(now - timedelta(hours=24), limit=5)
+            ),
+        ),
+    ]
+
+
+async def run(create: bool, verbose: bool) -> int:
+    coll = get_chat_messages_collection()
+    rollups = get_chat_rollups_collection()
+
+    if create:
+        names = await ensure_mongo_indexes(coll, rollups)
+        print(f"✅ Ensured {len(names)} indexes")
+        for spec in CHAT_MESSAGE_INDEXES + CHAT_ROLLUP_INDEXES:
+            print(f"   - {spec.name}: {spec.purpose}")
+        print()
+
+    failures = 0
+    for name, explain in build_checks(coll, rollups):
+        try:
+            stages = winning_plan_stages(await explain())
+        except Exception as exc:
+            print(f"❌ {name:<26} explain failed: {exc}")
+            failures += 1
+            continue
+
+        if "COLLSCAN" in stages:
+            failures += 1
+            marker = "❌"
+        else:
+            marker = "✅"
+        summary = " > ".join(stages) if verbose else ", ".join(sorted(set(stages)))
+        print(f"{marker} {name:<26} {summary or '(no plan)'}")
+
+    print()
+    if failures:
+        print(f"⚠️  {failures} query plan(s) use a COLLSCAN or could not be explained.")
+        print("Run with --create to build the declared indexes.")
+        return 1
+    print("All analytics queries are index-backed.")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check that dashboard/FAQ MongoDB queries use indexes."
+    )
+    parser.add_argument(
+        "--create", action="store_true", help="Ensure declared indexes before explaining"
+    )
+    parser.add_argument("--verbose", action="store_true", help="Show full winning-plan stages")
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(run(create=args.create, verbose=args.verbose)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Rebuild the per-day dashboard rollups from raw chat messages.
+
+Rollups are normally maintained on write; use this after a backfill, a data fix, or if
+the write-path increment failed for some turns. The current UTC day is still being
+incremented by live turns and is never rebuilt.
+
+Usage:
+    python scripts/rebuild_rollups.py             # Rebuild the whole history
+    python scripts/rebuild_rollups.py --days 7    # Rebuild the last 7 closed days only
+"""
+
+import argparse
+import asyncio
+from datetime import datetime, timedelta
+
+from app.core.mongo import get_chat_messages_collection, get_chat_rollups_collection
+from app.repositories.chat_rollups_repo import rebuild_rollups
+
+
+async def run(days: int | None) -> None:
+    since = datetime.utcnow() - timedelta(days=days) if days else None
+    await rebuild_rollups(get_chat_messages_collection(), get_chat_rollups_collection(), since)
+    scope = f"last {days} day(s)" if days else "full history"
+    print(f"✅ Rebuilt dashboard rollups ({scope})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild daily dashboard rollups.")
+    parser.add_argument(
+        "--days", type=int, default=None, help="Only rebuild the most recent N closed days"
+    )
+    args = parser.parse_args()
+    asyncio.run(run(args.days))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Re-embed every ACTIVE document into a new Chroma collection, then switch traffic to it.
+
+Run this after changing EMBED_MODEL or the chunking parameters. The current collection keeps
+serving queries until the rebuild completes and the collection alias is flipped. Progress is
+checkpointed, so an interrupted run continues where it stopped when started again.
+
+Usage:
+    python scripts/reindex.py                        # Start, or resume the unfinished run
+    python scripts/reindex.py --model BAAI/bge-m3    # Rebuild with another embedding model
+    python scripts/reindex.py --no-swap              # Build only; leave the alias alone
+    python scripts/reindex.py --restart              # Discard the checkpoint and start over
+    python scripts/reindex.py --force                # Switch even if some documents failed
+    python scripts/reindex.py --status               # Show the alias and any checkpoint
+    python scripts/reindex.py --rollback             # Switch back to the standby collection
+
+API processes follow a swap within VECTOR_ALIAS_CHECK_SECONDS, without restarting.
+"""
+
+import argparse
+import asyncio
+import json
+
+from app.rag.collection_alias import (
+    REINDEX_CHECKPOINT_KEY,
+    AliasConflict,
+    get_config_value,
+    load_alias,
+    swap_alias,
+)
+from app.services.reindex import Reindexer, ReindexError
+
+
+def show_status() -> None:
+    alias = load_alias()
+    print(f"📚 Active collection: {alias.active} ({alias.embed_model}), alias v{alias.version}")
+    if alias.standby:
+        print(f"   Standby collection: {alias.standby} ({alias.standby_embed_model})")
+    checkpoint = get_config_value(REINDEX_CHECKPOINT_KEY)
+    if checkpoint:
+        print("⏸️  Unfinished reindex:")
+        print(json.dumps(checkpoint, indent=2, ensure_ascii=False))
+    else:
+        print("✅ No reindex in progress")
+
+
+def rollback() -> None:
+    alias = load_alias()
+    if not alias.standby:
+        raise ReindexError("No standby collection to roll back to")
+    swapped = swap_alias(
+        alias.standby,
+        alias.standby_embed_model or alias.embed_model,
+        expected_version=alias.version,
+    )
+    print(f"↩️  {swapped.active} is active again (standby: {swapped.standby})")
+
+
+async def run(args: argparse.Namespace) -> None:
+    reindexer = await asyncio.to_thread(
+        Reindexer.start,
+        target=args.target,
+        embed_model=args.model,
+        batch_size=args.batch_size,
+        restart=args.restart,
+    )
+    target = reindexer.checkpoint["target"]
+    print(f"🔄 Reindexing into {target} with {reindexer.checkpoint['embed_model']}")
+
+    checkpoint = await reindexer.run(swap=not args.no_swap, force=args.force)
+    print(
+        f"✅ Indexed {checkpoint['documents']} documents ({checkpoint['chunks']} chunks) "
+        f"into {target}"
+    )
+    if checkpoint["failed"]:
+        print(f"⚠️  Skipped documents: {checkpoint['failed']}")
+    if args.no_swap:
+        print("ℹ️  Alias unchanged (--no-swap); run again without it to switch traffic")
+    else:
+        print(f"🔀 {target} is now the active collection")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the vector index with zero downtime.")
+    parser.add_argument("--target", help="Name of the new collection (default: timestamped)")
+    parser.add_argument("--model", help="Embedding model for the new collection")
+    parser.add_argument(
+        "--batch-size", type=int, default=None, help="Chunks per upsert (REINDEX_BATCH_SIZE)"
+    )
+    parser.add_argument("--restart", action="store_true", help="Ignore any saved checkpoint")
+    parser.add_argument("--no-swap", action="store_true", help="Do not flip the alias")
+    parser.add_argument(
+        "--force", action="store_true", help="Flip the alias even if documents failed"
+    )
+    parser.add_argument("--status", action="store_true", help="Show alias and checkpoint")
+    parser.add_argument("--rollback", action="store_true", help="Re-activate the standby")
+    args = parser.parse_args()
+
+    if args.status:
+        show_status()
+        return
+    try:
+        if args.rollback:
+            rollback()
+        else:
+            asyncio.run(run(args))
+    except (ReindexError, AliasConflict) as exc:
+        print(f"❌ {exc}")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
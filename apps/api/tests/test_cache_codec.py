@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+from app.core.cache_codec import (
+    COMPRESSION_NONE,
+    COMPRESSION_ZSTD,
+    FORMAT_VERSION,
+    MAGIC,
+    CacheCodec,
+)
+
+VALUE = {
+    "question": "Học phí học kỳ này là bao nhiêu?",
+    "scores": [0.91, 0.5, 0],
+    "nested": {"ok": True, "missing": None},
+    "count": 3,
+}
+
+
+def test_json_round_trip():
+    codec = CacheCodec("json", compress_min_bytes=0)
+    data = codec.encode(VALUE)
+    assert data.startswith(MAGIC)
+    assert data[1] == FORMAT_VERSION
+    assert data[3] == COMPRESSION_NONE
+    assert codec.decode(data) == VALUE
+
+
+def test_decodes_plain_json_written_before_envelopes():
+    codec = CacheCodec("json", compress_min_bytes=0)
+    legacy = json.dumps(VALUE, ensure_ascii=False)
+    assert codec.decode(legacy) == VALUE
+    assert codec.decode(legacy.encode("utf-8")) == VALUE
+
+
+def test_unknown_codec_falls_back_to_json():
+    codec = CacheCodec("pickle", compress_min_bytes=0)
+    assert codec.name == "json"
+    assert codec.decode(codec.encode(VALUE)) == VALUE
+
+
+@pytest.mark.parametrize("name", ["orjson", "msgpack"])
+def test_optional_codecs_round_trip(name):
+    pytest.importorskip(name)
+    codec = CacheCodec(name, compress_min_bytes=0)
+    assert codec.name == name
+    assert codec.decode(codec.encode(VALUE)) == VALUE
+
+
+def test_envelope_is_readable_by_a_differently_configured_codec():
+    pytest.importorskip("msgpack")
+    written = CacheCodec("msgpack", compress_min_bytes=0).encode(VALUE)
+    assert CacheCodec("json", compress_min_bytes=0).decode(written) == VALUE
+
+
+def test_large_values_are_compressed():
+    pytest.importorskip("zstandard")
+    codec = CacheCodec("json", compress_min_bytes=64)
+    value = {"text": "giờ làm việc " * 200}
+    data = codec.encode(value)
+    assert data[3] == COMPRESSION_ZSTD
+    assert len(data) < len(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+    assert codec.decode(data) == value
+
+    small = codec.encode({"a": 1})
+    assert small[3] == COMPRESSION_NONE
+    assert codec.decode(small) == {"a": 1}
+
+
+def test_unsupported_envelope_version_is_rejected():
+    codec = CacheCodec("json", compress_min_bytes=0)
+    data = bytearray(codec.encode(VALUE))
+    data[1] = FORMAT_VERSION + 1
+    with pytest.raises(ValueError):
+        codec.decode(bytes(data))
@@ -0,0 +1,49 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from app.repositories.chat_rollups_repo import (
+    day_key,
+    latency_bucket,
+    rollup_pipeline,
+    settled_before,
+)
+
+
+@pytest.mark.parametrize(
+    "now, expected",
+    [
+        (
+            datetime(2026, 3, 10, 15, 30, tzinfo=timezone.utc),
+            datetime(2026, 3, 10, tzinfo=timezone.utc),
+        ),
+        # Just after midnight the previous day may still receive increments
+        (
+            datetime(2026, 3, 10, 0, 2, tzinfo=timezone.utc),
+            datetime(2026, 3, 9, tzinfo=timezone.utc),
+        ),
+    ],
+)
+def test_settled_before(now, expected):
+    assert settled_before(now) == expected
+
+
+def test_rebuild_pipeline_stops_at_settled_days():
+    since = datetime(2026, 3, 1, tzinfo=timezone.utc)
+    until = datetime(2026, 3, 10, tzinfo=timezone.utc)
+    match = rollup_pipeline(since, until)[0]["$match"]
+    assert match["createdAt"] == {"$gte": since, "$lt": until}
+    assert "createdAt" not in rollup_pipeline()[0]["$match"]
+
+
+@pytest.mark.parametrize(
+    "latency_ms, bucket",
+    [(0, "250"), (250, "250"), (251, "500"), (16000, "16000"), (16001, "inf")],
+)
+def test_latency_bucket(latency_ms, bucket):
+    assert latency_bucket(latency_ms) == bucket
+
+
+def test_day_key_uses_utc():
+    local = datetime.fromisoformat("2026-03-10T01:00:00+07:00")
+    assert day_key(local) == "2026-03-09"
@@ -0,0 +1,40 @@
+import base64
+import json
+from datetime import datetime
+
+import pytest
+
+from app.services.dms import decode_document_cursor, encode_document_cursor
+
+
+def _token(payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode("utf-8")).decode("ascii")
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2026, 1, 2, 3, 4, 5, 123456)
+    token = encode_document_cursor({"id": 42, "created_at": created_at.isoformat()})
+    assert decode_document_cursor(token) == (created_at, 42)
+
+
+def test_cursor_is_url_safe():
+    token = encode_document_cursor({"id": 10**9, "created_at": "2026-12-31T23:59:59.999999"})
+    assert "+" not in token and "/" not in token
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        "",
+        "not a cursor!",
+        base64.urlsafe_b64encode(b"not json").decode("ascii"),
+        _token({"id": 1}),
+        _token({"t": "2026-01-02T03:04:05"}),
+        _token({"t": "yesterday", "id": 1}),
+        _token({"t": "2026-01-02T03:04:05", "id": "one"}),
+        _token(["2026-01-02T03:04:05", 1]),
+    ],
+)
+def test_malformed_cursor_is_rejected(token):
+    with pytest.raises(ValueError):
+        decode_document_cursor(token)
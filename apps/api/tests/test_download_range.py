@@ -0,0 +1,43 @@
+import pytest
+
+from app.api.docs import _parse_range
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("bytes=0-99", (0, 99)),
+        ("bytes=500-", (500, 999)),
+        ("bytes=900-5000", (900, 999)),
+        ("bytes=999-999", (999, 999)),
+        ("bytes=-100", (900, 999)),
+        ("bytes=-5000", (0, 999)),
+        (" bytes = 10-20", (10, 20)),
+        ("BYTES=0-0", (0, 0)),
+    ],
+)
+def test_satisfiable_ranges(header, expected):
+    assert _parse_range(header, 1000) == expected
+
+
+@pytest.mark.parametrize("header", ["items=0-10", "bytes=0-10,20-30"])
+def test_ranges_served_in_full(header):
+    assert _parse_range(header, 1000) is None
+
+
+@pytest.mark.parametrize(
+    "header, size",
+    [
+        ("bytes=1000-", 1000),
+        ("bytes=1000-2000", 1000),
+        ("bytes=20-10", 1000),
+        ("bytes=-0", 1000),
+        ("bytes=0-", 0),
+        ("bytes=", 1000),
+        ("bytes=10", 1000),
+        ("bytes=a-b", 1000),
+    ],
+)
+def test_unsatisfiable_or_malformed_ranges(header, size):
+    with pytest.raises(ValueError):
+        _parse_range(header, size)
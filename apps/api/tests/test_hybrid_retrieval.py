@@ -0,0 +1,127 @@
+import pytest
+from langchain_core.documents import Document
+
+from app.rag.retriever import Retriever, _BM25LexicalIndex, _Hit, _tokenize
+
+TEXTS = [
+    "tuition fee payment deadline for the spring semester",
+    "library opening hours during the exam period",
+    "tuition fee refund policy",
+    "library opening hours during the exam period",
+    "dormitory registration and fee schedule",
+    "scholarship application deadline",
+    "exam schedule for the spring semester",
+    "parking permit for students",
+]
+
+
+def _docs(texts):
+    return [
+        Document(page_content=text, metadata={"document_id": str(i), "chunk_id": f"c{i}"})
+        for i, text in enumerate(texts)
+    ]
+
+
+def _baseline_lexical(index, query, k):
+    # The full stable sort BM25 search used before partial selection
+    scores = index.bm25.get_scores(_tokenize(query))
+    ranked = sorted(enumerate(scores), key=lambda item: item[1], reverse=True)
+    return [(index.documents[idx].metadata["chunk_id"], float(score)) for idx, score in ranked[:k]]
+
+
+@pytest.mark.parametrize(
+    "query, k",
+    [
+        ("tuition fee", 3),
+        ("library opening hours", 2),
+        ("spring semester deadline", 5),
+        ("fee", 8),
+        ("fee", 20),
+        ("nothing matches this", 4),
+    ],
+)
+def test_lexical_search_matches_full_sort(query, k):
+    index = _BM25LexicalIndex(_docs(TEXTS))
+    hits = index.search(query, k=k)
+    assert [(hit.doc.metadata["chunk_id"], hit.score_lex) for hit in hits] == _baseline_lexical(
+        index, query, k
+    )
+    assert [hit.rank_lex for hit in hits] == list(range(1, len(hits) + 1))
+
+
+def test_lexical_search_breaks_ties_by_corpus_order():
+    index = _BM25LexicalIndex(_docs(["same text here"] * 5 + ["other words"]))
+    hits = index.search("same text", k=3)
+    assert [hit.doc.metadata["chunk_id"] for hit in hits] == ["c0", "c1", "c2"]
+
+
+def _hit(doc, *, rank_vec=None, rank_lex=None):
+    hit = _Hit(doc)
+    if rank_vec is not None:
+        hit.rank_vec, hit.score_vec = rank_vec, 1.0 - rank_vec / 10
+    if rank_lex is not None:
+        hit.rank_lex, hit.score_lex = rank_lex, 10.0 - rank_lex
+    return hit
+
+
+def _baseline_fuse(vector, lexical, k_param, top_k):
+    # RRF of the dict-based fusion: score every key, normalize by the max, stable sort
+    fused = {}
+    for chunk_id, rank in vector:
+        fused.setdefault(chunk_id, {})["rank_vec"] = rank
+    for chunk_id, rank in lexical:
+        fused.setdefault(chunk_id, {})["rank_lex"] = rank
+    raw = {
+        chunk_id: sum(1.0 / (k_param + rank) for rank in ranks.values())
+        for chunk_id, ranks in fused.items()
+    }
+    max_rrf = max(raw.values())
+    ordered = sorted(raw, key=lambda chunk_id: raw[chunk_id] / max_rrf, reverse=True)
+    return [(chunk_id, raw[chunk_id] / max_rrf) for chunk_id in ordered[:top_k]]
+
+
+@pytest.mark.parametrize("top_k", [1, 3, 5, 10])
+def test_rrf_fuse_matches_baseline(monkeypatch, top_k):
+    monkeypatch.setattr("app.rag.retriever.settings.HYBRID_FUSION_K", 60)
+    docs = {doc.metadata["chunk_id"]: doc for doc in _docs(TEXTS)}
+    vector = [("c2", 1), ("c0", 2), ("c5", 3), ("c7", 4)]
+    # c3 and c4 tie with c5/c7 on a single rank each; insertion order decides between them
+    lexical = [("c0", 1), ("c2", 2), ("c3", 3), ("c4", 4), ("c6", 5)]
+
+    fused = Retriever(vector_store=object())._rrf_fuse(
+        [_hit(docs[chunk_id], rank_vec=rank) for chunk_id, rank in vector],
+        [_hit(docs[chunk_id], rank_lex=rank) for chunk_id, rank in lexical],
+        top_k=top_k,
+    )
+
+    expected = _baseline_fuse(vector, lexical, 60, top_k)
+    assert [ctx["chunk_id"] for ctx in fused] == [chunk_id for chunk_id, _ in expected]
+    assert [ctx["score"] for ctx in fused] == pytest.approx([score for _, score in expected])
+    for ctx in fused:
+        if ctx["chunk_id"] == "c0":
+            assert (ctx["rank_vec"], ctx["rank_lex"]) == (2, 1)
+
+
+def _ctx(chunk_id, score):
+    return {"chunk_id": chunk_id, "text": f"text {chunk_id}", "score": score}
+
+
+def test_deduplicate_merges_ranked_sub_query_results():
+    from app.rag.orchestrator import RAGOrchestrator
+
+    ranked_lists = [
+        [_ctx("a", 1.0), _ctx("b", 0.6), _ctx("c", 0.2)],
+        [_ctx("c", 1.0), _ctx("d", 0.7), _ctx("a", 0.3)],
+        [],
+        [_ctx("e", 0.9), _ctx("b", 0.6)],
+    ]
+
+    merged = RAGOrchestrator._deduplicate(None, ranked_lists)
+
+    assert [(d["chunk_id"], d["score"]) for d in merged] == [
+        ("a", 1.0),
+        ("c", 1.0),
+        ("e", 0.9),
+        ("d", 0.7),
+        ("b", 0.6),
+    ]
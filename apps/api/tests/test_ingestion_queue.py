@@ -0,0 +1,166 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.ingestion_job import IngestionJob
+from app.services import ingestion_queue as queue
+
+
+class _AsyncSession:
+    """The slice of AsyncSession the queue uses, over a sync SQLite session."""
+
+    def __init__(self, session):
+        self._session = session
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self._session.close()
+
+    async def execute(self, stmt):
+        return self._session.execute(stmt)
+
+    async def commit(self):
+        self._session.commit()
+
+
+@pytest.fixture
+def session_factory(monkeypatch):
+    # SQLite ignores FOR UPDATE SKIP LOCKED; the fencing under test is in the WHERE clauses
+    engine = create_engine("sqlite://")
+    IngestionJob.__table__.create(engine)
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+    monkeypatch.setattr(queue, "AsyncSessionLocal", lambda: _AsyncSession(factory()))
+    yield factory
+    engine.dispose()
+
+
+def _add_job(factory, document_id: int, **values) -> int:
+    values.setdefault("status", queue.QUEUED)
+    values.setdefault("available_at", datetime.utcnow() - timedelta(seconds=1))
+    with factory() as db:
+        job = IngestionJob(document_id=document_id, attempts=values.pop("attempts", 0), **values)
+        db.add(job)
+        db.commit()
+        return job.id
+
+
+def _get_job(factory, job_id: int) -> IngestionJob:
+    with factory() as db:
+        return db.get(IngestionJob, job_id)
+
+
+def _expire_lease(factory, job_id: int) -> None:
+    with factory() as db:
+        db.get(IngestionJob, job_id).leased_until = datetime.utcnow() - timedelta(seconds=1)
+        db.commit()
+
+
+@pytest.mark.asyncio
+async def test_claim_jobs_leases_due_and_abandoned_jobs(session_factory):
+    past = datetime.utcnow() - timedelta(minutes=5)
+    future = datetime.utcnow() + timedelta(hours=1)
+    due = _add_job(session_factory, 1)
+    _add_job(session_factory, 2, available_at=future)
+    abandoned = _add_job(
+        session_factory, 3, status=queue.RUNNING, attempts=1, lease_owner="dead", leased_until=past
+    )
+    _add_job(
+        session_factory,
+        4,
+        status=queue.RUNNING,
+        attempts=1,
+        lease_owner="alive",
+        leased_until=future,
+    )
+    _add_job(session_factory, 5, status=queue.DONE)
+
+    claimed = await queue.claim_jobs("worker-a", limit=10)
+
+    assert sorted(job.id for job in claimed) == sorted([due, abandoned])
+    for job in claimed:
+        stored = _get_job(session_factory, job.id)
+        assert stored.status == queue.RUNNING
+        assert stored.lease_owner == "worker-a"
+        assert stored.leased_until > datetime.utcnow()
+        assert stored.attempts == job.attempts
+    assert _get_job(session_factory, due).attempts == 1
+    assert _get_job(session_factory, abandoned).attempts == 2
+
+
+@pytest.mark.asyncio
+async def test_claim_jobs_respects_limit(session_factory):
+    for document_id in range(1, 4):
+        _add_job(session_factory, document_id)
+
+    assert len(await queue.claim_jobs("worker-a", limit=2)) == 2
+    assert len(await queue.claim_jobs("worker-b", limit=2)) == 1
+    assert await queue.claim_jobs("worker-c", limit=2) == []
+
+
+@pytest.mark.asyncio
+async def test_lease_holder_settles_job(session_factory):
+    job_id = _add_job(session_factory, 1)
+    (job,) = await queue.claim_jobs("worker-a", limit=1)
+
+    assert await queue.extend_lease(job, "worker-a")
+    assert await queue.complete_job(job, "worker-a", stats={"chunks": 3})
+
+    stored = _get_job(session_factory, job_id)
+    assert stored.status == queue.DONE
+    assert stored.lease_owner is None and stored.leased_until is None
+    assert stored.stats == {"chunks": 3}
+    # Settled once; a second settle finds no RUNNING row
+    assert not await queue.fail_job(job, "worker-a", "late")
+
+
+@pytest.mark.asyncio
+async def test_stale_owner_cannot_settle(session_factory):
+    job_id = _add_job(session_factory, 1)
+    (stale,) = await queue.claim_jobs("worker-a", limit=1)
+    _expire_lease(session_factory, job_id)
+    (current,) = await queue.claim_jobs("worker-b", limit=1)
+
+    assert not await queue.complete_job(stale, "worker-a")
+    assert not await queue.fail_job(stale, "worker-a", "boom")
+    assert not await queue.retry_job(stale, "worker-a", "boom", delay=1.0)
+    assert not await queue.extend_lease(stale, "worker-a")
+    stored = _get_job(session_factory, job_id)
+    assert stored.status == queue.RUNNING
+    assert stored.lease_owner == "worker-b"
+
+    assert await queue.complete_job(current, "worker-b")
+    assert _get_job(session_factory, job_id).status == queue.DONE
+
+
+@pytest.mark.asyncio
+async def test_stale_attempt_cannot_settle(session_factory):
+    # The same worker re-claims its own expired job: only the newer attempt may settle it
+    job_id = _add_job(session_factory, 1)
+    (first,) = await queue.claim_jobs("worker-a", limit=1)
+    _expire_lease(session_factory, job_id)
+    (second,) = await queue.claim_jobs("worker-a", limit=1)
+    assert (first.attempts, second.attempts) == (1, 2)
+
+    assert not await queue.fail_job(first, "worker-a", "boom")
+    assert _get_job(session_factory, job_id).status == queue.RUNNING
+
+    assert await queue.retry_job(second, "worker-a", "transient", delay=30.0)
+    stored = _get_job(session_factory, job_id)
+    assert stored.status == queue.QUEUED
+    assert stored.last_error == "transient"
+    assert stored.available_at > datetime.utcnow()
+
+
+def test_retry_delay_bounds(monkeypatch):
+    monkeypatch.setattr(queue.settings, "INGEST_RETRY_BASE_SECONDS", 10)
+    monkeypatch.setattr(queue.settings, "INGEST_RETRY_MAX_SECONDS", 300)
+
+    assert queue.retry_delay(1) == 10
+    for attempts in range(2, 12):
+        upper = min(300, 10 * 2 ** (attempts - 1))
+        for _ in range(50):
+            assert 10 <= queue.retry_delay(attempts) <= upper
@@ -0,0 +1,87 @@
+import time
+
+import pytest
+
+from app.rag import reranker
+
+
+class _FakeReranker(reranker.CrossEncoderReranker):
+    """Scores passages by a lookup table instead of loading a model."""
+
+    def __init__(self, scores, delay=0.0):
+        self.calls = 0
+
+        def score(pairs):
+            self.calls += 1
+            time.sleep(delay)
+            return [scores[passage] for _, passage in pairs]
+
+        self._score = score
+
+
+CONTEXTS = [{"text": text, "chunk_id": text} for text in ["a", "b", "c", "d"]]
+
+
+@pytest.fixture
+def rerank_settings(monkeypatch):
+    monkeypatch.setattr(reranker.settings, "RERANK_TOP_N", 2)
+    monkeypatch.setattr(reranker.settings, "RERANK_MAX_CANDIDATES", 3)
+    monkeypatch.setattr(reranker.settings, "RERANK_BUDGET_MS", 1000)
+
+
+def _use(monkeypatch, fake):
+    monkeypatch.setattr(reranker, "get_reranker", lambda: fake)
+
+
+@pytest.mark.asyncio
+async def test_keeps_best_candidates_by_score(monkeypatch, rerank_settings):
+    _use(monkeypatch, _FakeReranker({"a": 0.1, "b": 0.9, "c": 0.5, "d": 1.0}))
+
+    reranked = await reranker.rerank_contexts("q", CONTEXTS)
+
+    # "d" is beyond RERANK_MAX_CANDIDATES and never scored
+    assert [ctx["chunk_id"] for ctx in reranked] == ["b", "c"]
+    assert [ctx["score_rerank"] for ctx in reranked] == [0.9, 0.5]
+    assert "score_rerank" not in CONTEXTS[1]
+
+
+@pytest.mark.asyncio
+async def test_over_budget_keeps_fused_order(monkeypatch, rerank_settings):
+    monkeypatch.setattr(reranker.settings, "RERANK_BUDGET_MS", 10)
+    _use(monkeypatch, _FakeReranker({"a": 0.1, "b": 0.9, "c": 0.5}, delay=0.2))
+
+    assert await reranker.rerank_contexts("q", CONTEXTS) is CONTEXTS
+    # The abandoned batch still finishes and frees the reranker
+    assert reranker._BUSY.acquire(timeout=1)
+    reranker._BUSY.release()
+
+
+@pytest.mark.asyncio
+async def test_failure_keeps_fused_order_and_releases_lock(monkeypatch, rerank_settings):
+    _use(monkeypatch, _FakeReranker({}))
+
+    assert await reranker.rerank_contexts("q", CONTEXTS) is CONTEXTS
+    assert reranker._BUSY.acquire(blocking=False)
+    reranker._BUSY.release()
+
+
+@pytest.mark.asyncio
+async def test_busy_reranker_is_skipped(monkeypatch, rerank_settings):
+    fake = _FakeReranker({"a": 0.1, "b": 0.9, "c": 0.5})
+    _use(monkeypatch, fake)
+
+    assert reranker._BUSY.acquire(blocking=False)
+    try:
+        assert await reranker.rerank_contexts("q", CONTEXTS) is CONTEXTS
+    finally:
+        reranker._BUSY.release()
+    assert fake.calls == 0
+
+
+@pytest.mark.asyncio
+async def test_single_context_is_not_scored(monkeypatch, rerank_settings):
+    fake = _FakeReranker({"a": 0.1})
+    _use(monkeypatch, fake)
+
+    assert await reranker.rerank_contexts("q", CONTEXTS[:1]) == CONTEXTS[:1]
+    assert fake.calls == 0
@@ -135,48 +135,110 @@ const UploadedFile = forwardRef<UploadedFileHandle, UploadedFileProps>(({ isComp
   const [loadError, setLoadError] = useState<string | null>(null)
   const [fileToDelete, setFileToDelete] = useState<IUploadedFile | null>(null)
   const [error, setError] = useState<string | null>(null)
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
+  const [isLoadingMore, setIsLoadingMore] = useState(false)
   const hasInitialized = useRef(false)
+  // What the table shows: the full list, a name search or a format filter
+  const searchTermRef = useRef<string | null>(null)
+  const filterFormatRef = useRef<string | null>(null)
 
-  const refreshFiles = useCallback(async () => {
-    setLoadError(null)
-    try {
-      const fetchedFiles = await fetchKnowledgeFiles()
-
-      setPendingFiles(prev => {
-        const fetchedNames = new Set(fetchedFiles.map(f => f.name.toLowerCase()))
-
-        let remaining = prev.filter(pf => !fetchedNames.has(pf.name.toLowerCase()))
+  const reconcilePendingFiles = useCallback((fetchedFiles: IUploadedFile[]) => {
+    setPendingFiles(prev => {
+      const fetchedNames = new Set(fetchedFiles.map(f => f.name.toLowerCase()))
 
-        if (remaining.length > 0) {
-          remaining = remaining.filter(pf => {
-            const pendingBaseName = pf.name.toLowerCase().replace(/\.[^/.]+$/, '')
+      let remaining = prev.filter(pf => !fetchedNames.has(pf.name.toLowerCase()))
 
-            const hasMatch = fetchedFiles.some(f => {
-              const fetchedBaseName = f.name.toLowerCase().replace(/\.[^/.]+$/, '')
-              return fetchedBaseName.includes(pendingBaseName) || pendingBaseName.includes(fetchedBaseName)
-            })
+      if (remaining.length > 0) {
+        remaining = remaining.filter(pf => {
+          const pendingBaseName = pf.name.toLowerCase().replace(/\.[^/.]+$/, '')
 
-            return !hasMatch
+          const hasMatch = fetchedFiles.some(f => {
+            const fetchedBaseName = f.name.toLowerCase().replace(/\.[^/.]+$/, '')
+            return fetchedBaseName.includes(pendingBaseName) || pendingBaseName.includes(fetchedBaseName)
           })
-        }
 
-        savePendingFiles(remaining)
+          return !hasMatch
+        })
+      }
 
-        if (remaining.length === 0 && prev.length > 0) {
-          clearPendingFiles()
-        }
+      savePendingFiles(remaining)
 
-        return remaining
-      })
+      if (remaining.length === 0 && prev.length > 0) {
+        clearPendingFiles()
+      }
+
+      return remaining
+    })
+  }, [])
 
-      setFiles(fetchedFiles)
+  const refreshFiles = useCallback(async () => {
+    setLoadError(null)
+    searchTermRef.current = null
+    filterFormatRef.current = null
+    try {
+      const page = await fetchKnowledgeFiles()
+      reconcilePendingFiles(page.files)
+      setFiles(page.files)
+      setNextCursor(page.nextCursor)
     } catch (e) {
       console.error('Failed to load knowledge files:', e)
       setLoadError('Failed to load knowledge files.')
     } finally {
       setIsInitialLoading(false)
     }
-  }, [])
+  }, [reconcilePendingFiles])
+
+  // Re-reads only the first page and updates it in place, so pages already loaded with
+  // "Load more" stay on screen while new uploads appear and statuses change
+  const refreshFirstPage = useCallback(async () => {
+    try {
+      const format = filterFormatRef.current
+      if (format) {
+        setFiles(await filterKnowledgeFiles(format))
+        return
+      }
+      const term = searchTermRef.current
+      const page = term ? await searchKnowledgeFiles(term) : await fetchKnowledgeFiles()
+      if (term !== searchTermRef.current) return
+      reconcilePendingFiles(page.files)
+      setFiles(prev => {
+        const fresh = new Map(page.files.map(f => [f.id, f]))
+        const known = new Set(prev.map(f => f.id))
+        const added = page.files.filter(f => !known.has(f.id))
+        return [...added, ...prev.map(f => fresh.get(f.id) ?? f)]
+      })
+    } catch (e) {
+      console.error('Failed to refresh knowledge files:', e)
+    }
+  }, [reconcilePendingFiles])
+
+  const loadMoreFiles = useCallback(async () => {
+    if (!nextCursor || isLoadingMore) return
+    const term = searchTermRef.current
+    setIsLoadingMore(true)
+    try {
+      const page = term ? await searchKnowledgeFiles(term, nextCursor) : await fetchKnowledgeFiles(nextCursor)
+      // The list was reset (new search, refresh) while this page was loading
+      if (term !== searchTermRef.current) return
+      setFiles(prev => {
+        const known = new Set(prev.map(f => f.id))
+        return [...prev, ...page.files.filter(f => !known.has(f.id))]
+      })
+      setNextCursor(page.nextCursor)
+    } catch (e) {
+      console.error('Failed to load more knowledge files:', e)
+      setError('Failed to load more files')
+    } finally {
+      setIsLoadingMore(false)
+    }
+  }, [nextCursor, isLoadingMore])
+
+  const handleScroll = (e: React.UIEvent<HTMLDivElement>) => {
+    const target = e.currentTarget
+    if (target.scrollHeight - target.scrollTop - target.clientHeight < 200) {
+      loadMoreFiles()
+    }
+  }
 
   const addPendingFiles = useCallback((newFiles: { name: string; size: number; type: string }[]) => {
     const now = Date.now()
@@ -218,7 +280,7 @@ const UploadedFile = forwardRef<UploadedFileHandle, UploadedFileProps>(({ isComp
       })
 
       if (pendingFiles.length > 0) {
-        await refreshFiles()
+        await refreshFirstPage()
       }
     }
 
@@ -227,7 +289,7 @@ const UploadedFile = forwardRef<UploadedFileHandle, UploadedFileProps>(({ isComp
     return () => {
       clearInterval(interval)
     }
-  }, [pendingFiles.length, refreshFiles])
+  }, [pendingFiles.length, refreshFirstPage])
 
   // Refresh files with non-ACTIVE status periodically
   useEffect(() => {
@@ -236,11 +298,11 @@ const UploadedFile = forwardRef<UploadedFileHandle, UploadedFileProps>(({ isComp
     if (!hasProcessingFiles) return
 
     const interval = setInterval(() => {
-      refreshFiles()
+      refreshFirstPage()
     }, 5000) // Check every 5 seconds
 
     return () => clearInterval(interval)
-  }, [files, refreshFiles])
+  }, [files, refreshFirstPage])
 
   useEffect(() => {
     savePendingFiles(pendingFiles)
@@ -288,9 +350,13 @@ const UploadedFile = forwardRef<UploadedFileHandle, UploadedFileProps>(({ isComp
       }
 
       setLoadError(null)
+      searchTermRef.current = searchTerm
+      filterFormatRef.current = null
       try {
-        const searchedFiles = await searchKnowledgeFiles(searchTerm)
-        setFiles(searchedFiles)
+        const page = await searchKnowledgeFiles(searchTerm)
+        if (searchTermRef.current !== searchTerm) return
+        setFiles(page.files)
+        setNextCursor(page.nextCursor)
       } catch (e) {
         console.error('Failed to search knowledge files:', e)
         setLoadError('Failed to search knowledge files.')
@@ -309,9 +375,12 @@ const UploadedFile = forwardRef<UploadedFileHandle, UploadedFileProps>(({ isComp
       }
 
       setLoadError(null)
+      searchTermRef.current = null
+      filterFormatRef.current = formatStr
       try {
         const filteredFiles = await filterKnowledgeFiles(formatStr)
         setFiles(filteredFiles)
+        setNextCursor(null)
       } catch (e) {
         console.error('Failed to filter knowledge files:', e)
         setLoadError('Failed to filter knowledge files.')
@@ -399,6 +468,7 @@ const UploadedFile = forwardRef<UploadedFileHandle, UploadedFileProps>(({ isComp
           'uploaded__content scrollbar-hide flex h-full flex-col overflow-y-auto',
           isCompact ? 'items-center px-0 pt-4' : 'p-6'
         )}
+        onScroll={handleScroll}
       >
         {error && !isCompact && <p className="mb-3 text-center text-sm font-medium text-red-500">{error}</p>}
 
@@ -526,6 +596,20 @@ const UploadedFile = forwardRef<UploadedFileHandle, UploadedFileProps>(({ isComp
             )
           })}
         </div>
+
+        {nextCursor && (
+          <button
+            onClick={loadMoreFiles}
+            disabled={isLoadingMore}
+            className={cn(
+              'mt-3 cursor-pointer self-center rounded-lg border border-[#E5E7EB] bg-white text-[#6B7280] transition-colors hover:text-indigo-600 disabled:cursor-default disabled:opacity-60',
+              isCompact ? 'h-8 w-14 text-xs' : 'px-4 py-2 text-sm'
+            )}
+            title="Load more files"
+          >
+            {isLoadingMore ? '…' : isCompact ? 'More' : 'Load more'}
+          </button>
+        )}
       </div>
 
       <DeleteConfirmationModal
@@ -128,7 +128,7 @@ export async function fetchWeeklyTrends(days: number = 7): Promise<TrendsRespons
 }
 
 export interface UnansweredQuestion {
-  id: number
+  id: string
   question: string
   reason: string
   channel?: string
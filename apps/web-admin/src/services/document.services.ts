@@ -68,20 +68,48 @@ const getAuthHeaders = (): HeadersInit => {
   return accessToken ? { Authorization: `Bearer ${accessToken}` } : {}
 }
 
-export const fetchKnowledgeFiles = async (): Promise<IUploadedFile[]> => {
-  try {
-    const response = await fetch(`${DOCS_BASE_URL}/`, {
-      headers: getAuthHeaders()
-    })
-    if (!response.ok) {
-      const errorText = await response.text()
-      console.error(`API Error - Status: ${response.status} on GET /api/docs/`, errorText)
-      throw new Error(`Failed to list documents. Server responded with status: ${response.status}`)
-    }
+// One page of the document table (DEFAULT_PAGE_SIZE in apps/api/app/services/dms.py)
+const DOCS_PAGE_SIZE = 50
 
-    const data: { items?: BackendDocument[] } = await response.json()
-    const documents: BackendDocument[] = data.items || []
-    return documents.map(mapBackendToFrontend)
+export interface IKnowledgeFilePage {
+  files: IUploadedFile[]
+  // Pass back to load the next page; null on the last page
+  nextCursor: string | null
+}
+
+type DocumentPage = {
+  items?: BackendDocument[]
+  documents?: BackendDocument[]
+  nextCursor?: string | null
+}
+
+const fetchDocumentPage = async (
+  path: string,
+  itemsKey: 'items' | 'documents',
+  query: Record<string, string>,
+  cursor?: string | null
+): Promise<IKnowledgeFilePage> => {
+  const params = new URLSearchParams({ ...query, limit: String(DOCS_PAGE_SIZE) })
+  if (cursor) params.set('cursor', cursor)
+  const response = await fetch(`${DOCS_BASE_URL}${path}?${params}`, {
+    headers: getAuthHeaders()
+  })
+  if (!response.ok) {
+    const errorText = await response.text()
+    console.error(`API Error - Status: ${response.status} on GET /api/docs${path}`, errorText)
+    throw new Error(`Failed to list documents. Server responded with status: ${response.status}`)
+  }
+
+  const data: DocumentPage = await response.json()
+  return {
+    files: (data[itemsKey] || []).map(mapBackendToFrontend),
+    nextCursor: data.nextCursor || null
+  }
+}
+
+export const fetchKnowledgeFiles = async (cursor?: string | null): Promise<IKnowledgeFilePage> => {
+  try {
+    return await fetchDocumentPage('/', 'items', {}, cursor)
   } catch (error) {
     console.error('Failed to fetch knowledge files:', error)
     throw error instanceof Error
@@ -127,12 +155,20 @@ export const uploadKnowledgeFiles = async (files: File[]): Promise<IUploadedFile
     if (!response.ok) {
       const errorText = await response.text()
       console.error(`API Error - Status: ${response.status} on POST /api/docs/`, errorText)
+      let message = `Upload failed with status: ${response.status}`
       try {
-        const errorData = await response.json()
-        throw new Error(errorData.detail || `HTTP error! status: ${response.status}`)
+        const detail = JSON.parse(errorText).detail
+        if (Array.isArray(detail?.errors)) {
+          // Every file was rejected (400); otherwise rejected files come back as items with an error
+          const fileErrors = (detail.errors as UploadItem[]).map(item => `${item.filename || 'unknown'}: ${item.error}`)
+          message = `Upload failed:\n${fileErrors.join('\n')}`
+        } else if (typeof detail === 'string') {
+          message = detail
+        }
       } catch {
-        throw new Error(`Upload failed with status: ${response.status}`)
+        // Not a JSON error body
       }
+      throw new Error(message)
     }
 
     const data: { items?: UploadItem[]; status?: string } = await response.json()
@@ -242,20 +278,9 @@ export const deleteKnowledgeFile = async (fileId: string): Promise<{ id: string
   }
 }
 
-export const searchKnowledgeFiles = async (name: string): Promise<IUploadedFile[]> => {
+export const searchKnowledgeFiles = async (name: string, cursor?: string | null): Promise<IKnowledgeFilePage> => {
   try {
-    const response = await fetch(`${DOCS_BASE_URL}/search?name=${encodeURIComponent(name)}`, {
-      headers: getAuthHeaders()
-    })
-    if (!response.ok) {
-      const errorText = await response.text()
-      console.error(`API Error - Status: ${response.status} on GET /api/docs/search`, errorText)
-      throw new Error(`Failed to search documents. Server responded with status: ${response.status}`)
-    }
-
-    const data: { documents?: BackendDocument[] } = await response.json()
-    const documents: BackendDocument[] = data.documents || []
-    return documents.map(mapBackendToFrontend)
+    return await fetchDocumentPage('/search', 'documents', { name }, cursor)
   } catch (error) {
     console.error('Failed to search knowledge files:', error)
     throw error instanceof Error ? error : new Error('Unable to search files due to network error or server issue.')